@@ -6,23 +6,26 @@ from flask_cors import CORS
 import os
 import markdown
 import re
+import hashlib
+from functools import wraps
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
 # 加载环境变量
 load_dotenv()
 
-# 创建 Flask 应用
-app = Flask(__name__)
+# 创建 Flask 应用（静态文件由下方的 static_files 路由处理）
+app = Flask(__name__, static_folder=None)
 
 # 配置
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///news.db'
+# 相对路径相对于 instance 目录（测试时指向临时数据库）
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///news.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    'pool_pre_ping': True,
-    'pool_recycle': 300,
-}
+
+# SQLite 连接参数（WAL、mmap 等 PRAGMA）和只读连接池，需在 db.init_app 之前设置
+from sqlite_profile import init_app as init_sqlite_profile, read_only
+init_sqlite_profile(app)
 
 # 启用 CORS
 CORS(app, supports_credentials=True, origins='*')
@@ -32,197 +35,480 @@ from models import db, User, Article, Category, Setting
 db.init_app(app)
 
 # 初始化 JWT 认证
-from auth import init_app as init_jwt, generate_tokens, jwt_required, admin_required, get_token_from_request
+from auth import init_app as init_jwt, generate_tokens, jwt_required, admin_required, get_token_from_request, \
+    get_optional_user, load_user, invalidate_user
 init_jwt(app)
 
 # 导入模型
 from models import User, Article, Category, Setting
 
+# 全文搜索
+from search import ensure_search_index, search_articles, render_highlight
+
+# 旧版 news/ 目录索引
+from legacy_index import init_app as init_legacy_index, get_legacy_index, split_frontmatter
+init_legacy_index(app)
+
+# 热门文章排行（时间衰减，计数保存在数据库中，所有 worker 共享）
+from trending import init_app as init_trending, trending, WINDOWS as TRENDING_WINDOWS
+init_trending(app)
+
+# 阅读量写回缓冲（写回时在同一事务中累加热门排行）
+from view_counter import init_app as init_view_counter, view_counter
+init_view_counter(app, on_flush=trending.apply)
+
+# 首页旧版文章每页数量
+LEGACY_PER_PAGE = 20
+
+# 渲染页面缓存（文章页和匿名首页）
+from cache import LRUCache, content_version
+content_version.init_app(app)
+page_cache = LRUCache(
+    max_entries=int(os.getenv('PAGE_CACHE_ENTRIES', 512)),
+    max_bytes=int(os.getenv('PAGE_CACHE_BYTES', 32 * 1024 * 1024)),
+    ttl=int(os.getenv('PAGE_CACHE_TTL', 600)),
+)
+
+# 游标分页模式下的列表总数缓存（键中包含内容版本，写入后自然失效）
+count_cache = LRUCache(max_entries=256, ttl=3600)
+
+# 公共 API 响应缓存：序列化后的 JSON 字节（键中包含内容版本，写入后旧条目不再命中，由 LRU 淘汰）
+api_cache = LRUCache(
+    max_entries=int(os.getenv('API_CACHE_ENTRIES', 1024)),
+    max_bytes=int(os.getenv('API_CACHE_BYTES', 16 * 1024 * 1024)),
+    ttl=int(os.getenv('API_CACHE_TTL', 600)),
+)
+
+# 热门排行随阅读量变化（不更新内容版本），缓存时间较短
+POPULAR_CACHE_TTL = int(os.getenv('POPULAR_CACHE_TTL', 30))
+
+# 游标分页
+from pagination import paginate_by_cursor, InvalidCursor
+
+# 内容相似的相关文章
+from related import similarity_index, related_refresher, related_articles as related_by_content
+
+# 文章详情 API 的查询结果（键中包含内容版本）
+article_detail_cache = LRUCache(
+    max_entries=int(os.getenv('ARTICLE_DETAIL_CACHE_ENTRIES', 512)),
+    max_bytes=int(os.getenv('ARTICLE_DETAIL_CACHE_BYTES', 32 * 1024 * 1024)),
+    ttl=600,
+)
+
+# 排行榜中文章的序列化结果（键中包含内容版本）
+trending_article_cache = LRUCache(max_entries=1024, ttl=600)
+
+# 阅读量上报：slug -> 已发布文章的 id（不存在或未发布为 0），随页面缓存标签一起失效
+view_slug_cache = LRUCache(max_entries=int(os.getenv('VIEW_SLUG_CACHE_ENTRIES', 4096)), ttl=3600)
+
+# 仪表盘统计计数
+from stats import get_site_stats
+
+# 带哈希的静态资源（模板函数 asset_url）
+from assets import init_app as init_assets, send_asset, DIST_DIR
+init_assets(app)
+
+# 响应压缩（gzip / brotli）
+from compression import init_app as init_compression
+init_compression(app)
+
+# 密码哈希（进程池）
+from passwords import init_app as init_password_hasher, password_hasher, HasherBusy
+init_password_hasher(app)
+
+# 缓存未命中时合并相同的并发请求（进程内和跨 worker）
+from singleflight import init_app as init_single_flight, single_flight
+init_single_flight(app)
+
+# 页面缓存标签
+HOME_PAGE_TAG = 'home'
+LATEST_ARTICLES_TAG = 'latest'
+
+# 跨 worker 缓存失效：页面缓存按标签失效（ALL 表示清空）
+from invalidation import init_app as init_invalidation, invalidation_bus, ALL as ALL_PAGES
+init_invalidation(app)
+PAGES_CHANNEL = 'pages'
+
+
+def _evict_pages(tags):
+    if ALL_PAGES in tags:
+        page_cache.clear()
+        view_slug_cache.clear()
+    else:
+        page_cache.invalidate_tags(*tags)
+        view_slug_cache.invalidate_tags(*tags)
+
+
+invalidation_bus.subscribe(PAGES_CHANNEL, _evict_pages)
+
 
 # ==================== 辅助函数 ====================
 
-def generate_excerpt_from_markdown(content, max_length=200):
+@app.errorhandler(HasherBusy)
+def handle_hasher_busy(e):
+    """密码哈希名额已满：立即返回 503，客户端稍后重试"""
+    response = jsonify({'error': '登录请求过多，请稍后重试', 'code': 'AUTH_BUSY'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+# Markdown 纯文本摘要（逐行扫描，够长即停止）
+from excerpt import generate_excerpt as generate_excerpt_from_markdown
+
+
+def invalidate_article_pages(slug, *category_ids):
+    """
+    文章变更后清除相关的页面缓存
+
+    包括文章自身页面、在相关文章区块中展示了它的页面、
+    同分类页面（相关文章按分类选取）、以最新文章补位的页面和首页，
+    同时更新全局内容版本号使已发出的 ETag 失效。其他 worker 通过失效广播清除。
+    """
+    tags = [f'article:{slug}', LATEST_ARTICLES_TAG, HOME_PAGE_TAG]
+    tags.extend(f'category:{category_id}' for category_id in set(category_ids) if category_id)
+    invalidation_bus.publish(PAGES_CHANNEL, *tags)
+    content_version.bump()
+
+
+def invalidate_all_pages():
+    """清空所有 worker 的页面缓存并更新内容版本（分类变更、批量导入等）"""
+    invalidation_bus.publish(PAGES_CHANNEL, ALL_PAGES)
+    content_version.bump()
+
+
+def record_view(article_id):
+    """记录一次阅读：累加到写回缓冲，写回时同时累加热门排行"""
+    view_counter.record(article_id)
+
+
+def trending_articles(window, limit):
+    """从共享的排行表读取热门文章，只查询缓存中缺失的文章"""
+    leaders = trending.leaders(window, limit)
+    version, _ = content_version.current()
+
+    articles, missing = {}, []
+    for article_id, _ in leaders:
+        data = trending_article_cache.get((article_id, version))
+        if data is None:
+            missing.append(article_id)
+        else:
+            articles[article_id] = data
+
+    if missing:
+        for article in Article.query.filter(Article.id.in_(missing), Article.status == 'published')\
+                .options(*Article.list_options()):
+            data = article.to_dict()
+            trending_article_cache.set((article.id, version), data, size=1)
+            articles[article.id] = data
+
+    return [{**articles[article_id], 'trending_score': round(score, 3)}
+            for article_id, score in leaders if article_id in articles]
+
+
+def refresh_related(article_id):
+    """文章发布、更新、下架或删除后登记相似文章表的增量更新（在后台线程中执行，不阻塞写请求）"""
+    related_refresher.schedule(article_id)
+
+
+def _related_changed(changed):
+    """相似文章表更新后清除邻居变化的页面缓存"""
+    invalidation_bus.publish(PAGES_CHANNEL, *(f'related:{changed_id}' for changed_id in changed))
+    content_version.bump()
+
+
+related_refresher.init_app(app, on_changed=_related_changed)
+
+
+def _as_utc(value):
+    """数据库中的时间为 naive UTC，统一转为带时区的时间"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def article_etag(article):
+    """文章的强 ETag：文章 id + 更新时间 + 全局内容版本（分类名、作者名等变化时失效）"""
+    version, _ = content_version.current()
+    updated_at = _as_utc(article.updated_at or article.created_at)
+    stamp = int(updated_at.timestamp() * 1000000) if updated_at else 0
+    return f'a{article.id}-{stamp:x}-{version}'
+
+
+def article_last_modified(article):
     """
-    从 Markdown 内容生成纯文本摘要
+    文章页面的 Last-Modified：文章更新时间和全局内容版本时间中较晚的一个
 
-    Args:
-        content: Markdown 格式的文本内容
-        max_length: 摘要最大长度
+    页面还内嵌了相关文章、分类名等其他内容，它们变化时文章自身的更新时间不变，
+    只带 If-Modified-Since 的客户端也要拿到新页面。
+    """
+    _, modified = content_version.current()
+    updated_at = _as_utc(article.updated_at or article.created_at)
+    return max(updated_at, modified) if updated_at else modified
+
+
+def listing_etag(audience='public'):
+    """列表的弱 ETag：全局内容版本 + 规范化后的查询参数 + 访客类别（管理员的列表包含草稿）"""
+    version, modified = content_version.current()
+    query = sorted(request.args.items(multi=True))
+    digest = hashlib.sha1(repr((request.path, query, audience)).encode('utf-8')).hexdigest()[:16]
+    return f'l{version}-{digest}', modified
+
+
+def cached_api_response(ttl=None):
+    """
+    缓存公共 GET API 的 JSON 响应
+
+    键由路径、规范化后的查询参数、认证类别（admin / 其他）和内容版本组成，
+    同一类访客的相同请求直接返回缓存的响应字节，不再查询和序列化。
+    文章和分类写入时更新内容版本，旧条目不再命中，无需逐条清除。
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            user = get_optional_user()
+            version, _ = content_version.current()
+            key = (request.path, tuple(sorted(request.args.items(multi=True))),
+                   'admin' if user and user.role == 'admin' else 'public', version)
+
+            cached = api_cache.get(key)
+            if cached is not None:
+                body, headers = cached
+                response = app.response_class(body, headers=headers)
+                return response.make_conditional(request)
+
+            # 条件请求由视图函数直接判断（不查询），不参与合并，避免把 304 共享给其他请求
+            if request.if_none_match or request.if_modified_since:
+                return f(*args, **kwargs)
+
+            def build():
+                response = make_response(f(*args, **kwargs))
+                headers = [(k, v) for k, v in response.headers.items() if k != 'Content-Length']
+                return response.status_code, response.get_data(), headers
+
+            # 缓存未命中时相同的并发请求只查询一次（跨 worker 共享结果）
+            (status, body, headers), fresh = single_flight.run(
+                ('api',) + key, build, stale_key=('api',) + key[:-1])
+            response = app.response_class(body, status=status, headers=headers)
+            if not fresh:
+                # 旧版本结果（保留其原有的 ETag）：不写入缓存
+                return no_store(response)
+            if status == 200 and response.is_json:
+                api_cache.set(key, (body, headers), size=len(body), ttl=ttl)
+            return response
+        return wrapper
+    return decorator
+
+
+def not_modified(etag, last_modified=None, weak=False, private=False):
+    """
+    处理条件请求，应在查询和序列化之前调用
 
     Returns:
-        纯文本摘要
+        客户端缓存仍然有效时返回 304 响应，否则返回 None
     """
-    if not content:
-        return ''
-
-    # 移除代码块
-    clean_content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-    # 移除行内代码
-    clean_content = re.sub(r'`[^`]+`', '', clean_content)
-    # 移除链接
-    clean_content = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', clean_content)
-    # 移除标题标记
-    clean_content = re.sub(r'^#+\s*', '', clean_content, flags=re.MULTILINE)
-    # 移除加粗和斜体
-    clean_content = re.sub(r'\*\*([^*]+)\*\*', r'\1', clean_content)
-    clean_content = re.sub(r'\*([^*]+)\*', r'\1', clean_content)
-    clean_content = re.sub(r'__([^_]+)__', r'\1', clean_content)
-    clean_content = re.sub(r'_([^_]+)_', r'\1', clean_content)
-    # 移除无序列表标记
-    clean_content = re.sub(r'^\s*[-*+]\s+', '', clean_content, flags=re.MULTILINE)
-    # 移除有序列表标记
-    clean_content = re.sub(r'^\s*\d+\.\s+', '', clean_content, flags=re.MULTILINE)
-    # 移除引用标记
-    clean_content = re.sub(r'^>\s*', '', clean_content, flags=re.MULTILINE)
-    # 清理多余空格和换行
-    clean_content = re.sub(r'\s+', ' ', clean_content).strip()
-
-    # 截断并添加省略号
-    if len(clean_content) > max_length:
-        return clean_content[:max_length] + '...'
-    return clean_content
+    if request.if_none_match:
+        matched = request.if_none_match.contains_weak(etag)
+    elif last_modified and request.if_modified_since:
+        matched = _as_utc(last_modified).replace(microsecond=0) <= request.if_modified_since
+    else:
+        matched = False
+
+    if not matched:
+        return None
+    return with_validators(make_response('', 304), etag, last_modified, weak, private)
+
+
+def with_validators(response, etag, last_modified=None, weak=False, private=False):
+    """为响应添加 ETag / Last-Modified，并要求客户端每次重新验证"""
+    response = make_response(response)
+    response.set_etag(etag, weak=weak)
+    if last_modified:
+        response.last_modified = _as_utc(last_modified)
+    response.headers['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    return response
+
+
+def no_store(response):
+    """请求合并返回的旧版本结果只用于本次响应，客户端和代理都不缓存"""
+    response = make_response(response)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+def shell_bootstrap(user=None, article=None, legacy=None):
+    """
+    SPA 外壳页内嵌的初始数据
+
+    前端首次加载时直接使用其中的分类、当前用户和文章，
+    不再请求 /api/categories、/api/auth/me 和 /api/articles/<slug>。
+    首页另外内嵌旧版 news/ 目录文章的当前页（legacy）。
+    """
+    categories = Category.query.order_by(Category.sort_order.asc()).all()
+    return {
+        'categories': [c.to_dict() for c in categories],
+        'user': user.to_dict() if user else None,
+        'article': article.to_detail_dict() if article else None,
+        'legacy': legacy,
+    }
+
+
+def render_shell():
+    """返回嵌入初始数据的 SPA 外壳页"""
+    return render_template('index.html', bootstrap=shell_bootstrap(get_optional_user()))
 
 
 # ==================== 模板路由（向后兼容） ====================
 
 @app.route('/')
+@read_only
 def index():
     """新闻列表首页"""
     # 检查用户是否已登录（通过 JWT）
-    token = get_token_from_request()
-    user = None
-    if token:
-        from auth import decode_token
-        result = decode_token(token)
-        if result['success']:
-            user = User.query.get(result['payload']['user_id'])
-
-    # 获取数据库中的已发布文章
-    articles = Article.query.filter_by(status='published')\
-        .order_by(Article.published_at.desc()).limit(10).all()
-
-    # 兼容旧版：也读取 news/ 目录的文件
-    news_dir = os.getenv('NEWS_DIR', 'news')
-    legacy_articles = []
-    if os.path.exists(news_dir):
-        for f in os.listdir(news_dir):
-            if f.endswith(('.md', '.html')):
-                filepath = os.path.join(news_dir, f)
-                with open(filepath, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    if f.endswith('.md'):
-                        # 尝试从 YAML frontmatter 获取标题
-                        title = f
-                        if content.startswith('---'):
-                            frontmatter_end = content.find('---', 3)
-                            if frontmatter_end != -1:
-                                frontmatter = content[3:frontmatter_end]
-                                for line in frontmatter.split('\n'):
-                                    if line.startswith('title:'):
-                                        title = line.split(':', 1)[1].strip()
-                                        break
-                        else:
-                            # 回退到从 # 标题获取
-                            title_match = re.search(r'^#\s+(.*)', content, re.MULTILINE)
-                            title = title_match.group(1) if title_match else f
-                    else:
-                        title_match = re.search(r'<title>(.*?)</title>', content)
-                        title = title_match.group(1) if title_match else f
-                legacy_articles.append({
-                    'filename': f.replace('.md', '').replace('.html', ''),
-                    'title': title
-                })
-
-    return render_template('index.html',
-                           articles=[a.to_dict() for a in articles],
-                           legacy_articles=legacy_articles,
-                           user=user.to_dict() if user else None,
-                           page=1)
+    user = get_optional_user()
+
+    # 兼容旧版：news/ 目录的文件（通过缓存索引分页读取）
+    legacy_page = request.args.get('page', 1, type=int)
+    legacy_index = get_legacy_index(os.getenv('NEWS_DIR', 'news'))
+    legacy_articles, legacy_total = legacy_index.page(legacy_page, LEGACY_PER_PAGE)
+
+    # 匿名访问使用页面缓存（内嵌的分类数据随内容版本失效）
+    version, _ = content_version.current()
+    cache_key = ('home', legacy_page, legacy_index.generation, version) if user is None else None
+    if cache_key:
+        body = page_cache.get(cache_key)
+        if body is not None:
+            return body
+
+    def build():
+        # 获取数据库中的已发布文章
+        articles = Article.query.filter_by(status='published')\
+            .options(*Article.list_options())\
+            .order_by(Article.published_at.desc()).limit(10).all()
+
+        return render_template('index.html',
+                               articles=[a.to_dict() for a in articles],
+                               user=user.to_dict() if user else None,
+                               bootstrap=shell_bootstrap(user, legacy={
+                                   'articles': legacy_articles,
+                                   'page': legacy_page,
+                                   'pages': -(-legacy_total // LEGACY_PER_PAGE),
+                               }),
+                               page=legacy_page).encode('utf-8')
+
+    if not cache_key:
+        return build()
+
+    # 缓存未命中时并发的匿名请求只渲染一次
+    # （各 worker 的索引版本号独立计数，跨 worker 的键使用本页旧版文章列表本身）
+    flight_key = ('home', legacy_page, version, legacy_total,
+                  tuple((a['filename'], a['title']) for a in legacy_articles))
+    body, fresh = single_flight.run(flight_key, build, stale_key=('home', legacy_page))
+    if not fresh:
+        return no_store(body)
+    page_cache.set(cache_key, body, tags=(HOME_PAGE_TAG,))
+    return body
 
 
 @app.route('/article/<slug>')
+@read_only
 def show_article(slug):
     """查看数据库文章"""
-    article = Article.query.filter_by(slug=slug).first()
+    article = Article.query.filter_by(slug=slug)\
+        .options(*Article.eager_relations()).first()
     if article:
-        # 增加阅读量
-        article.view_count += 1
-        db.session.commit()
-        # 返回 Vue SPA，由前端渲染
-        return render_template('index.html')
+        user = get_optional_user()
+        # 未发布文章只向管理员内嵌，其他情况由前端请求 API（权限检查在 API 中处理）
+        if article.status != 'published' and not (user and user.role == 'admin'):
+            return render_template('index.html', bootstrap=shell_bootstrap(user))
+
+        # 返回 Vue SPA，由前端渲染（前端使用内嵌数据，不再请求 API，阅读量由前端上报）
+        return render_template('index.html', bootstrap=shell_bootstrap(user, article))
 
     return '404 - 文章未找到', 404
 
 
 @app.route('/<filename>')
+@read_only
 def show_news(filename):
     """查看新闻文章（兼容文件版本和直接访问）"""
     # 尝试从数据库获取
-    article = Article.query.filter_by(slug=filename).first()
+    article = Article.query.filter_by(slug=filename)\
+        .options(*Article.eager_relations()).first()
     if article:
-        # 增加阅读量
-        article.view_count += 1
-        db.session.commit()
-
-        # 获取相关文章（同一分类或最新的3篇文章）
-        related_articles = []
-        if article.category:
-            related_articles = Article.query.filter(
-                Article.slug != filename,
-                Article.status == 'published',
-                Article.category == article.category
-            ).order_by(Article.published_at.desc()).limit(3).all()
-
-        # 如果同一分类文章不足3篇，补充最新的其他文章
-        if len(related_articles) < 3:
-            existing_slugs = [a.slug for a in related_articles] + [filename]
-            more_articles = Article.query.filter(
-                ~Article.slug.in_(existing_slugs),
-                Article.status == 'published'
-            ).order_by(Article.published_at.desc()).limit(3 - len(related_articles)).all()
-            related_articles.extend(more_articles)
-
-        related_data = [a.to_dict() for a in related_articles[:3]] if related_articles else []
-
-        return render_template('news.html',
-                             article=article.to_detail_dict(),
-                             related_articles=related_data)
+        etag = article_etag(article)
+        last_modified = article_last_modified(article)
+        response = not_modified(etag, last_modified)
+        if response is not None:
+            return response
+
+        # 已渲染的页面按 slug 和更新时间缓存
+        cache_key = ('news', article.slug, article.updated_at)
+        body = page_cache.get(cache_key)
+        if body is not None:
+            return with_validators(body, etag, last_modified)
+
+        def build():
+            # 获取相关文章：优先使用预计算的内容相似文章
+            tags = {f'article:{article.slug}', f'related:{article.id}'}
+            related_articles = related_by_content(article, limit=3)
+
+            # 不足3篇时补充同一分类的最新文章
+            if len(related_articles) < 3 and article.category:
+                tags.add(f'category:{article.category_id}')
+                existing_slugs = [a.slug for a in related_articles] + [filename]
+                related_articles.extend(Article.query.filter(
+                    ~Article.slug.in_(existing_slugs),
+                    Article.status == 'published',
+                    Article.category == article.category
+                ).options(*Article.list_options()).order_by(Article.published_at.desc())
+                    .limit(3 - len(related_articles)).all())
+
+            # 如果同一分类文章不足3篇，补充最新的其他文章
+            if len(related_articles) < 3:
+                tags.add(LATEST_ARTICLES_TAG)
+                existing_slugs = [a.slug for a in related_articles] + [filename]
+                more_articles = Article.query.filter(
+                    ~Article.slug.in_(existing_slugs),
+                    Article.status == 'published'
+                ).options(*Article.list_options()).order_by(Article.published_at.desc()).limit(3 - len(related_articles)).all()
+                related_articles.extend(more_articles)
+
+            related_data = [a.to_dict() for a in related_articles[:3]] if related_articles else []
+            tags.update(f'article:{a["slug"]}' for a in related_data)
+
+            body = render_template('news.html',
+                                   article=article.to_detail_dict(),
+                                   related_articles=related_data).encode('utf-8')
+            return body, tags
+
+        # 缓存未命中时并发的请求只渲染一次（跨 worker 共享结果）
+        version, _ = content_version.current()
+        (body, tags), fresh = single_flight.run(cache_key + (version,), build,
+                                                stale_key=('news', article.slug))
+        if not fresh:
+            # 旧版本页面与当前 ETag 不对应：不缓存，也不附加验证器
+            return no_store(body)
+        page_cache.set(cache_key, body, tags=tags)
+        return with_validators(body, etag, last_modified)
 
     # 兼容旧版：从文件读取
     news_dir = os.getenv('NEWS_DIR', 'news')
-    md_path = os.path.join(news_dir, f'{filename}.md')
-    html_path = os.path.join(news_dir, f'{filename}.html')
-
-    if os.path.exists(md_path):
-        with open(md_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-            # 解析 YAML frontmatter
-            title = filename
-            category = None
-            date = None
-            excerpt = None
-
-            # 检查是否有 YAML frontmatter
-            if content.startswith('---'):
-                # 找到第二个 ---
-                frontmatter_end = content.find('---', 3)
-                if frontmatter_end != -1:
-                    frontmatter = content[3:frontmatter_end]
-                    content = content[frontmatter_end + 3:].strip()
-
-                    # 解析 frontmatter
-                    for line in frontmatter.split('\n'):
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            key = key.strip()
-                            value = value.strip()
-                            if key == 'title':
-                                title = value
-                            elif key == 'category':
-                                category = value
-                            elif key == 'date':
-                                date = value
+    path, entry = get_legacy_index(news_dir).lookup(filename)
+
+    if path and path.endswith('.md'):
+        # 渲染结果按文件 mtime/size 和内容版本（相关文章变化）缓存
+        version, _ = content_version.current()
+        cache_key = ('legacy', filename, entry['mtime'], entry['size'], version)
+        body = page_cache.get(cache_key)
+        if body is not None:
+            return body
+
+        def build():
+            with open(path, 'r', encoding='utf-8') as f:
+                _, content = split_frontmatter(f.read())
+
+            # frontmatter 已在索引中解析
+            meta = entry['meta']
 
             # 转换 Markdown 为 HTML
             html_content = markdown.markdown(content, extensions=['fenced_code', 'tables'])
@@ -233,29 +519,36 @@ def show_news(filename):
                 related_articles = Article.query.filter(
                     Article.slug != filename,
                     Article.status == 'published'
-                ).order_by(Article.published_at.desc()).limit(3).all()
+                ).options(*Article.list_options()).order_by(Article.published_at.desc()).limit(3).all()
                 related_data = [a.to_dict() for a in related_articles]
 
             return render_template('news.html', article={
-                'title': title,
+                'title': meta.get('title', filename),
                 'content': content,
                 'html_content': html_content,
                 'filename': filename,
-                'category': category,
-                'date': date,
-                'excerpt': excerpt
-            }, related_articles=related_data)
+                'category': meta.get('category'),
+                'date': meta.get('date'),
+                'excerpt': None
+            }, related_articles=related_data).encode('utf-8')
 
-    elif os.path.exists(html_path):
-        return send_from_directory(news_dir, f'{filename}.html')
+        body, fresh = single_flight.run(cache_key, build, stale_key=('legacy', filename))
+        if not fresh:
+            return no_store(body)
+        page_cache.set(cache_key, body, tags=(LATEST_ARTICLES_TAG,))
+        return body
+
+    elif path:
+        return send_from_directory(news_dir, entry['file'])
 
     return '404 - 文章未找到', 404
 
 
 @app.route('/login', methods=['GET', 'POST'])
+@read_only
 def login_page():
     """登录页面 - 返回 Vue SPA"""
-    return render_template('index.html')
+    return render_shell()
 
 
 @app.route('/logout')
@@ -268,27 +561,31 @@ def logout_page():
 
 
 @app.route('/register', methods=['GET', 'POST'])
+@read_only
 def register_page():
     """注册页面 - 返回 Vue SPA"""
-    return render_template('index.html')
+    return render_shell()
 
 
 @app.route('/profile')
+@read_only
 def profile_page():
     """个人中心 - 返回 Vue SPA"""
-    return render_template('index.html')
+    return render_shell()
 
 
 @app.route('/admin')
+@read_only
 def admin_page():
     """管理后台 - 返回 Vue SPA"""
-    return render_template('index.html')
+    return render_shell()
 
 
 @app.route('/editor/<path:filename>')
+@read_only
 def editor_page(filename):
     """编辑器页面"""
-    return render_template('index.html')
+    return render_shell()
 
 
 # ==================== API 路由 ====================
@@ -324,7 +621,7 @@ def register():
 
     # 创建用户
     user = User(username=username, email=email)
-    user.set_password(password)
+    user.password_hash = password_hasher.hash(password)
 
     # 如果是第一个用户，设为管理员
     if User.query.count() == 0:
@@ -363,12 +660,22 @@ def login():
     if not user:
         user = User.query.filter_by(email=username).first()
 
-    if not user or not user.check_password(password):
+    if not user:
+        return jsonify({'error': '用户名或密码错误'}), 401
+
+    matched, new_hash = password_hasher.verify(user.password_hash, password)
+    if not matched:
         return jsonify({'error': '用户名或密码错误'}), 401
 
     if not user.is_active:
         return jsonify({'error': '账户已被禁用'}), 403
 
+    # 哈希参数已过期，使用当前配置重新保存
+    if new_hash:
+        user.password_hash = new_hash
+        db.session.commit()
+        invalidate_user(user.id)
+
     # 生成 token
     access_token, refresh_token = generate_tokens(user.id)
 
@@ -448,11 +755,13 @@ def change_password():
     old_password = data.get('old_password', '')
     new_password = data.get('new_password', '')
 
-    if not request.current_user.check_password(old_password):
+    matched, _ = password_hasher.verify(request.current_user.password_hash, old_password)
+    if not matched:
         return jsonify({'error': '原密码错误'}), 400
 
-    request.current_user.set_password(new_password)
+    request.current_user.password_hash = password_hasher.hash(new_password)
     db.session.commit()
+    invalidate_user(request.current_user.id)
 
     return jsonify({'message': '密码修改成功'})
 
@@ -460,6 +769,8 @@ def change_password():
 # ==================== 文章 API ====================
 
 @app.route('/api/articles', methods=['GET'])
+@read_only
+@cached_api_response()
 def get_articles():
     """获取文章列表"""
     page = request.args.get('page', 1, type=int)
@@ -468,9 +779,21 @@ def get_articles():
     category_id = request.args.get('category_id', type=int)
     search = request.args.get('search', '')
 
-    query = Article.query
+    # 非管理员只能看到已发布文章，管理员的列表（可能包含草稿）只允许私有缓存
+    user = get_optional_user()
+    private = bool(user and user.role == 'admin')
+    if not private:
+        status = 'published'
+
+    # 内容版本未变化时直接返回 304，跳过查询和序列化
+    etag, last_modified = listing_etag('admin' if private else 'public')
+    response = not_modified(etag, last_modified, weak=True, private=private)
+    if response is not None:
+        return response
+
+    query = Article.query.options(*Article.list_options())
 
-    # 筛选已发布或需要认证
+    # 筛选状态
     # status='null' 字符串表示获取所有文章（管理后台使用）
     if status and status != 'null':
         query = query.filter_by(status=status)
@@ -482,37 +805,85 @@ def get_articles():
     if category_id:
         query = query.filter_by(category_id=category_id)
 
-    if search:
-        query = query.filter(
-            (Article.title.contains(search)) |
-            (Article.content.contains(search))
-        )
+    # 游标分页：?cursor=（第一页为空值），返回 next_cursor；搜索时仍使用页码分页
+    cursor = request.args.get('cursor')
+    if cursor is not None and not search:
+        try:
+            items, next_cursor = paginate_by_cursor(query, cursor, max(per_page, 1))
+        except InvalidCursor:
+            return jsonify({'error': '无效的分页游标'}), 400
+
+        data = {
+            'articles': [a.to_dict() for a in items],
+            'next_cursor': next_cursor,
+            'per_page': max(per_page, 1)
+        }
+        # 总数可选，按筛选条件和内容版本缓存
+        if request.args.get('with_total', type=int):
+            count_key = (status, category_id, content_version.current()[0])
+            data['total'] = count_cache.get(count_key)
+            if data['total'] is None:
+                data['total'] = query.order_by(None).count()
+                count_cache.set(count_key, data['total'], size=1)
+
+        return with_validators(jsonify(data), etag, last_modified, weak=True, private=private)
+
+    # 全文搜索：优先使用 FTS5 索引（按相关度排序），不可用时回退到 LIKE
+    search_query = search_articles(query, search) if search else None
+
+    if search_query is not None:
+        pagination = search_query.paginate(page=page, per_page=per_page, error_out=False)
+        articles = [{
+            **a.to_dict(),
+            'title_highlight': render_highlight(title_highlight),
+            'snippet': render_highlight(snippet)
+        } for a, title_highlight, snippet in pagination.items]
+    else:
+        if search:
+            query = query.filter(
+                (Article.title.contains(search)) |
+                (Article.content.contains(search))
+            )
 
-    # 排序
-    query = query.order_by(Article.published_at.desc())
+        # 排序
+        query = query.order_by(Article.published_at.desc())
 
-    # 分页
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    articles = [a.to_dict() for a in pagination.items]
+        # 分页
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        articles = [a.to_dict() for a in pagination.items]
 
-    return jsonify({
+    return with_validators(jsonify({
         'articles': articles,
         'total': pagination.total,
         'page': pagination.page,
         'per_page': pagination.per_page,
         'pages': pagination.pages
-    })
+    }), etag, last_modified, weak=True, private=private)
 
 
 @app.route('/api/articles/<slug>', methods=['GET'])
+@read_only
 def get_article(slug):
     """获取文章详情"""
-    article = Article.query.filter_by(slug=slug).first()
-    if not article:
+    version, _ = content_version.current()
+    detail = article_detail_cache.get((slug, version))
+    fresh = True
+    if detail is None:
+        # 并发的冷请求只查询和序列化一次（已发布文章跨 worker 共享结果，草稿只在进程内共享）
+        detail, fresh = single_flight.run(
+            ('api_article', slug, version), lambda: load_article_detail(slug),
+            stale_key=('api_article', slug),
+            persist=lambda result: result is not None and result[0]['status'] == 'published')
+        if fresh and detail is not None:
+            article = detail[0]
+            article_detail_cache.set((slug, version), detail,
+                                     size=len(article['content'] or '') + len(article['html_content'] or ''))
+    if detail is None:
         return jsonify({'error': '文章不存在'}), 404
+    article, etag, last_modified = detail
 
     # 未发布文章需要登录
-    if article.status != 'published':
+    if article['status'] != 'published':
         token = get_token_from_request()
         if not token:
             return jsonify({'error': '需要登录才能查看此文章'}), 401
@@ -523,15 +894,56 @@ def get_article(slug):
             return jsonify({'error': '无效的 token'}), 401
 
         user_id = result['payload']['user_id']
-        user = User.query.get(user_id)
+        user = load_user(user_id)
         if not user or user.role != 'admin':
             return jsonify({'error': '无权查看此文章'}), 403
 
-    # 增加阅读量
-    article.view_count += 1
-    db.session.commit()
+    if not fresh:
+        # 旧版本详情（其 ETag 属于旧版本）只用于本次响应
+        return no_store(jsonify({'article': article}))
+
+    private = article['status'] != 'published'
+    response = not_modified(etag, last_modified, private=private)
+    if response is not None:
+        return response
+
+    return with_validators(jsonify({'article': article}), etag, last_modified, private=private)
 
-    return jsonify({'article': article.to_detail_dict()})
+
+@app.route('/api/articles/<slug>/view', methods=['POST'])
+@read_only
+def record_article_view(slug):
+    """
+    阅读量上报（前端展示文章后通过 navigator.sendBeacon 发送）
+
+    文章页面和详情 API 的 GET 不修改阅读量，可以被缓存。
+    这里不解析请求体、不检查登录，slug 命中缓存时只在内存中计数，
+    增量由 view_counter 批量写回数据库。
+    """
+    article_id = view_slug_cache.get(slug)
+    if article_id is None:
+        article_id = db.session.query(Article.id)\
+            .filter_by(slug=slug, status='published').scalar() or 0
+        view_slug_cache.set(slug, article_id, size=1, tags=(f'article:{slug}',))
+    if not article_id:
+        return jsonify({'error': '文章不存在'}), 404
+
+    record_view(article_id)
+    return '', 204
+
+
+def load_article_detail(slug):
+    """
+    查询并序列化文章详情
+
+    Returns:
+        (详情字典, ETag, Last-Modified)，文章不存在时返回 None
+    """
+    article = Article.query.filter_by(slug=slug)\
+        .options(*Article.eager_relations()).first()
+    if not article:
+        return None
+    return article.to_detail_dict(), article_etag(article), article_last_modified(article)
 
 
 @app.route('/api/articles', methods=['POST'])
@@ -584,6 +996,10 @@ def create_article():
     db.session.add(article)
     db.session.commit()
 
+    if status == 'published':
+        invalidate_article_pages(article.slug, article.category_id)
+        refresh_related(article.id)
+
     return jsonify({
         'message': '创建成功',
         'article': article.to_dict()
@@ -603,6 +1019,7 @@ def update_article(slug):
         return jsonify({'error': '无权修改此文章'}), 403
 
     data = request.get_json()
+    old_category_id = article.category_id
 
     if 'title' in data:
         article.title = data['title'].strip()
@@ -628,6 +1045,8 @@ def update_article(slug):
             article.published_at = datetime.now(timezone.utc)
 
     db.session.commit()
+    invalidate_article_pages(article.slug, article.category_id, old_category_id)
+    refresh_related(article.id)
 
     return jsonify({
         'message': '更新成功',
@@ -647,8 +1066,12 @@ def delete_article(slug):
     if request.current_user.role != 'admin' and article.user_id != request.current_user.id:
         return jsonify({'error': '无权删除此文章'}), 403
 
+    article_id, slug, category_id = article.id, article.slug, article.category_id
     db.session.delete(article)
     db.session.commit()
+    invalidate_article_pages(slug, category_id)
+    refresh_related(article_id)
+    trending.remove(article_id)
 
     return jsonify({'message': '删除成功'})
 
@@ -667,6 +1090,8 @@ def publish_article(slug):
     article.status = 'published'
     article.published_at = datetime.now(timezone.utc)
     db.session.commit()
+    invalidate_article_pages(article.slug, article.category_id)
+    refresh_related(article.id)
 
     return jsonify({'message': '发布成功', 'article': article.to_dict()})
 
@@ -684,28 +1109,62 @@ def unpublish_article(slug):
 
     article.status = 'draft'
     db.session.commit()
+    invalidate_article_pages(article.slug, article.category_id)
+    refresh_related(article.id)
+    trending.remove(article.id)
 
     return jsonify({'message': '下架成功', 'article': article.to_dict()})
 
 
 @app.route('/api/articles/popular', methods=['GET'])
+@read_only
+@cached_api_response(ttl=POPULAR_CACHE_TTL)
 def get_popular_articles():
-    """获取热门文章（按阅读量排序）"""
+    """
+    获取热门文章（按阅读量排序，?window=hour/day/week 时按时间衰减的近期阅读量排序）
+
+    衰减排行保存在数据库中，所有 worker 返回相同的结果；阅读量每隔几秒批量写回，
+    最近几秒的阅读尚未计入。
+    """
     limit = request.args.get('limit', 10, type=int)
-    articles = Article.query.filter_by(status='published')\
+    window = request.args.get('window')
+
+    if window:
+        if window not in TRENDING_WINDOWS:
+            return jsonify({'error': f'window 只能是 {"/".join(TRENDING_WINDOWS)}'}), 400
+        result = trending_articles(window, limit)
+        if len(result) >= limit:
+            return jsonify({'articles': result, 'window': window})
+    else:
+        result = []
+
+    # 总阅读量排行（排行榜数据不足时用于补位，例如进程刚启动）
+    exclude = [a['id'] for a in result]
+    articles = Article.query.filter(Article.status == 'published', ~Article.id.in_(exclude))\
+        .options(*Article.list_options())\
         .order_by(Article.view_count.desc())\
-        .limit(limit)\
+        .limit(limit - len(result))\
         .all()
-    return jsonify({'articles': [a.to_dict() for a in articles]})
+    result += [a.to_dict() for a in articles]
+
+    return jsonify({'articles': result, 'window': window} if window else {'articles': result})
 
 
 # ==================== 分类 API ====================
 
 @app.route('/api/categories', methods=['GET'])
+@read_only
+@cached_api_response()
 def get_categories():
     """获取分类列表"""
+    etag, last_modified = listing_etag()
+    response = not_modified(etag, last_modified, weak=True)
+    if response is not None:
+        return response
+
     categories = Category.query.order_by(Category.sort_order.asc()).all()
-    return jsonify({'categories': [c.to_dict() for c in categories]})
+    return with_validators(jsonify({'categories': [c.to_dict() for c in categories]}),
+                           etag, last_modified, weak=True)
 
 
 @app.route('/api/categories', methods=['POST'])
@@ -731,6 +1190,7 @@ def create_category():
     category = Category(name=name, slug=slug, description=description, sort_order=sort_order)
     db.session.add(category)
     db.session.commit()
+    content_version.bump()
 
     return jsonify({
         'message': '创建成功',
@@ -762,6 +1222,9 @@ def update_category(id):
 
     db.session.commit()
 
+    # 页面中展示了分类名称
+    invalidate_all_pages()
+
     return jsonify({
         'message': '更新成功',
         'category': category.to_dict()
@@ -782,6 +1245,7 @@ def delete_category(id):
 
     db.session.delete(category)
     db.session.commit()
+    content_version.bump()
 
     return jsonify({'message': '删除成功'})
 
@@ -823,6 +1287,7 @@ def update_user(id):
         user.is_active = data['is_active']
 
     db.session.commit()
+    invalidate_user(user.id)
 
     return jsonify({
         'message': '更新成功',
@@ -841,8 +1306,10 @@ def delete_user(id):
     if user.id == request.current_user.id:
         return jsonify({'error': '不能删除自己'}), 400
 
+    user_id = user.id
     db.session.delete(user)
     db.session.commit()
+    invalidate_user(user_id)
 
     return jsonify({'message': '删除成功'})
 
@@ -860,6 +1327,7 @@ def toggle_user_active(id):
 
     user.is_active = not user.is_active
     db.session.commit()
+    invalidate_user(user.id)
 
     status = '已启用' if user.is_active else '已禁用'
     return jsonify({'message': status, 'user': user.to_dict()})
@@ -871,20 +1339,14 @@ def toggle_user_active(id):
 @admin_required
 def dashboard_stats():
     """仪表盘统计"""
-    total_users = User.query.count()
-    total_articles = Article.query.count()
-    published_articles = Article.query.filter_by(status='published').count()
-    draft_articles = Article.query.filter_by(status='draft').count()
+    # 计数由写入路径增量维护，这里只读取一行
+    stats = get_site_stats()
 
-    recent_articles = Article.query.order_by(Article.created_at.desc()).limit(5).all()
+    recent_articles = Article.query.options(*Article.list_options())\
+        .order_by(Article.created_at.desc()).limit(5).all()
 
     return jsonify({
-        'stats': {
-            'total_users': total_users,
-            'total_articles': total_articles,
-            'published_articles': published_articles,
-            'draft_articles': draft_articles,
-        },
+        'stats': stats,
         'recent_articles': [a.to_dict() for a in recent_articles]
     })
 
@@ -893,6 +1355,9 @@ def dashboard_stats():
 
 @app.route('/static/<path:filename>')
 def static_files(filename):
+    # 构建产物：按 Accept-Encoding 返回预压缩文件并长期缓存
+    if filename.startswith(f'{DIST_DIR}/'):
+        return send_asset(os.path.join(app.root_path, 'static'), filename)
     return send_from_directory('static', filename)
 
 
@@ -903,6 +1368,9 @@ def init_db():
     with app.app_context():
         db.create_all()
 
+        # 创建全文搜索索引（已存在时跳过）
+        ensure_search_index()
+
         # 创建默认分类
         if Category.query.count() == 0:
             default_categories = [
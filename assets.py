@@ -0,0 +1,149 @@
+"""
+静态资源指纹和预压缩
+
+构建步骤（scripts/build_assets.py）把 static/ 下的 CSS、JS、SVG 复制到 static/dist/，
+文件名中加入内容哈希，同时生成 .gz 和 .br 压缩副本以及 manifest.json。
+模板通过 asset_url() 输出带哈希的地址；static_files 路由对 dist/ 下的文件
+按 Accept-Encoding 返回预压缩版本，并设置一年的 immutable 缓存。
+未执行构建时 asset_url() 返回原始地址。
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # 未安装时只生成 .gz
+    brotli = None
+
+
+DIST_DIR = 'dist'
+MANIFEST_FILE = 'manifest.json'
+
+# 参与构建的文件类型
+ASSET_EXTENSIONS = ('.css', '.js', '.svg')
+
+# 小于该字节数的文件不生成压缩副本
+MIN_COMPRESS_SIZE = 512
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# 按优先级排列的 (编码, 文件后缀)
+_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def fingerprint(data):
+    """内容哈希（取前 12 位）"""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def hashed_name(path, digest):
+    """css/main.css -> css/main.<digest>.css"""
+    root, ext = os.path.splitext(path)
+    return f'{root}.{digest}{ext}'
+
+
+def _write(path, data):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_compressed(target, data):
+    if len(data) < MIN_COMPRESS_SIZE:
+        return
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            _write(target + suffix, compressed)
+
+
+def build_assets(static_dir):
+    """
+    生成带哈希的资源文件、压缩副本和 manifest
+
+    已存在的哈希文件不会重写，旧版本文件保留，滚动发布期间旧页面仍能加载。
+
+    Returns:
+        manifest：原始路径 -> 带哈希的路径（均相对于 dist/）
+    """
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_dir):
+        if root == static_dir and DIST_DIR in dirs:
+            dirs.remove(DIST_DIR)
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(ASSET_EXTENSIONS):
+                continue
+            source = os.path.join(root, name)
+            path = os.path.relpath(source, static_dir).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            target_path = hashed_name(path, fingerprint(data))
+            target = os.path.join(dist_dir, target_path)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                _write(target, data)
+                _write_compressed(target, data)
+            manifest[path] = target_path
+
+    os.makedirs(dist_dir, exist_ok=True)
+    _write(os.path.join(dist_dir, MANIFEST_FILE),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+def load_manifest(static_dir):
+    """读取 manifest，未构建时返回空字典"""
+    try:
+        with open(os.path.join(static_dir, DIST_DIR, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def send_asset(static_dir, filename):
+    """
+    返回 dist/ 下带哈希的文件
+
+    客户端接受 br / gzip 且存在对应的压缩副本时直接返回压缩文件。
+    """
+    mimetype = mimetypes.guess_type(filename)[0]
+    encoding, suffix = None, ''
+    for candidate, candidate_suffix in _ENCODINGS:
+        if request.accept_encodings[candidate]:
+            path = safe_join(static_dir, filename + candidate_suffix)
+            if path and os.path.isfile(path):
+                encoding, suffix = candidate, candidate_suffix
+                break
+
+    response = send_from_directory(static_dir, filename + suffix, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(app):
+    """加载 manifest 并注册模板函数 asset_url"""
+    static_dir = os.path.join(app.root_path, 'static')
+    manifest = load_manifest(static_dir)
+
+    @app.template_global()
+    def asset_url(path):
+        hashed = manifest.get(path)
+        if hashed:
+            return f'/static/{DIST_DIR}/{hashed}'
+        return f'/static/{path}'
@@ -3,10 +3,14 @@ JWT 认证模块
 """
 import jwt
 import secrets
+import time
 from datetime import datetime, timedelta, timezone
 from functools import wraps
 from flask import request, jsonify, current_app
-from models import User
+from sqlalchemy.orm import make_transient_to_detached
+from models import db, User
+from cache import LRUCache
+from invalidation import invalidation_bus
 
 
 # JWT 配置
@@ -15,6 +19,18 @@ JWT_ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRY = timedelta(hours=2)
 REFRESH_TOKEN_EXPIRY = timedelta(days=7)
 
+# 用户信息缓存时间（秒），修改用户后会主动失效
+PRINCIPAL_CACHE_TTL = 30
+
+# 已验证签名的 token -> payload，缓存到 token 过期
+_token_cache = LRUCache(max_entries=4096, ttl=REFRESH_TOKEN_EXPIRY.total_seconds())
+
+# user_id -> 脱离会话的 User 副本
+_principal_cache = LRUCache(max_entries=1024, ttl=PRINCIPAL_CACHE_TTL)
+
+# 用户缓存的失效频道
+USERS_CHANNEL = 'users'
+
 
 def init_app(app):
     """初始化 JWT 配置"""
@@ -48,15 +64,65 @@ def generate_tokens(user_id):
 
 
 def decode_token(token):
-    """解码 token"""
+    """解码 token（验证通过的签名缓存到 token 过期为止）"""
+    payload = _token_cache.get(token)
+    if payload is not None and payload['exp'] > time.time():
+        return {'success': True, 'payload': payload}
+
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return {'success': True, 'payload': payload}
     except jwt.ExpiredSignatureError:
         return {'success': False, 'error': 'Token 已过期'}
     except jwt.InvalidTokenError as e:
         return {'success': False, 'error': f'无效的 Token: {str(e)}'}
 
+    _token_cache.set(token, payload, size=len(token), ttl=payload['exp'] - time.time())
+    return {'success': True, 'payload': payload}
+
+
+def load_user(user_id):
+    """
+    按 id 获取用户，优先使用进程内缓存
+
+    缓存的是脱离会话的副本，命中时通过 merge(load=False) 放入当前会话，
+    不查询数据库，返回的对象仍可修改并提交。
+    """
+    cached = _principal_cache.get(user_id)
+    if cached is not None:
+        return db.session.merge(cached, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(snapshot)
+        _principal_cache.set(user_id, snapshot, size=1)
+    return user
+
+
+def invalidate_user(user_id):
+    """用户信息变更后清除缓存（修改角色、禁用、删除、修改密码），同时通知其他 worker"""
+    invalidation_bus.publish(USERS_CHANNEL, user_id)
+
+
+def _evict_users(user_ids):
+    for user_id in user_ids:
+        _principal_cache.delete(user_id)
+
+
+invalidation_bus.subscribe(USERS_CHANNEL, _evict_users)
+
+
+def get_optional_user():
+    """获取当前登录用户（可选认证），token 无效或用户不存在、已禁用时返回 None"""
+    token = get_token_from_request()
+    if not token:
+        return None
+    result = decode_token(token)
+    if not result['success'] or result['payload'].get('type') != 'access':
+        return None
+    user = load_user(result['payload']['user_id'])
+    return user if user and user.is_active else None
+
 
 def get_token_from_request():
     """从请求中获取 token"""
@@ -92,7 +158,7 @@ def jwt_required(f):
             return jsonify({'error': '无效的 token 类型', 'code': 'INVALID_TOKEN_TYPE'}), 401
 
         # 获取用户
-        user = User.query.get(payload['user_id'])
+        user = load_user(payload['user_id'])
         if not user:
             return jsonify({'error': '用户不存在', 'code': 'USER_NOT_FOUND'}), 401
 
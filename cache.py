@@ -0,0 +1,177 @@
+"""
+进程内缓存
+
+LRUCache 同时按条目数、占用字节数和 TTL 淘汰，并支持按标签批量失效，
+用于缓存渲染后的页面等可重建的数据。ContentVersion 是跨进程共享的
+全局内容版本号，用于生成 ETag。
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+
+class LRUCache:
+    """带 TTL、内存上限和标签失效的 LRU 缓存（线程安全）"""
+
+    def __init__(self, max_entries=512, max_bytes=32 * 1024 * 1024, ttl=600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires_at, tags)
+        self._tags = {}  # tag -> set(key)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[2] <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, size=None, tags=(), ttl=None):
+        """
+        写入缓存
+
+        Args:
+            size: 条目占用字节数，默认取 len(value)
+            tags: 标签集合，invalidate_tags 时据此批量删除
+            ttl: 覆盖默认过期时间（秒）
+        """
+        if size is None:
+            size = len(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        tags = frozenset(tags)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_tags(self, *tags):
+        """删除带有任一标签的条目，返回删除数量"""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        # 调用方需持有锁
+        _, size, _, tags = self._entries.pop(key)
+        self._bytes -= size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class ContentVersion:
+    """
+    全局内容版本号
+
+    文章或分类发生写入时调用 bump()。版本号写入 instance/ 下的文件，
+    同一主机（或共享该目录的容器）上的所有 worker 通过 stat 感知变化，
+    可用于 ETag 等需要跨进程一致的场景。未设置路径时仅在进程内有效。
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._value = f'{time.time_ns():x}'
+        self._modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self._stat_key = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.path = os.path.join(app.instance_path, 'content_version')
+
+    def current(self):
+        """返回 (版本号, 最后修改时间)"""
+        if not self.path:
+            return self._value, self._modified
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.bump()
+            return self._value, self._modified
+        except OSError:
+            return self._value, self._modified
+
+        stat_key = (stat.st_ino, stat.st_mtime_ns)
+        if stat_key != self._stat_key:
+            with self._lock:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        value = f.read().strip()
+                except OSError:
+                    return self._value, self._modified
+                if value:
+                    self._value = value
+                    self._modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc).replace(microsecond=0)
+                    self._stat_key = stat_key
+        return self._value, self._modified
+
+    def bump(self):
+        """生成新版本号（基于纳秒时间戳，无需读-改-写，多进程并发写入也不会回退）"""
+        with self._lock:
+            self._value = f'{time.time_ns():x}'
+            self._modified = datetime.now(timezone.utc).replace(microsecond=0)
+            if not self.path:
+                return self._value
+            tmp_path = f'{self.path}.{os.getpid()}.tmp'
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(self._value)
+                os.replace(tmp_path, self.path)
+                stat = os.stat(self.path)
+                self._stat_key = (stat.st_ino, stat.st_mtime_ns)
+            except OSError:
+                pass
+            return self._value
+
+
+content_version = ContentVersion()
@@ -0,0 +1,156 @@
+"""
+响应压缩（WSGI 中间件）
+
+根据 Accept-Encoding 选择 br 或 gzip，只压缩状态码 200、类型在白名单内、
+带 Content-Length 且不小于 MIN_SIZE 的响应；已设置 Content-Encoding 的响应
+（如 static/dist/ 下的预压缩文件）原样返回。
+
+压缩结果按 (编码, 响应体摘要) 缓存，热门文章等重复的响应体只压缩一次。
+Cache-Control 含 no-store 或 private 的响应不进入缓存。
+压缩后强 ETag 改为弱 ETag，条件请求仍按弱比较命中。
+"""
+import gzip
+import hashlib
+import os
+
+from werkzeug.http import parse_accept_header
+
+from cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # 未安装时只使用 gzip
+    brotli = None
+
+
+# 小于该字节数的响应不压缩
+MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+
+# 可压缩的内容类型
+COMPRESSIBLE_TYPES = frozenset({
+    'text/html', 'text/css', 'text/plain', 'text/xml', 'text/javascript',
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml',
+})
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+# 按优先级排列的可用编码
+ENCODERS = ((('br', _brotli),) if brotli is not None else ()) + (('gzip', _gzip),)
+
+
+def choose_encoding(accept_encoding):
+    """按 Accept-Encoding 选择编码，客户端都不接受时返回 None"""
+    if not accept_encoding:
+        return None
+    accepted = parse_accept_header(accept_encoding)
+    for name, _ in ENCODERS:
+        if accepted[name]:
+            return name
+    return None
+
+
+class CompressionMiddleware:
+    """压缩 Flask 应用的响应"""
+
+    def __init__(self, app, min_size=MIN_SIZE, cache=None):
+        self.app = app
+        self.min_size = min_size
+        self.cache = cache if cache is not None else LRUCache(
+            max_entries=1024,
+            max_bytes=int(os.getenv('COMPRESSION_CACHE_BYTES', 16 * 1024 * 1024)),
+            ttl=3600,
+        )
+        self._encoders = dict(ENCODERS)
+
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+
+        captured = []
+
+        def capture(status, headers, exc_info=None):
+            captured[:] = [status, headers, exc_info]
+            return lambda data: None  # Flask 不使用 write()
+
+        body = self.app(environ, capture)
+        status, headers, exc_info = captured
+
+        if not self._compressible(status, headers):
+            start_response(status, headers, exc_info)
+            return body
+
+        headers = _add_vary(headers)
+        encoding = choose_encoding(environ.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            start_response(status, headers, exc_info)
+            return body
+
+        try:
+            data = b''.join(body)
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+
+        etag = _header(headers, 'ETag')
+        compressed = self._compress(data, encoding, _header(headers, 'Cache-Control'))
+        headers = [(name, value) for name, value in headers if name.lower() not in ('content-length', 'etag')] + [
+            ('Content-Encoding', encoding),
+            ('Content-Length', str(len(compressed))),
+        ]
+        if etag:
+            headers.append(('ETag', etag if etag.startswith('W/') else f'W/{etag}'))
+        start_response(status, headers, exc_info)
+        return [compressed]
+
+    def _compressible(self, status, headers):
+        if not status.startswith('200') or _header(headers, 'Content-Encoding'):
+            return False
+        length = _header(headers, 'Content-Length')
+        if length is None or int(length) < self.min_size:
+            return False
+        content_type = (_header(headers, 'Content-Type') or '').split(';', 1)[0].strip().lower()
+        return content_type in COMPRESSIBLE_TYPES
+
+    def _compress(self, data, encoding, cache_control):
+        cacheable = not any(directive in (cache_control or '').lower() for directive in ('no-store', 'private'))
+        if not cacheable:
+            return self._encoders[encoding](data)
+
+        key = (encoding, hashlib.blake2b(data, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self._encoders[encoding](data)
+            self.cache.set(key, compressed)
+        return compressed
+
+
+def _header(headers, name):
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _add_vary(headers):
+    vary = _header(headers, 'Vary')
+    if vary is None:
+        return headers + [('Vary', 'Accept-Encoding')]
+    if 'accept-encoding' in vary.lower() or vary.strip() == '*':
+        return headers
+    return [(name, f'{value}, Accept-Encoding' if name.lower() == 'vary' else value) for name, value in headers]
+
+
+def init_app(app):
+    """在 Flask 应用外层加上压缩中间件"""
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app)
@@ -0,0 +1,82 @@
+"""
+Markdown 纯文本摘要
+
+逐行扫描 Markdown：跳过围栏代码块，去掉标题、列表、引用等行首标记，
+用一个合并的正则处理行内代码、链接、图片和强调，累计的可见字符数
+超过 max_length 后立即停止，不再处理文章其余部分。
+"""
+import re
+
+
+# 行首标记：缩进、引用 >、标题 #、无序列表 -*+、有序列表 1.（如 "## 1. 标题" 同时去掉两者）
+_BLOCK_PREFIX_RE = re.compile(r'\s*(?:>\s*)*(?:#+\s*)?(?:[-*+]\s+)?(?:\d+\.\s+)?')
+
+# 强调包住的列表序号（如 "#### **1. 标题**"），去掉强调后再去掉一次
+_LIST_MARKER_RE = re.compile(r'\s*(?:[-*+]\s+)?(?:\d+\.\s+)?')
+
+# 行内标记（按优先级排列的分支，只在各自的分组中保留文字）
+_INLINE_RE = re.compile(
+    r'`[^`]*`'                          # 行内代码：删除
+    r'|!\[[^\]]*\]\([^)]*\)'            # 图片：删除
+    r'|\[([^\]]+)\]\([^)]*\)'           # 链接：保留文字
+    r'|\*\*([^*]+)\*\*|__([^_]+)__'     # 加粗
+    r'|\*([^*]+)\*|(?<!\w)_([^_]+)_(?!\w)'  # 斜体（不处理单词内的下划线）
+)
+
+
+def _replace_inline(match):
+    for text in match.groups():
+        if text is not None:
+            return _INLINE_RE.sub(_replace_inline, text)
+    return ''
+
+
+def _lines(content):
+    """逐行产生文本，不预先拆分整篇内容"""
+    start = 0
+    while start <= len(content):
+        end = content.find('\n', start)
+        if end == -1:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
+
+def generate_excerpt(content, max_length=200):
+    """
+    从 Markdown 内容生成纯文本摘要
+
+    Args:
+        content: Markdown 格式的文本内容
+        max_length: 摘要最大长度
+
+    Returns:
+        纯文本摘要，超过 max_length 时截断并加上省略号
+    """
+    if not content:
+        return ''
+
+    words = []
+    length = -1  # 按单个空格连接后的长度
+    in_fence = False
+
+    for line in _lines(content):
+        stripped = line.lstrip()
+        if stripped.startswith('```'):
+            # 同一行内开始并结束的代码（```x```）不改变围栏状态
+            in_fence = in_fence != (stripped.count('```') % 2 == 1)
+            continue
+        if in_fence:
+            continue
+
+        line = line[_BLOCK_PREFIX_RE.match(line).end():]
+        line = _INLINE_RE.sub(_replace_inline, line)
+        line = line[_LIST_MARKER_RE.match(line).end():]
+        for word in line.split():
+            words.append(word)
+            length += len(word) + 1
+            if length > max_length:
+                return ' '.join(words)[:max_length] + '...'
+
+    return ' '.join(words)
@@ -0,0 +1,150 @@
+"""
+跨 worker 缓存失效广播
+
+gunicorn 的每个 worker 各自持有页面缓存、用户缓存等进程内缓存，
+一个 worker 修改文章或分类后，其他 worker 的缓存不会收到通知。
+这里用数据库中的 cache_invalidation 表作为消息队列：
+
+- publish() 在本进程立即执行失效处理，并插入一条消息（频道 + 键列表）
+- 每个 worker 在请求开始时最多每 INVALIDATION_POLL_INTERVAL 秒轮询一次
+  id 大于上次位置的消息（主键范围查询），交给订阅该频道的处理函数
+
+消息表与文章在同一个 SQLite 文件中，共享 instance/ 卷的多个容器也能收到通知，
+不需要额外的服务。超过 INVALIDATION_RETENTION 秒的消息在发布时顺带清理。
+消息表在 init_app 时创建（gunicorn 部署不会执行 init_db），请求中不再检查。
+"""
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import db, CacheInvalidation
+
+
+# 轮询间隔（秒）
+INVALIDATION_POLL_INTERVAL = float(os.getenv('INVALIDATION_POLL_INTERVAL', 1.0))
+
+# 消息保留时间（秒）
+INVALIDATION_RETENTION = float(os.getenv('INVALIDATION_RETENTION', 3600))
+
+# 键列表中的通配符：清空该频道对应的整个缓存
+ALL = '*'
+
+
+def create_invalidation_table():
+    """创建 cache_invalidation 表（已存在时跳过）"""
+    CacheInvalidation.__table__.create(db.engine, checkfirst=True)
+
+
+class InvalidationBus:
+    """缓存失效消息的发布和轮询（每个 worker 进程一个实例）"""
+
+    def __init__(self, poll_interval=INVALIDATION_POLL_INTERVAL, retention=INVALIDATION_RETENTION):
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.app = None
+        self._handlers = {}  # channel -> [handler(keys)]
+        self._last_id = None
+        self._next_poll = 0.0
+        self._next_prune = 0.0
+        self._origin = None
+        self._origin_pid = None
+        self._poll_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        with app.app_context():
+            try:
+                create_invalidation_table()
+            except SQLAlchemyError:
+                app.logger.exception('创建缓存失效消息表失败')
+
+        @app.before_request
+        def poll_invalidations():
+            self.poll()
+
+    @property
+    def origin(self):
+        # 按进程生成（--preload 时 worker 由同一个主进程 fork 出来）
+        pid = os.getpid()
+        if self._origin_pid != pid:
+            self._origin = f'{socket.gethostname()}:{pid}:{secrets.token_hex(4)}'
+            self._origin_pid = pid
+        return self._origin
+
+    def subscribe(self, channel, handler):
+        """注册处理函数，handler 接收键列表"""
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def publish(self, channel, *keys):
+        """在本进程立即失效，并通知其他 worker"""
+        keys = list(keys)
+        self._dispatch(channel, keys)
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(insert(CacheInvalidation).values(
+                    channel=channel, keys=json.dumps(keys), origin=self.origin, created_at=datetime.utcnow()))
+                self._prune(conn)
+        except SQLAlchemyError:
+            if self.app is not None:
+                self.app.logger.exception('发布缓存失效消息失败: %s %s', channel, keys)
+
+    def poll(self, force=False):
+        """处理其他 worker 发布的消息，返回处理的消息数"""
+        now = time.monotonic()
+        if not force and now < self._next_poll:
+            return 0
+        # 其他线程正在轮询时直接跳过
+        if not self._poll_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._next_poll = now + self.poll_interval
+            with db.engine.connect() as conn:
+                if self._last_id is None:
+                    # 进程刚启动，缓存为空，从当前位置开始
+                    self._last_id = conn.execute(select(func.max(CacheInvalidation.id))).scalar() or 0
+                    return 0
+                rows = conn.execute(
+                    select(CacheInvalidation.id, CacheInvalidation.channel,
+                           CacheInvalidation.keys, CacheInvalidation.origin)
+                    .where(CacheInvalidation.id > self._last_id)
+                    .order_by(CacheInvalidation.id)).all()
+
+            origin = self.origin
+            for message_id, channel, keys, message_origin in rows:
+                self._last_id = message_id
+                if message_origin != origin:
+                    self._dispatch(channel, json.loads(keys))
+            return len(rows)
+        except SQLAlchemyError:
+            if self.app is not None:
+                self.app.logger.exception('轮询缓存失效消息失败')
+            return 0
+        finally:
+            self._poll_lock.release()
+
+    def _dispatch(self, channel, keys):
+        for handler in self._handlers.get(channel, ()):
+            handler(keys)
+
+    def _prune(self, conn):
+        now = time.monotonic()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.retention / 10
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention)
+        conn.execute(delete(CacheInvalidation).where(CacheInvalidation.created_at < cutoff))
+
+
+invalidation_bus = InvalidationBus()
+
+
+def init_app(app):
+    """创建消息表，每个请求开始时轮询失效消息"""
+    invalidation_bus.init_app(app)
@@ -0,0 +1,254 @@
+"""
+旧版 news/ 目录文章索引
+
+按文件路径缓存 (mtime, size, 标题, frontmatter)，只读取文件头部
+（frontmatter 或 <title>）而不是整篇文章。刷新时只对目录做一次 scandir，
+未变化的文件不会被重新打开。索引持久化到 instance/ 目录，进程重启后可直接复用。
+"""
+import json
+import os
+import re
+import threading
+import time
+
+
+# 两次目录扫描之间的最短间隔（秒）
+REFRESH_INTERVAL = 2.0
+
+READ_CHUNK = 4096
+
+LEGACY_EXTENSIONS = ('.md', '.html')
+
+INDEX_FILE = None  # 将在 init_app 中初始化
+
+_HEADING_RE = re.compile(r'^#\s+(.*)', re.MULTILINE)
+_TITLE_RE = re.compile(r'<title>(.*?)</title>')
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def init_app(app):
+    """初始化索引持久化路径"""
+    global INDEX_FILE
+    INDEX_FILE = os.path.join(app.instance_path, 'legacy_index.json')
+
+
+def parse_frontmatter(frontmatter):
+    """解析 frontmatter 中的 title/category/date 字段"""
+    meta = {}
+    for line in frontmatter.split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            key = key.strip()
+            if key in ('title', 'category', 'date'):
+                meta[key] = value.strip()
+    return meta
+
+
+def split_frontmatter(content):
+    """
+    拆分 YAML frontmatter 和正文
+
+    Returns:
+        (meta, body)，没有 frontmatter 时 meta 为空字典、body 为原文
+    """
+    if content.startswith('---'):
+        frontmatter_end = content.find('---', 3)
+        if frontmatter_end != -1:
+            meta = parse_frontmatter(content[3:frontmatter_end])
+            return meta, content[frontmatter_end + 3:].strip()
+    return {}, content
+
+
+def _read_until(f, done):
+    """分块读取文件，直到 done(buffer, eof) 返回非 None 的结果"""
+    buffer = ''
+    while True:
+        chunk = f.read(READ_CHUNK)
+        eof = not chunk
+        buffer += chunk
+        result = done(buffer, eof)
+        if result is not None or eof:
+            return result
+
+
+def _scan_markdown(f, filename):
+    """读取 Markdown 文件头部，返回 (title, meta)"""
+    def frontmatter(buffer, eof):
+        if not buffer.startswith('---'):
+            if len(buffer) >= 3 or eof:
+                return False
+            return None
+        frontmatter_end = buffer.find('---', 3)
+        if frontmatter_end != -1:
+            return parse_frontmatter(buffer[3:frontmatter_end])
+        return {} if eof else None
+
+    def heading(buffer, eof):
+        match = _HEADING_RE.search(buffer)
+        # 匹配必须以换行结束，否则标题可能被分块截断
+        if match and (eof or match.end() < len(buffer)):
+            return match.group(1)
+        return None
+
+    meta = _read_until(f, frontmatter)
+    if meta is not False:
+        return meta.get('title', filename), meta
+
+    f.seek(0)
+    return _read_until(f, heading) or filename, {}
+
+
+def _scan_html(f, filename):
+    """读取 HTML 文件直到 <title>，返回 (title, meta)"""
+    def title(buffer, eof):
+        match = _TITLE_RE.search(buffer)
+        return match.group(1) if match else None
+
+    return _read_until(f, title) or filename, {}
+
+
+def _scan_file(path, filename):
+    with open(path, 'r', encoding='utf-8') as f:
+        if filename.endswith('.md'):
+            return _scan_markdown(f, filename)
+        return _scan_html(f, filename)
+
+
+class LegacyIndex:
+    """单个目录的旧版文章索引"""
+
+    def __init__(self, news_dir, index_file=None):
+        self.news_dir = news_dir
+        self.index_file = index_file
+        self.entries = {}
+        # 条目变化时递增，可作为依赖列表内容的缓存键
+        self.generation = 0
+        self._sorted = []
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """从持久化文件恢复索引，扫描时会按 mtime/size 校验"""
+        if not self.index_file or not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('directory') == os.path.abspath(self.news_dir):
+            self.entries = data.get('entries', {})
+            self._sort()
+
+    def _save(self):
+        if not self.index_file:
+            return
+        data = {'directory': os.path.abspath(self.news_dir), 'entries': self.entries}
+        tmp_path = f'{self.index_file}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_file)
+        except OSError:
+            pass
+
+    def _sort(self):
+        # 文件名以日期时间开头，倒序即最新在前
+        self._sorted = sorted(self.entries.values(), key=lambda e: e['file'], reverse=True)
+
+    def refresh(self, force=False):
+        """增量刷新：只重新解析新增或 mtime/size 变化的文件"""
+        now = time.monotonic()
+        if not force and now - self._last_scan < REFRESH_INTERVAL:
+            return
+
+        with self._lock:
+            if not force and now - self._last_scan < REFRESH_INTERVAL:
+                return
+
+            seen = {}
+            changed = False
+            if os.path.isdir(self.news_dir):
+                with os.scandir(self.news_dir) as it:
+                    for dirent in it:
+                        if not dirent.name.endswith(LEGACY_EXTENSIONS) or not dirent.is_file():
+                            continue
+                        try:
+                            stat = dirent.stat()
+                        except OSError:
+                            continue  # 扫描期间被删除
+                        entry = self.entries.get(dirent.name)
+                        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                            seen[dirent.name] = entry
+                            continue
+                        try:
+                            title, meta = _scan_file(dirent.path, dirent.name)
+                        except (OSError, UnicodeDecodeError):
+                            continue
+                        seen[dirent.name] = {
+                            'file': dirent.name,
+                            'filename': dirent.name.replace('.md', '').replace('.html', ''),
+                            'title': title,
+                            'meta': meta,
+                            'mtime': stat.st_mtime_ns,
+                            'size': stat.st_size,
+                        }
+                        changed = True
+
+            if changed or len(seen) != len(self.entries):
+                self.entries = seen
+                self.generation += 1
+                self._sort()
+                self._save()
+            self._last_scan = time.monotonic()
+
+    def page(self, page=1, per_page=20):
+        """分页返回文章列表（最新在前）"""
+        self.refresh()
+        start = max(page - 1, 0) * per_page
+        items = [{'filename': e['filename'], 'title': e['title']}
+                 for e in self._sorted[start:start + per_page]]
+        return items, len(self._sorted)
+
+    def lookup(self, filename):
+        """
+        按文件名（不含扩展名）查找文章，.md 优先于 .html
+
+        Returns:
+            (路径, 索引条目)，不存在时返回 (None, None)
+        """
+        self.refresh()
+        entry = self._find(filename)
+        if entry is None and any(
+                os.path.isfile(os.path.join(self.news_dir, filename + ext))
+                for ext in LEGACY_EXTENSIONS):
+            # 刷新间隔内新增的文件
+            self.refresh(force=True)
+            entry = self._find(filename)
+        if entry is None:
+            return None, None
+        return os.path.join(self.news_dir, entry['file']), entry
+
+    def _find(self, filename):
+        for ext in LEGACY_EXTENSIONS:
+            entry = self.entries.get(filename + ext)
+            if entry:
+                return entry
+        return None
+
+
+def get_legacy_index(news_dir):
+    """获取（必要时创建）指定目录的索引"""
+    key = os.path.abspath(news_dir)
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = LegacyIndex(news_dir, INDEX_FILE)
+                _indexes[key] = index
+    return index
@@ -2,10 +2,13 @@
 数据库模型定义
 """
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import joinedload, defer, column_property
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from passwords import PASSWORD_HASH_METHOD
+from sqlite_profile import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 class User(db.Model):
@@ -23,8 +26,8 @@ class User(db.Model):
     articles = db.relationship('Article', backref='author', lazy='dynamic')
 
     def set_password(self, password):
-        """设置密码（加密）"""
-        self.password_hash = generate_password_hash(password)
+        """设置密码（加密，在当前线程中计算，供脚本和初始化使用）"""
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
 
     def check_password(self, password):
         """验证密码"""
@@ -76,7 +79,8 @@ class Article(db.Model):
     html_content = db.Column(db.Text)  # 渲染后的 HTML
     excerpt = db.Column(db.String(500))  # 文章摘要
     cover_image = db.Column(db.String(500))  # 封面图
-    status = db.Column(db.String(20), default='draft')  # draft, published, archived
+    # draft, published, archived；active_history：修改已过期的对象时也加载旧值（stats 按状态维护计数）
+    status = column_property(db.Column(db.String(20), default='draft'), active_history=True)
     view_count = db.Column(db.Integer, default=0)
     sort_order = db.Column(db.Integer, default=0)
 
@@ -85,7 +89,7 @@ class Article(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=True)
 
     # 时间戳
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     published_at = db.Column(db.DateTime)
 
@@ -94,6 +98,21 @@ class Article(db.Model):
         db.Index('idx_article_status_published', 'status', 'published_at'),
     )
 
+    @staticmethod
+    def eager_relations():
+        """列表查询的加载选项：同一条 SQL 中 JOIN 出分类和作者，避免 to_dict 逐行懒加载"""
+        return (joinedload(Article.category), joinedload(Article.author))
+
+    @staticmethod
+    def list_options():
+        """
+        列表查询的加载选项：在 eager_relations 基础上延迟加载正文
+
+        content / html_content 不进入 SELECT（to_dict 用不到），
+        只在访问时（to_detail_dict）单独加载
+        """
+        return (*Article.eager_relations(), defer(Article.content), defer(Article.html_content))
+
     def to_dict(self):
         """转为字典"""
         return {
@@ -122,6 +141,71 @@ class Article(db.Model):
         }
 
 
+class ArticleRelation(db.Model):
+    """相关文章（按内容相似度预计算的 top-k 邻居）"""
+    __tablename__ = 'article_relation'
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)
+    related_id = db.Column(db.Integer, db.ForeignKey('article.id'), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index('idx_article_relation_related', 'related_id'),
+    )
+
+
+class SiteStats(db.Model):
+    """站点统计计数（单行，随用户和文章的增删、发布状态变化在同一事务内更新）"""
+    __tablename__ = 'site_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    total_users = db.Column(db.Integer, nullable=False, default=0)
+    total_articles = db.Column(db.Integer, nullable=False, default=0)
+    published_articles = db.Column(db.Integer, nullable=False, default=0)
+    draft_articles = db.Column(db.Integer, nullable=False, default=0)
+    reconciled_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        """转为字典"""
+        return {
+            'total_users': self.total_users,
+            'total_articles': self.total_articles,
+            'published_articles': self.published_articles,
+            'draft_articles': self.draft_articles,
+        }
+
+
+class CacheInvalidation(db.Model):
+    """跨 worker 的缓存失效消息（由 invalidation.py 写入和轮询）"""
+    __tablename__ = 'cache_invalidation'
+    id = db.Column(db.Integer, primary_key=True)
+    channel = db.Column(db.String(50), nullable=False)
+    keys = db.Column(db.Text, nullable=False)  # JSON 数组
+    origin = db.Column(db.String(100))  # 发送消息的进程，轮询时跳过自己发出的消息
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    # AUTOINCREMENT：旧消息清理后 id 也不会被复用，轮询位置始终单调
+    __table_args__ = {'sqlite_autoincrement': True}
+
+
+class ArticleTrending(db.Model):
+    """热门排行的前向衰减计数（由 trending.py 随阅读量写回累加，所有 worker 共享）"""
+    __tablename__ = 'article_trending'
+    article_id = db.Column(db.Integer, primary_key=True)
+    period = db.Column(db.String(10), primary_key=True)  # 时间窗口名称（hour / day / week）
+    score = db.Column(db.Float, nullable=False, default=0.0)  # 按该窗口基准时间放大后的计数
+
+    __table_args__ = (
+        db.Index('idx_article_trending_score', 'period', 'score'),
+    )
+
+
+class TrendingLandmark(db.Model):
+    """热门排行各时间窗口的衰减基准时间（Unix 时间戳）"""
+    __tablename__ = 'trending_landmark'
+    period = db.Column(db.String(10), primary_key=True)
+    landmark = db.Column(db.Float, nullable=False)
+
+
 class Setting(db.Model):
     """系统设置表"""
     id = db.Column(db.Integer, primary_key=True)
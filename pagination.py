@@ -0,0 +1,80 @@
+"""
+文章列表的游标（keyset）分页
+
+按 (published_at DESC, id DESC) 排序，用上一页最后一行的 (published_at, id)
+作为下一页的起点，查询走 idx_article_status_published 索引的范围扫描，
+不再需要 OFFSET 和每页一次的 COUNT(*)。
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+from models import Article
+
+
+class InvalidCursor(ValueError):
+    """游标格式错误"""
+
+
+def encode_cursor(article):
+    """把一行的排序键编码为不透明的游标字符串"""
+    published_at = article.published_at.isoformat() if article.published_at else None
+    raw = json.dumps([published_at, article.id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    解码游标
+
+    Returns:
+        (published_at, id)，空游标（第一页）返回 None
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        published_at, article_id = json.loads(raw)
+        if published_at is not None:
+            published_at = datetime.fromisoformat(published_at)
+        return published_at, int(article_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def paginate_by_cursor(query, cursor, per_page):
+    """
+    游标分页
+
+    published_at 为 NULL 的文章（草稿）排在最后，按 id 倒序继续分页。
+
+    Args:
+        query: 已带筛选条件、未排序的 Article 查询
+        cursor: 上一页返回的 next_cursor，第一页传空字符串
+        per_page: 每页数量
+
+    Returns:
+        (文章列表, next_cursor)，没有下一页时 next_cursor 为 None
+    """
+    position = decode_cursor(cursor)
+    # 多取一行用于判断是否还有下一页
+    limit = per_page + 1
+    items = []
+
+    if position is None or position[0] is not None:
+        dated = query.filter(Article.published_at.isnot(None))
+        if position is not None:
+            dated = dated.filter(tuple_(Article.published_at, Article.id) < tuple_(*position))
+        items = dated.order_by(Article.published_at.desc(), Article.id.desc()).limit(limit).all()
+
+    if len(items) < limit:
+        undated = query.filter(Article.published_at.is_(None))
+        if position is not None and position[0] is None:
+            undated = undated.filter(Article.id < position[1])
+        items += undated.order_by(Article.id.desc()).limit(limit - len(items)).all()
+
+    next_cursor = encode_cursor(items[per_page - 1]) if len(items) > per_page else None
+    return items[:per_page], next_cursor
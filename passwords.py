@@ -0,0 +1,188 @@
+"""
+密码哈希
+
+scrypt / pbkdf2 是刻意耗时的 CPU 运算。gunicorn 同步 worker 直接计算时，
+集中到达的登录、注册请求会占满全部 worker，页面请求只能排队。
+这里把哈希计算放到独立的进程池中执行，并限制整台主机上同时进行的哈希请求数
+（默认比 gunicorn worker 数 WEB_CONCURRENCY 少一个）：等待哈希结果的请求会占住
+所在的同步 worker，名额少于 worker 数才能保证至少一个 worker 始终可以处理页面请求。
+名额用 instance/ 下的文件锁表示，所有 worker 共享，用完时立即抛出 HasherBusy（接口返回 503）。
+名额在子进程中的计算结束时才释放，等待超时的请求不会让实际运行的哈希数超过上限。
+
+哈希算法和成本由 PASSWORD_HASH_METHOD 配置（werkzeug 格式，如 scrypt:32768:8:1、
+pbkdf2:sha256:600000）。登录验证成功时，如果已保存哈希的参数与当前配置不同，
+会在同一次进程池调用中用新参数重新哈希。
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+try:
+    import fcntl
+except ImportError:  # Windows 上只在进程内限制
+    fcntl = None
+
+
+# 哈希算法和成本参数
+PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+
+# 每个 worker 进程池的大小，0 表示在请求线程中直接计算
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 1))
+
+# gunicorn worker 数（gunicorn 同样读取该环境变量作为 --workers 的默认值）
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 2))
+
+# 整台主机同时进行（计算中和等待中）的哈希请求上限，默认给页面请求留出一个 worker
+PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', max(1, WEB_CONCURRENCY - 1)))
+
+# 等待哈希结果的最长时间（秒）
+PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+
+
+class HasherBusy(RuntimeError):
+    """哈希名额已满或计算超时"""
+
+
+def normalize_method(method):
+    """补全 werkzeug 的默认参数，使配置值与已保存哈希的前缀可比较"""
+    name, _, args = method.partition(':')
+    if name == 'scrypt':
+        n, r, p = (args.split(':') + [None] * 3)[:3] if args else (None, None, None)
+        return f'scrypt:{n or 2 ** 15}:{r or 8}:{p or 1}'
+    if name == 'pbkdf2':
+        digest, _, iterations = args.partition(':')
+        return f'pbkdf2:{digest or "sha256"}:{iterations or DEFAULT_PBKDF2_ITERATIONS}'
+    return method
+
+
+def needs_rehash(pwhash, method=PASSWORD_HASH_METHOD):
+    """已保存的哈希是否使用了与当前配置不同的算法或参数"""
+    return pwhash.split('$', 1)[0] != normalize_method(method)
+
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(pwhash, password, method):
+    # 在进程池中执行：验证成功且参数过期时顺带生成新哈希
+    if not check_password_hash(pwhash, password):
+        return False, None
+    if needs_rehash(pwhash, method):
+        return True, generate_password_hash(password, method=method)
+    return True, None
+
+
+class PasswordHasher:
+    """有界进程池上的密码哈希（每个 worker 进程一个实例）"""
+
+    def __init__(self, method=PASSWORD_HASH_METHOD, workers=PASSWORD_HASH_WORKERS,
+                 queue=PASSWORD_HASH_QUEUE, timeout=PASSWORD_HASH_TIMEOUT):
+        self.method = method
+        self.workers = workers
+        self.queue = queue
+        self.timeout = timeout
+        self.lock_dir = None
+        self._slots = threading.BoundedSemaphore(queue)
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.lock_dir = app.instance_path
+
+    def hash(self, password):
+        """生成密码哈希，名额已满时抛出 HasherBusy"""
+        return self._run(_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        """
+        验证密码
+
+        Returns:
+            (是否匹配, 新哈希)；新哈希仅在匹配且参数过期时返回，否则为 None
+        """
+        return self._run(_verify, pwhash, password, self.method)
+
+    def _run(self, fn, *args):
+        slot = self._acquire_slot()
+        if self.workers <= 0:
+            try:
+                return fn(*args)
+            finally:
+                self._release_slot(slot)
+
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            self._release_slot(slot)
+            self._pool = None
+            raise HasherBusy('密码哈希进程异常退出')
+        except BaseException:
+            self._release_slot(slot)
+            raise
+
+        # 计算结束（或尚未开始即被取消）时才释放名额，等待超时后子进程中的计算仍占用名额
+        future.add_done_callback(lambda _: self._release_slot(slot))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HasherBusy('密码哈希超时')
+        except BrokenProcessPool:
+            # 子进程异常退出，下次调用时重新创建进程池
+            self._pool = None
+            raise HasherBusy('密码哈希进程异常退出')
+
+    def _acquire_slot(self):
+        if self.queue <= 0:
+            return None
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy('密码哈希请求过多')
+        if fcntl is None or not self.lock_dir:
+            return -1
+
+        # 每个名额对应一个锁文件，flock 按打开的文件描述区分持有者，
+        # 同一进程的不同线程和不同 worker 进程之间都会互斥
+        os.makedirs(self.lock_dir, exist_ok=True)
+        for index in range(self.queue):
+            fd = os.open(os.path.join(self.lock_dir, f'password_hash.{index}.lock'), os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                os.close(fd)
+        self._slots.release()
+        raise HasherBusy('密码哈希请求过多')
+
+    def _release_slot(self, slot):
+        if slot is None:
+            return
+        if slot >= 0:
+            os.close(slot)  # 关闭文件即释放 flock
+        self._slots.release()
+
+    def _get_pool(self):
+        # 延迟到第一次使用时创建，gunicorn fork 出的每个 worker 各自拥有进程池
+        pid = os.getpid()
+        if self._pool is not None and self._pool_pid == pid:
+            return self._pool
+        with self._lock:
+            if self._pool is None or self._pool_pid != pid:
+                # worker 中已有后台线程（阅读量写回等），不使用 fork 创建子进程
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(method))
+                self._pool_pid = pid
+        return self._pool
+
+
+password_hasher = PasswordHasher()
+
+
+def init_app(app):
+    """使用 instance/ 目录存放跨 worker 共享的名额锁文件"""
+    password_hasher.init_app(app)
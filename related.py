@@ -0,0 +1,321 @@
+"""
+基于内容相似度的相关文章
+
+对已发布文章做 TF-IDF 向量化（中文按二元组切分，英文按单词），
+用 NumPy 以稀疏列存储（CSC）计算余弦相似度，每篇文章的 top-k 邻居写入
+article_relation 表。文章发布或更新时只重新切分该文章并增量更新受影响的邻居，
+show_news 通过一次按主键的查询读取相关文章。
+
+增量更新需要同步语料和重建权重矩阵，由 RelatedRefresher 在后台线程中执行，
+写请求只登记文章 id；短时间内的多次登记合并处理。
+"""
+import re
+import threading
+import weakref
+from collections import Counter
+
+import numpy as np
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import db, Article, ArticleRelation
+
+
+# 每篇文章保存的邻居数量
+TOP_K = 6
+
+# 标题词频的加权倍数
+TITLE_WEIGHT = 3
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_TOKEN_RE = re.compile(r'[\u4e00-\u9fff]+|[a-z][a-z0-9+#]*|\d{3,}')
+
+_STOPWORDS = frozenset({
+    'the', 'and', 'for', 'with', 'that', 'this', 'are', 'was', 'from', 'you', 'your',
+    'http', 'https', 'www', 'com', 'html', 'div', 'span', 'class', 'strong',
+})
+
+_table_ready = weakref.WeakKeyDictionary()
+
+
+def tokenize(text):
+    """切分文本：连续汉字生成二元组，英文单词小写后保留长度 >= 2 的词"""
+    tokens = []
+    for run in _TOKEN_RE.findall(_TAG_RE.sub(' ', text or '').lower()):
+        if '\u4e00' <= run[0] <= '\u9fff':
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        elif len(run) > 1 and run not in _STOPWORDS:
+            tokens.append(run)
+    return tokens
+
+
+def article_terms(title, excerpt, content):
+    """文章的词频统计"""
+    counts = Counter(tokenize(excerpt))
+    counts.update(tokenize(content))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+def ensure_relation_table():
+    """确保 article_relation 表存在（gunicorn 部署不会执行 init_db）"""
+    engine = db.engine
+    if engine not in _table_ready:
+        ArticleRelation.__table__.create(engine, checkfirst=True)
+        _table_ready[engine] = True
+
+
+class SimilarityIndex:
+    """
+    TF-IDF 相似度索引
+
+    缓存每篇文章的词频（按 updated_at 判断是否需要重新切分），
+    需要时用 NumPy 构建按列压缩的权重矩阵。
+    """
+
+    def __init__(self):
+        self._counts = {}  # article_id -> Counter
+        self._versions = {}  # article_id -> updated_at
+        self._matrix = None
+        self._lock = threading.Lock()
+
+    def sync(self):
+        """与数据库中已发布的文章同步，只重新读取新增或更新过的文章"""
+        rows = db.session.query(Article.id, Article.updated_at)\
+            .filter(Article.status == 'published').all()
+        current = dict(rows)
+
+        removed = set(self._counts) - set(current)
+        stale = [article_id for article_id, updated_at in current.items()
+                 if self._versions.get(article_id, False) != updated_at]
+
+        for article_id in removed:
+            self._counts.pop(article_id, None)
+            self._versions.pop(article_id, None)
+
+        for start in range(0, len(stale), 200):
+            batch = stale[start:start + 200]
+            for article_id, title, excerpt, content, updated_at in db.session.query(
+                    Article.id, Article.title, Article.excerpt, Article.content, Article.updated_at
+            ).filter(Article.id.in_(batch)):
+                self._counts[article_id] = article_terms(title, excerpt, content)
+                self._versions[article_id] = updated_at
+
+        if removed or stale or self._matrix is None:
+            self._matrix = self._build_matrix()
+
+    def _build_matrix(self):
+        doc_ids = np.array(sorted(self._counts), dtype=np.int64)
+        vocabulary = {}
+        rows, cols, tfs = [], [], []
+        for row, article_id in enumerate(doc_ids.tolist()):
+            for term, tf in self._counts[article_id].items():
+                rows.append(row)
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                tfs.append(tf)
+
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        tfs = np.array(tfs, dtype=np.float64)
+
+        # 亚线性 TF * 平滑 IDF，再按行做 L2 归一化
+        n_docs = len(doc_ids)
+        df = np.bincount(cols, minlength=len(vocabulary))
+        idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+        weights = (1.0 + np.log(tfs)) * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_docs))
+        weights /= np.where(norms > 0, norms, 1.0)[rows]
+
+        # 行已按顺序生成（CSR），再按列排序得到 CSC
+        row_ptr = np.searchsorted(rows, np.arange(n_docs + 1))
+        order = np.argsort(cols, kind='stable')
+        col_ptr = np.searchsorted(cols[order], np.arange(len(vocabulary) + 1))
+
+        return {
+            'doc_ids': doc_ids,
+            'row_of': {article_id: row for row, article_id in enumerate(doc_ids.tolist())},
+            'row_ptr': row_ptr, 'row_cols': cols, 'row_weights': weights,
+            'col_ptr': col_ptr, 'col_rows': rows[order], 'col_weights': weights[order],
+        }
+
+    def scores(self, article_id):
+        """文章与全部已发布文章的余弦相似度（按 doc_ids 顺序）"""
+        m = self._matrix
+        row = m['row_of'].get(article_id)
+        if row is None:
+            return None
+        start, end = m['row_ptr'][row], m['row_ptr'][row + 1]
+        cols, query_weights = m['row_cols'][start:end], m['row_weights'][start:end]
+        if len(cols) == 0:
+            return np.zeros(len(m['doc_ids']))
+
+        # 只访问查询文章包含的词的倒排列表
+        lengths = m['col_ptr'][cols + 1] - m['col_ptr'][cols]
+        postings = np.concatenate([np.arange(m['col_ptr'][c], m['col_ptr'][c + 1]) for c in cols])
+        products = m['col_weights'][postings] * np.repeat(query_weights, lengths)
+        scores = np.bincount(m['col_rows'][postings], weights=products, minlength=len(m['doc_ids']))
+        scores[row] = 0.0
+        return scores
+
+    def top_k(self, article_id, k=TOP_K):
+        """返回 [(related_id, score)]，按相似度降序"""
+        scores = self.scores(article_id)
+        if scores is None:
+            return []
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        doc_ids = self._matrix['doc_ids']
+        return [(int(doc_ids[i]), float(scores[i])) for i in candidates if scores[i] > 0]
+
+    def rebuild(self, k=TOP_K):
+        """重新计算全部文章的邻居，返回处理的文章数"""
+        with self._lock:
+            ensure_relation_table()
+            self.sync()
+            ArticleRelation.query.delete()
+            for article_id in self._counts:
+                _store(article_id, self.top_k(article_id, k), replace=False)
+            db.session.commit()
+            return len(self._counts)
+
+    def refresh(self, article_id, k=TOP_K):
+        """
+        文章发布、更新、下架或删除后增量更新邻居表
+
+        重新计算该文章自身的邻居，以及相似度足以进入 top-k 或
+        原本把它列为邻居的文章。
+
+        Returns:
+            邻居列表发生变化的文章 id 集合
+        """
+        with self._lock:
+            ensure_relation_table()
+            self.sync()
+
+            affected = {article_id}
+            affected.update(source_id for (source_id,) in db.session.query(ArticleRelation.article_id)
+                            .filter(ArticleRelation.related_id == article_id))
+
+            scores = self.scores(article_id)
+            if scores is not None:
+                floors = dict(db.session.query(ArticleRelation.article_id, db.func.min(ArticleRelation.score))
+                              .group_by(ArticleRelation.article_id)
+                              .having(db.func.count() >= k))
+                doc_ids = self._matrix['doc_ids']
+                for i in np.nonzero(scores > 0)[0]:
+                    other_id = int(doc_ids[i])
+                    if scores[i] > floors.get(other_id, 0.0):
+                        affected.add(other_id)
+
+            # 受影响文章原有的邻居：一次 IN 查询读取，一次 IN 删除
+            previous = {}
+            for source_id, related_id in db.session.query(ArticleRelation.article_id, ArticleRelation.related_id)\
+                    .filter(ArticleRelation.article_id.in_(affected))\
+                    .order_by(ArticleRelation.article_id, ArticleRelation.rank):
+                previous.setdefault(source_id, []).append(related_id)
+            ArticleRelation.query.filter(ArticleRelation.article_id.in_(affected))\
+                .delete(synchronize_session=False)
+
+            changed = set()
+            for other_id in affected:
+                neighbours = self.top_k(other_id, k)
+                if [n for n, _ in neighbours] != previous.get(other_id, []):
+                    changed.add(other_id)
+                _store(other_id, neighbours, replace=False)
+            db.session.commit()
+            return changed
+
+
+def _store(article_id, neighbours, replace=True):
+    if replace:
+        ArticleRelation.query.filter_by(article_id=article_id).delete()
+    db.session.add_all(ArticleRelation(article_id=article_id, rank=rank, related_id=related_id, score=score)
+                       for rank, (related_id, score) in enumerate(neighbours))
+
+
+similarity_index = SimilarityIndex()
+
+
+class RelatedRefresher:
+    """在后台线程中增量更新相关文章（每个 worker 进程一个实例）"""
+
+    def __init__(self, index):
+        self.index = index
+        self.app = None
+        self.on_changed = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def init_app(self, app, on_changed=None):
+        """
+        Args:
+            on_changed: 更新完成后在应用上下文中调用，参数为邻居列表变化的文章 id 集合
+        """
+        self.app = app
+        self.on_changed = on_changed
+
+    def schedule(self, article_id):
+        """登记需要更新的文章，不访问数据库"""
+        with self._lock:
+            self._pending.add(article_id)
+        self._ensure_thread()
+        self._wakeup.set()
+
+    def run_pending(self):
+        """更新已登记的文章，返回邻居列表变化的文章 id 集合"""
+        with self._lock:
+            batch, self._pending = self._pending, set()
+        if not batch:
+            return set()
+
+        changed = set()
+        with self.app.app_context():
+            for article_id in batch:
+                try:
+                    changed |= self.index.refresh(article_id)
+                except SQLAlchemyError:
+                    db.session.rollback()
+                    self.app.logger.exception('更新相关文章失败: %s', article_id)
+            if changed and self.on_changed is not None:
+                self.on_changed(changed)
+        return changed
+
+    def _ensure_thread(self):
+        # 延迟到第一次登记时启动，gunicorn fork 出的每个 worker 各自拥有更新线程
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='related-refresh', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                self.run_pending()
+            except Exception:
+                self.app.logger.exception('更新相关文章失败')
+
+
+related_refresher = RelatedRefresher(similarity_index)
+
+
+def related_articles(article, limit=3):
+    """读取预计算的相关文章（仅返回已发布的）"""
+    ensure_relation_table()
+    return Article.query.join(ArticleRelation, ArticleRelation.related_id == Article.id)\
+        .filter(ArticleRelation.article_id == article.id, Article.status == 'published')\
+        .options(*Article.list_options())\
+        .order_by(ArticleRelation.rank)\
+        .limit(limit).all()
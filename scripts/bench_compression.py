@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+响应压缩压测：传输字节数和首字节时间（TTFB）
+
+对运行中的服务依次用 identity / gzip / br 请求首页、文章页和文章 API，
+每种编码请求多次，输出响应大小和 TTFB 中位数
+（第一次请求需要压缩，之后命中压缩缓存）。
+
+    python scripts/bench_compression.py --url http://127.0.0.1:8009 --slug some-article
+"""
+import argparse
+import http.client
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+def fetch(host, port, path, encoding):
+    """返回 (状态码, 响应字节数, TTFB 秒, 总耗时秒)"""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {'Accept-Encoding': encoding} if encoding else {'Accept-Encoding': 'identity'}
+    start = time.perf_counter()
+    conn.request('GET', path, headers=headers)
+    response = conn.getresponse()
+    ttfb = time.perf_counter() - start
+    body = response.read()
+    total = time.perf_counter() - start
+    conn.close()
+    return response.status, len(body), ttfb, total
+
+
+def first_article_slug(host, port):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    conn.request('GET', '/api/articles?per_page=1')
+    articles = json.loads(conn.getresponse().read()).get('articles') or []
+    conn.close()
+    return articles[0]['slug'] if articles else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='响应压缩压测')
+    parser.add_argument('--url', default='http://127.0.0.1:8009', help='服务地址')
+    parser.add_argument('--slug', help='测试的文章 slug，默认取最新一篇')
+    parser.add_argument('--repeat', type=int, default=20, help='每种编码的请求次数')
+    args = parser.parse_args()
+
+    parts = urlsplit(args.url)
+    host, port = parts.hostname, parts.port or 80
+    slug = args.slug or first_article_slug(host, port)
+
+    paths = ['/']
+    if slug:
+        paths += [f'/{slug}', f'/api/articles/{slug}']
+
+    for path in paths:
+        print(path)
+        for encoding in ('', 'gzip', 'br'):
+            results = [fetch(host, port, path, encoding) for _ in range(args.repeat)]
+            status, size, first_ttfb, _ = results[0]
+            ttfb = statistics.median(r[2] for r in results[1:]) if len(results) > 1 else first_ttfb
+            total = statistics.median(r[3] for r in results)
+            print(f"  {encoding or 'identity':8} {status} {size:>8} 字节  "
+                  f"首次 TTFB {first_ttfb * 1000:6.1f}ms  TTFB 中位数 {ttfb * 1000:6.1f}ms  "
+                  f"总耗时中位数 {total * 1000:6.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
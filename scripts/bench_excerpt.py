@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+摘要生成压测：excerpt.generate_excerpt 与原来的多次正则替换实现对比
+
+样本包括短文章、长文章、代码较多的文章，以及数据库中的全部文章（如果存在），
+输出每类样本两种实现的耗时和输出一致的比例，并列出前几处差异。
+
+    python scripts/bench_excerpt.py [--db instance/news.db] [--repeat 200]
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import timeit
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excerpt import generate_excerpt
+
+
+def legacy_excerpt(content, max_length=200):
+    """原 app.generate_excerpt_from_markdown（14 次全文正则替换）"""
+    if not content:
+        return ''
+    clean_content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
+    clean_content = re.sub(r'`[^`]+`', '', clean_content)
+    clean_content = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', clean_content)
+    clean_content = re.sub(r'^#+\s*', '', clean_content, flags=re.MULTILINE)
+    clean_content = re.sub(r'\*\*([^*]+)\*\*', r'\1', clean_content)
+    clean_content = re.sub(r'\*([^*]+)\*', r'\1', clean_content)
+    clean_content = re.sub(r'__([^_]+)__', r'\1', clean_content)
+    clean_content = re.sub(r'_([^_]+)_', r'\1', clean_content)
+    clean_content = re.sub(r'^\s*[-*+]\s+', '', clean_content, flags=re.MULTILINE)
+    clean_content = re.sub(r'^\s*\d+\.\s+', '', clean_content, flags=re.MULTILINE)
+    clean_content = re.sub(r'^>\s*', '', clean_content, flags=re.MULTILINE)
+    clean_content = re.sub(r'\s+', ' ', clean_content).strip()
+    if len(clean_content) > max_length:
+        return clean_content[:max_length] + '...'
+    return clean_content
+
+
+PARAGRAPH = ('## 小标题\n\n人工智能领域本周有多项 **重要进展**，其中 [OpenAI](https://openai.com) '
+             '发布了新的 *推理模型*，Google 也更新了 `gemini-cli` 工具。\n\n'
+             '- 第一项：性能提升 30%\n- 第二项：支持更长的上下文\n1. 安装\n2. 配置\n\n'
+             '> 引用：这是一段评论。\n\n')
+
+CODE_BLOCK = '```python\ndef handler(event):\n    return {"status": 200, "body": event}\n```\n\n'
+
+
+def samples():
+    yield '短文章', ['# 标题\n\n' + PARAGRAPH]
+    yield '长文章', ['# 标题\n\n' + PARAGRAPH * 200]
+    yield '代码较多', ['# 标题\n\n' + CODE_BLOCK * 30 + PARAGRAPH + (CODE_BLOCK + PARAGRAPH) * 50]
+
+
+def database_samples(path):
+    if not os.path.exists(path):
+        return []
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        return [row[0] for row in conn.execute('SELECT content FROM article') if row[0]]
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='摘要生成压测')
+    parser.add_argument('--db', default=os.path.join('instance', 'news.db'), help='读取真实文章的数据库')
+    parser.add_argument('--repeat', type=int, default=200, help='每篇文章的执行次数')
+    parser.add_argument('--show-diffs', type=int, default=3, help='输出的差异数量')
+    args = parser.parse_args()
+
+    groups = list(samples())
+    corpus = database_samples(args.db)
+    if corpus:
+        groups.append((f'数据库文章 ({len(corpus)} 篇)', corpus))
+
+    diffs = []
+    for label, texts in groups:
+        legacy = timeit.timeit(lambda: [legacy_excerpt(t) for t in texts], number=args.repeat)
+        current = timeit.timeit(lambda: [generate_excerpt(t) for t in texts], number=args.repeat)
+        same = 0
+        for text in texts:
+            old, new = legacy_excerpt(text), generate_excerpt(text)
+            if old == new:
+                same += 1
+            else:
+                diffs.append((label, old, new))
+        per_call = args.repeat * len(texts)
+        print(f"{label}: 原实现 {legacy / per_call * 1e6:9.1f}µs  新实现 {current / per_call * 1e6:7.1f}µs  "
+              f"加速 {legacy / current:5.1f}x  输出一致 {same}/{len(texts)}")
+
+    for label, old, new in diffs[:args.show_diffs]:
+        print(f"\n[{label}]\n  原实现: {old}\n  新实现: {new}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+列表查询压测：加载正文（eager_relations）与延迟加载正文（list_options）对比
+
+在临时 SQLite 文件中生成 --articles 篇文章（每篇 content 和 html_content 各约 --body-kb KB），
+对首页最新列表、热门排行（按阅读量全表排序）和翻页查询分别执行多次，
+输出耗时中位数和 tracemalloc 内存峰值。
+
+    python scripts/bench_list_queries.py [--articles 10000] [--body-kb 8] [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+
+from models import db, Article, User, Category
+
+
+QUERIES = {
+    '首页最新 10 篇': lambda q: q.order_by(Article.published_at.desc()).limit(10),
+    '热门排行 10 篇': lambda q: q.order_by(Article.view_count.desc()).limit(10),
+    '第 50 页': lambda q: q.order_by(Article.published_at.desc()).offset(490).limit(10),
+}
+
+
+def create_app(path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def populate(count, body_kb):
+    author = User(username='author', email='author@example.com', password_hash='x')
+    category = Category(name='技术资讯', slug='tech')
+    db.session.add_all([author, category])
+    db.session.commit()
+
+    paragraph = '人工智能领域本周有多项重要进展，新的推理模型在多项基准上刷新纪录。\n\n'
+    body = paragraph * max(1, body_kb * 1024 // len(paragraph.encode('utf-8')))
+    start = datetime(2020, 1, 1)
+    for offset in range(0, count, 1000):
+        db.session.execute(insert(Article), [{
+            'title': f'文章 {i}',
+            'slug': f'article-{i}',
+            'content': body,
+            'html_content': f'<p>{body}</p>',
+            'excerpt': paragraph[:100],
+            'status': 'published',
+            'view_count': (i * 7919) % 10007,
+            'user_id': author.id,
+            'category_id': category.id,
+            'published_at': start + timedelta(hours=i),
+        } for i in range(offset, min(offset + 1000, count))])
+        db.session.commit()
+
+
+def measure(build, options, repeat):
+    """返回 (耗时中位数 ms, 内存峰值 KB)"""
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        [a.to_dict() for a in build(Article.query.filter_by(status='published').options(*options))]
+        timings.append(time.perf_counter() - start)
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    [a.to_dict() for a in build(Article.query.filter_by(status='published').options(*options))]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings) * 1000, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='列表查询延迟加载正文压测')
+    parser.add_argument('--articles', type=int, default=10000, help='生成的文章数')
+    parser.add_argument('--body-kb', type=int, default=8, help='每篇正文大小（KB）')
+    parser.add_argument('--repeat', type=int, default=20, help='每个查询的执行次数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(os.path.join(tmp, 'bench.db'))
+        with app.app_context():
+            db.create_all()
+            print(f"生成 {args.articles} 篇文章（正文约 {args.body_kb} KB）...")
+            populate(args.articles, args.body_kb)
+
+            for label, build in QUERIES.items():
+                eager_ms, eager_kb = measure(build, Article.eager_relations(), args.repeat)
+                list_ms, list_kb = measure(build, Article.list_options(), args.repeat)
+                print(f"{label}: 加载正文 {eager_ms:7.2f}ms {eager_kb:8.0f}KB  "
+                      f"延迟加载 {list_ms:7.2f}ms {list_kb:8.0f}KB  "
+                      f"耗时 {eager_ms / list_ms:5.1f}x  内存 {eager_kb / list_kb:5.1f}x")
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+登录吞吐与页面延迟压测
+
+先在无登录负载时测量页面延迟，再用多个线程持续登录，同时测量同一页面的延迟，
+输出每秒成功登录数、503 拒绝数和页面延迟分位数。
+对运行中的服务执行，例如：
+
+    gunicorn --workers 2 app:app --bind 127.0.0.1:8009
+    python scripts/bench_password_hashing.py --username admin --password admin123
+
+可用 PASSWORD_HASH_WORKERS=0 PASSWORD_HASH_QUEUE=0 启动服务作为对照（请求线程直接计算哈希）。
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+def request(url, data=None):
+    """发送请求，返回 (状态码, 耗时秒)"""
+    body = json.dumps(data).encode('utf-8') if data is not None else None
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def probe_pages(url, stop, latencies):
+    while not stop.is_set():
+        status, elapsed = request(url)
+        if status == 200:
+            latencies.append(elapsed)
+
+
+def login_loop(url, credentials, stop, results):
+    while not stop.is_set():
+        status, _ = request(url, credentials)
+        results.append(status)
+
+
+def percentile(values, p):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def report(label, latencies):
+    print(f"{label}: 页面请求 {len(latencies)} 次, "
+          f"p50 {percentile(latencies, 0.5) * 1000:.1f}ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f}ms, "
+          f"max {max(latencies, default=float('nan')) * 1000:.1f}ms")
+
+
+def run(base_url, page, credentials, concurrency, duration):
+    page_url = base_url + page
+    login_url = base_url + '/api/auth/login'
+
+    # 1. 无登录负载
+    stop = threading.Event()
+    idle = []
+    probe = threading.Thread(target=probe_pages, args=(page_url, stop, idle))
+    probe.start()
+    time.sleep(duration / 2)
+    stop.set()
+    probe.join()
+    report('无登录负载', idle)
+
+    # 2. 持续登录
+    stop = threading.Event()
+    loaded, statuses = [], []
+    threads = [threading.Thread(target=login_loop, args=(login_url, credentials, stop, statuses))
+               for _ in range(concurrency)]
+    threads.append(threading.Thread(target=probe_pages, args=(page_url, stop, loaded)))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    succeeded = statuses.count(200)
+    print(f"登录负载（{concurrency} 并发）: 成功 {succeeded} 次 ({succeeded / elapsed:.1f}/s), "
+          f"503 拒绝 {statuses.count(503)} 次, 其他 {len(statuses) - succeeded - statuses.count(503)} 次")
+    report('登录负载下', loaded)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='登录吞吐与页面延迟压测')
+    parser.add_argument('--url', default='http://127.0.0.1:8009', help='服务地址')
+    parser.add_argument('--page', default='/', help='测量延迟的页面路径')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--concurrency', type=int, default=8, help='并发登录线程数')
+    parser.add_argument('--duration', type=float, default=10.0, help='登录负载持续时间（秒）')
+    args = parser.parse_args()
+
+    run(args.url.rstrip('/'), args.page, {'username': args.username, 'password': args.password},
+        args.concurrency, args.duration)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+SQLite 并发读取压测
+
+在数据库副本上对比两种配置的并发读取吞吐：
+- 原配置：回滚日志、pool_pre_ping
+- sqlite_profile：WAL + PRAGMA，读取使用 mode=ro 连接池
+
+多个线程持续执行首页文章列表查询，同时一个线程模拟阅读量写回（每隔一段时间批量 UPDATE）。
+
+    python scripts/bench_sqlite_reads.py --threads 8 --duration 5
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+
+from sqlite_profile import _connect
+
+READ_SQL = text(
+    'SELECT article.*, category.name, user.username FROM article '
+    'LEFT JOIN category ON category.id = article.category_id '
+    'LEFT JOIN user ON user.id = article.user_id '
+    "WHERE article.status = 'published' ORDER BY article.published_at DESC LIMIT 10"
+)
+WRITE_SQL = text('UPDATE article SET view_count = COALESCE(view_count, 0) + 1 WHERE id = :id')
+
+
+def run(read_engine, write_engine, threads, duration, write_interval):
+    with read_engine.connect() as conn:
+        ids = [row[0] for row in conn.execute(text('SELECT id FROM article LIMIT 200'))]
+
+    stop = threading.Event()
+    latencies = [[] for _ in range(threads)]
+    errors = []
+
+    def reader(bucket):
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with read_engine.connect() as conn:
+                    conn.execute(READ_SQL).fetchall()
+            except Exception as e:
+                errors.append(e)
+                continue
+            bucket.append(time.perf_counter() - start)
+
+    def writer():
+        while not stop.is_set():
+            try:
+                with write_engine.begin() as conn:
+                    conn.execute(WRITE_SQL, [{'id': article_id} for article_id in ids])
+            except Exception as e:
+                errors.append(e)
+            time.sleep(write_interval)
+
+    workers = [threading.Thread(target=reader, args=(bucket,)) for bucket in latencies]
+    workers.append(threading.Thread(target=writer))
+    for worker in workers:
+        worker.start()
+    time.sleep(duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    samples = sorted(latency for bucket in latencies for latency in bucket)
+    p95 = samples[int(len(samples) * 0.95)] * 1000 if samples else float('nan')
+    return len(samples) / duration, p95, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 并发读取压测')
+    parser.add_argument('--db', default=os.path.join('instance', 'news.db'), help='数据库文件（会复制后再测试）')
+    parser.add_argument('--threads', type=int, default=8, help='读取线程数')
+    parser.add_argument('--duration', type=float, default=5.0, help='每种配置的测试时间（秒）')
+    parser.add_argument('--write-interval', type=float, default=0.05, help='两次批量写入的间隔（秒）')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_sqlite_')
+    try:
+        # 原配置：回滚日志 + pool_pre_ping
+        baseline_path = os.path.join(workdir, 'baseline.db')
+        shutil.copyfile(args.db, baseline_path)
+        conn = sqlite3.connect(baseline_path)
+        conn.execute('PRAGMA journal_mode = DELETE')
+        conn.close()
+        engine = create_engine(f'sqlite:///{baseline_path}', pool_pre_ping=True, pool_recycle=300)
+        baseline = run(engine, engine, args.threads, args.duration, args.write_interval)
+        engine.dispose()
+
+        # sqlite_profile：WAL + 只读连接池
+        profile_path = os.path.join(workdir, 'profile.db')
+        shutil.copyfile(args.db, profile_path)
+        write_engine = create_engine(f'sqlite:///{profile_path}', creator=lambda: _connect(profile_path))
+        read_engine = create_engine(f'sqlite:///{profile_path}',
+                                    creator=lambda: _connect(profile_path, read_only=True))
+        profiled = run(read_engine, write_engine, args.threads, args.duration, args.write_interval)
+        read_engine.dispose()
+        write_engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for label, (throughput, p95, errors) in (('原配置', baseline), ('sqlite_profile', profiled)):
+        print(f'{label}: {throughput:.0f} 次读取/秒, p95 {p95:.2f}ms, 错误 {errors} 次')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+构建带哈希的静态资源
+生成 static/dist/ 下的哈希文件、.gz / .br 压缩副本和 manifest.json，
+部署前（或修改 CSS / JS 后）运行一次，重启应用后生效
+"""
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assets import build_assets, brotli
+
+
+def main():
+    static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+    manifest = build_assets(static_dir)
+    print(f"完成! 已处理 {len(manifest)} 个静态文件")
+    if brotli is None:
+        print("未安装 brotli，只生成了 .gz 压缩文件")
+
+
+if __name__ == '__main__':
+    main()
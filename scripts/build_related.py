@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+重新计算全部文章的相关文章（TF-IDF 内容相似度）
+批量导入文章后运行一次；日常发布和更新由应用增量维护
+"""
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, similarity_index, invalidate_all_pages
+
+
+def build_related():
+    """重建 article_relation 表"""
+    with app.app_context():
+        count = similarity_index.rebuild()
+        invalidate_all_pages()
+        print(f"完成! 已计算 {count} 篇文章的相关文章")
+
+
+if __name__ == '__main__':
+    build_related()
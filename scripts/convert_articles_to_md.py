@@ -1,16 +1,26 @@
 #!/usr/bin/env python3
 """
 将现有 HTML 文章转换为 Markdown 格式
-使用正则表达式解析，不依赖外部库
+使用标准库 html.parser 逐个事件转换，不依赖外部库
+
+默认转换服务器上的文章：先一次性下载，本地并行转换后再一次性上传；
+指定 --news-dir 时直接转换本地目录中的全部 HTML 文件。
+
+用法: python scripts/convert_articles_to_md.py [--server maxazure@192.168.31.205] [--workers N]
+      python scripts/convert_articles_to_md.py --news-dir news
 """
 
+import argparse
 import re
 import os
 import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
 
 # 服务器配置
 SERVER = "maxazure@192.168.31.205"
-NEWS_DIR = "~/projects/news.docms.nz/news"
+REMOTE_DIR = "~/projects/news.docms.nz/news"
 
 
 def extract_article_data(html_content):
@@ -51,6 +61,257 @@ def extract_article_data(html_content):
     return markdown, title, meta
 
 
+# 标题标签对应的 Markdown 前缀（h1 与 frontmatter 中的标题重复，按普通段落处理）
+HEADINGS = {'h2': '## ', 'h3': '### ', 'h4': '#### ', 'h5': '##### ', 'h6': '###### '}
+
+# 提示框（div 的 class）转换为引用时的前缀和后缀
+BOXES = {
+    'highlight-box': ('> **', '**'),
+    'info-box': ('> 💡 ', ''),
+    'warning-box': ('> ⚠️ ', ''),
+}
+
+# 行内标签对应的 Markdown 标记
+INLINE_MARKS = {'strong': '**', 'b': '**', 'em': '*', 'i': '*', 'code': '`'}
+
+# 连同内容一起丢弃的标签
+SKIP_TAGS = {'script', 'style'}
+
+
+# <br> 在块文字中的占位符（合并空白后还原为换行）
+LINE_BREAK = '\x00'
+
+# 引用中段落之间的分隔占位符（输出时拆成多个引用段落）
+PARAGRAPH_BREAK = '\x01'
+
+
+def normalize_text(text):
+    """合并多余空白，<br> 还原为换行"""
+    text = re.sub(r'\s{2,}', ' ', text.replace('\xa0', ' '))
+    return re.sub(rf'\s*{LINE_BREAK}\s*', '\n', text).strip()
+
+
+def table_lines(rows):
+    """表格行（单元格文字列表）转换为 Markdown，第一行作为表头"""
+    lines = []
+    for idx, cells in enumerate(rows):
+        lines.append('| ' + ' | '.join(cells) + ' |')
+        if idx == 0:
+            # 表头分隔线
+            lines.append('| ' + ' | '.join(['---'] * len(cells)) + ' |')
+    return lines
+
+
+class MarkdownConverter(HTMLParser):
+    """
+    基于 html.parser 事件流的 HTML → Markdown 转换器
+
+    每个标签和每段文字只处理一次，耗时与文档长度成线性关系。
+    块级元素（标题、段落、引用、提示框、列表项、表格单元格）的文字先收集起来，
+    元素结束时合并空白并输出为 Markdown 行；注释、script 和 style 直接丢弃。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines = []
+        self.text = []      # 当前块的文字片段
+        self.block = None   # 当前块 (标签, 前缀, 后缀)；None 时收集的是块外的零散文字
+        self.nested = 0     # 当前块内同名标签的嵌套层数
+        self.divs = []      # div 栈：该 div 是否开启了提示框
+        self.lists = []     # 列表栈：[类型, 已输出的项数]
+        self.links = []     # 链接栈：href
+        self.skip = 0       # script / style 嵌套深度
+        self.pre = None     # <pre> 中的原始文字
+        self.rows = None    # 当前表格的行
+        self.cells = None   # 当前行的单元格
+
+    # ---------- 输出 ----------
+
+    def emit(self, *lines):
+        # 前一个块已以空行结尾时不再重复添加
+        if self.lines and self.lines[-1] != "":
+            self.lines.append("")
+        self.lines.extend(lines)
+        self.lines.append("")
+
+    def take_text(self):
+        text = normalize_text(''.join(self.text))
+        self.text = []
+        return text
+
+    def flush(self):
+        """结束当前块；块外的零散文字（列表、表格中除外）作为段落输出"""
+        if self.block is not None:
+            self.end_block()
+            return
+        text = self.take_text()
+        if text and not self.lists and self.rows is None:
+            self.emit(text)
+
+    def start_block(self, tag, prefix='', suffix=''):
+        if self.block is not None:
+            # 嵌套在其他块中：并入外层块，引用里的段落保留分段
+            if tag == self.block[0]:
+                self.nested += 1
+            self.text.append(PARAGRAPH_BREAK if self.block[0] == 'blockquote' and tag == 'p' else ' ')
+            return
+        self.flush()
+        self.block = (tag, prefix, suffix)
+
+    def end_block(self):
+        tag, prefix, suffix = self.block
+        self.block = None
+        self.nested = 0
+        text = self.take_text()
+
+        if tag == 'li':
+            if text and self.lists:
+                entry = self.lists[-1]
+                entry[1] += 1
+                marker = f"{entry[1]}." if entry[0] == 'ol' else "-"
+                self.lines.append('  ' * (len(self.lists) - 1) + f"{marker} {text}")
+        elif tag in ('td', 'th'):
+            if self.cells is not None:
+                self.cells.append(text)
+        elif tag == 'blockquote':
+            paragraphs = [p.strip() for p in text.split(PARAGRAPH_BREAK) if p.strip()]
+            lines = []
+            for paragraph in paragraphs:
+                if lines:
+                    lines.append('>')
+                lines.extend(prefix + line for line in paragraph.split('\n'))
+            if lines:
+                self.emit(*lines)
+        elif text:
+            self.emit(prefix + text + suffix)
+
+    def end_item(self):
+        if self.block is not None and self.block[0] == 'li':
+            self.end_block()
+
+    def in_other_block(self):
+        """是否处于列表项以外的块中（其中的列表并入该块的文字）"""
+        return self.block is not None and self.block[0] != 'li'
+
+    # ---------- 解析事件 ----------
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip += 1
+            return
+        if self.skip or self.pre is not None:
+            # <pre> 中的 <code> 等标签只保留文字
+            return
+
+        if tag in HEADINGS:
+            self.start_block(tag, HEADINGS[tag])
+        elif tag in ('p', 'h1'):
+            self.start_block(tag)
+        elif tag == 'blockquote':
+            self.start_block(tag, '> ')
+        elif tag == 'div':
+            box = BOXES.get(dict(attrs).get('class'))
+            opens_box = box is not None and self.block is None
+            self.divs.append(opens_box)
+            if opens_box:
+                self.start_block(tag, *box)
+        elif tag in ('ul', 'ol', 'li') and self.in_other_block():
+            self.text.append(' ')
+        elif tag in ('ul', 'ol'):
+            self.flush()
+            self.lists.append([tag, 0])
+        elif tag == 'li':
+            self.end_item()
+            if self.lists:
+                self.text = []
+                self.block = ('li', '', '')
+        elif tag in ('td', 'th') and self.cells is not None:
+            if self.block is not None:
+                self.end_block()
+            self.text = []
+            self.block = (tag, '', '')
+        elif tag == 'tr' and self.rows is not None:
+            self.cells = []
+        elif tag == 'table':
+            self.flush()
+            self.rows = []
+        elif tag == 'pre':
+            self.flush()
+            self.pre = []
+        elif tag == 'hr':
+            self.flush()
+            self.emit("---")
+        elif tag == 'br':
+            self.text.append(LINE_BREAK)
+        elif tag in INLINE_MARKS:
+            self.text.append(INLINE_MARKS[tag])
+        elif tag == 'a':
+            href = dict(attrs).get('href')
+            self.links.append(href)
+            if href is not None:
+                self.text.append('[')
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/>、<hr/> 等自闭合标签没有结束事件
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip = max(self.skip - 1, 0)
+            return
+        if self.skip:
+            return
+        if self.pre is not None:
+            if tag == 'pre':
+                code, self.pre = ''.join(self.pre).strip(), None
+                self.emit("```", code, "```")
+            return
+
+        if tag == 'div':
+            if self.divs and self.divs.pop():
+                self.end_block()
+        elif self.block is not None and tag == self.block[0]:
+            if self.nested:
+                self.nested -= 1
+            else:
+                self.end_block()
+        elif tag in ('ul', 'ol', 'li') and self.in_other_block():
+            pass
+        elif tag in ('ul', 'ol') and self.lists:
+            self.end_item()
+            count = self.lists.pop()[1]
+            if not self.lists and count:
+                self.lines.append("")
+        elif tag == 'tr' and self.cells is not None:
+            if self.cells:
+                self.rows.append(self.cells)
+            self.cells = None
+        elif tag == 'table' and self.rows is not None:
+            rows, self.rows, self.cells = self.rows, None, None
+            if rows:
+                self.emit(*table_lines(rows))
+        elif tag in INLINE_MARKS:
+            self.text.append(INLINE_MARKS[tag])
+        elif tag == 'a' and self.links:
+            href = self.links.pop()
+            if href is not None:
+                self.text.append(f"]({href})")
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        if self.pre is not None:
+            self.pre.append(data)
+        elif self.block is not None or (not self.lists and self.rows is None):
+            self.text.append(data)
+
+    def close(self):
+        super().close()
+        if self.pre is not None:
+            self.handle_endtag('pre')
+        self.flush()
+
+
 def convert_html_to_markdown(html_content, title, meta):
     """将HTML内容转换为Markdown"""
     lines = []
@@ -65,187 +326,10 @@ def convert_html_to_markdown(html_content, title, meta):
     lines.append("---")
     lines.append("")
 
-    # 移除script和style标签
-    html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL)
-    html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL)
-
-    # 移除注释
-    html_content = re.sub(r'<!--.*?-->', '', html_content, flags=re.DOTALL)
-
-    # 逐个处理元素
-    pos = 0
-    in_list = False
-    list_type = None
-    list_items = []
-
-    # 定义所有标签的正则模式
-    patterns = [
-        (r'<h2[^>]*>(.*?)</h2>', 'h2'),
-        (r'<h3[^>]*>(.*?)</h3>', 'h3'),
-        (r'<h4[^>]*>(.*?)</h4>', 'h4'),
-        (r'<h5[^>]*>(.*?)</h5>', 'h5'),
-        (r'<p[^>]*>(.*?)</p>', 'p'),
-        (r'<ul[^>]*>', 'ul_start'),
-        (r'</ul>', 'ul_end'),
-        (r'<ol[^>]*>', 'ol_start'),
-        (r'</ol>', 'ol_end'),
-        (r'<li[^>]*>(.*?)</li>', 'li'),
-        (r'<blockquote[^>]*>(.*?)</blockquote>', 'blockquote'),
-        (r'<pre[^>]*><code[^>]*>(.*?)</code></pre>', 'pre_code'),
-        (r'<pre[^>]*>(.*?)</pre>', 'pre'),
-        (r'<hr\s*/?>', 'hr'),
-    ]
-
-    while pos < len(html_content):
-        # 找到下一个标签
-        match = None
-        min_pos = len(html_content)
-
-        for pattern, tag_type in patterns:
-            m = re.search(pattern, html_content[pos:], re.DOTALL)
-            if m and m.start() < min_pos:
-                min_pos = m.start()
-                match = (m, tag_type)
-
-        if match:
-            m, tag_type = match
-            # 处理标签前的文本
-            before_text = html_content[pos:pos + m.start()].strip()
-            if before_text and not in_list:
-                # 纯文本段落
-                cleaned = clean_text(before_text)
-                if cleaned:
-                    lines.append("")
-                    lines.append(cleaned)
-                    lines.append("")
-
-            # 处理标签
-            if tag_type == 'h2':
-                text = clean_text(m.group(1))
-                if text:
-                    lines.append("")
-                    lines.append(f"## {text}")
-                    lines.append("")
-            elif tag_type == 'h3':
-                text = clean_text(m.group(1))
-                if text:
-                    lines.append("")
-                    lines.append(f"### {text}")
-                    lines.append("")
-            elif tag_type == 'h4':
-                text = clean_text(m.group(1))
-                if text:
-                    lines.append("")
-                    lines.append(f"#### {text}")
-                    lines.append("")
-            elif tag_type == 'p':
-                text = clean_text(m.group(1))
-                if text:
-                    lines.append("")
-                    lines.append(text)
-                    lines.append("")
-            elif tag_type == 'ul_start':
-                in_list = True
-                list_type = 'ul'
-            elif tag_type == 'ol_start':
-                in_list = True
-                list_type = 'ol'
-            elif tag_type in ['ul_end', 'ol_end']:
-                # 输出列表
-                if list_items:
-                    for idx, item in enumerate(list_items, 1):
-                        prefix = f"{idx}." if list_type == 'ol' else "-"
-                        lines.append(prefix + " " + item)
-                    if list_items:
-                        lines.append("")
-                in_list = False
-                list_type = None
-                list_items = []
-            elif tag_type == 'li':
-                text = clean_text(m.group(1))
-                if text:
-                    list_items.append(text)
-            elif tag_type == 'blockquote':
-                text = clean_text(m.group(1))
-                if text:
-                    lines.append("")
-                    lines.append(f"> {text}")
-                    lines.append("")
-            elif tag_type == 'pre_code':
-                code = m.group(1).strip()
-                lines.append("")
-                lines.append("```")
-                lines.append(code)
-                lines.append("```")
-                lines.append("")
-            elif tag_type == 'pre':
-                code = m.group(1).strip()
-                code = re.sub(r'<code[^>]*>', '', code)
-                code = re.sub(r'</code>', '', code)
-                lines.append("")
-                lines.append("```")
-                lines.append(code.strip())
-                lines.append("```")
-                lines.append("")
-            elif tag_type == 'hr':
-                lines.append("")
-                lines.append("---")
-                lines.append("")
-
-            pos += m.end()
-        else:
-            # 没有更多标签了
-            remaining = html_content[pos:].strip()
-            if remaining:
-                # 检查是否是表格
-                table_match = re.search(r'<table[^>]*>(.*?)</table>', remaining, re.DOTALL)
-                if table_match:
-                    table_md = convert_table(table_match.group(1))
-                    lines.append("")
-                    lines.extend(table_md)
-                    lines.append("")
-                    pos += table_match.end()
-                else:
-                    # 处理特殊框
-                    highlight_match = re.search(r'<div class="highlight-box"[^>]*>(.*?)</div>', remaining, re.DOTALL)
-                    if highlight_match:
-                        text = clean_text(highlight_match.group(1))
-                        if text:
-                            lines.append("")
-                            lines.append(f"> **{text}**")
-                            lines.append("")
-                        pos += highlight_match.end()
-                        continue
-
-                    info_match = re.search(r'<div class="info-box"[^>]*>(.*?)</div>', remaining, re.DOTALL)
-                    if info_match:
-                        text = clean_text(info_match.group(1))
-                        if text:
-                            lines.append("")
-                            lines.append(f"> 💡 {text}")
-                            lines.append("")
-                        pos += info_match.end()
-                        continue
-
-                    warning_match = re.search(r'<div class="warning-box"[^>]*>(.*?)</div>', remaining, re.DOTALL)
-                    if warning_match:
-                        text = clean_text(warning_match.group(1))
-                        if text:
-                            lines.append("")
-                            lines.append(f"> ⚠️ {text}")
-                            lines.append("")
-                        pos += warning_match.end()
-                        continue
-
-                    # 其他文本
-                    cleaned = clean_text(remaining)
-                    if cleaned:
-                        lines.append("")
-                        lines.append(cleaned)
-                        lines.append("")
-                    break
-            else:
-                break
+    converter = MarkdownConverter()
+    converter.feed(html_content)
+    converter.close()
+    lines.extend(converter.lines)
 
     # 后处理：清理空行
     result = '\n'.join(lines)
@@ -257,66 +341,10 @@ def convert_html_to_markdown(html_content, title, meta):
 
 def convert_table(table_html):
     """转换表格为Markdown"""
-    lines = []
-
-    # 提取表头
-    thead_match = re.search(r'<thead[^>]*>(.*?)</thead>', table_html, re.DOTALL)
-    tbody_match = re.search(r'<tbody[^>]*>(.*?)</tbody>', table_html, re.DOTALL)
-    tbody = tbody_match.group(1) if tbody_match else table_html
-
-    # 处理所有行
-    rows = re.findall(r'<tr[^>]*>(.*?)</tr>', table_html, re.DOTALL)
-
-    for idx, row in enumerate(rows):
-        cells = re.findall(r'<t[dh][^>]*>(.*?)</t[dh]>', row, re.DOTALL)
-        if cells:
-            cleaned_cells = [clean_text(c).strip() for c in cells]
-            lines.append('| ' + ' | '.join(cleaned_cells) + ' |')
-            if idx == 0:
-                # 表头分隔线
-                lines.append('| ' + ' | '.join(['---'] * len(cleaned_cells)) + ' |')
-
-    return lines
-
-
-def clean_text(text):
-    """清理HTML标签和实体"""
-    if not text:
-        return ""
-
-    # 处理加粗
-    text = re.sub(r'<strong[^>]*>(.*?)</strong>', r'**\1**', text, flags=re.DOTALL)
-    text = re.sub(r'<b[^>]*>(.*?)</b>', r'**\1**', text, flags=re.DOTALL)
-
-    # 处理斜体
-    text = re.sub(r'<em[^>]*>(.*?)</em>', r'*\1*', text, flags=re.DOTALL)
-    text = re.sub(r'<i[^>]*>(.*?)</i>', r'*\1*', text, flags=re.DOTALL)
-
-    # 处理代码
-    text = re.sub(r'<code[^>]*>(.*?)</code>', r'`\1`', text, flags=re.DOTALL)
-
-    # 处理链接
-    text = re.sub(r'<a[^>]*href="([^"]*)"[^>]*>(.*?)</a>', r'[\2](\1)', text, flags=re.DOTALL)
-
-    # 处理换行
-    text = text.replace('<br/>', '\n').replace('<br>', '\n')
-
-    # 去除其他标签
-    text = re.sub(r'<[^>]+>', '', text)
-
-    # 解码HTML实体
-    text = text.replace('&nbsp;', ' ')
-    text = text.replace('&lt;', '<')
-    text = text.replace('&gt;', '>')
-    text = text.replace('&amp;', '&')
-    text = text.replace('&quot;', '"')
-    text = text.replace('&apos;', "'")
-
-    # 清理多余空白
-    text = re.sub(r'\s{2,}', ' ', text)
-    text = text.strip()
-
-    return text
+    converter = MarkdownConverter()
+    converter.feed(f'<table>{table_html}</table>')
+    converter.close()
+    return [line for line in converter.lines if line]
 
 
 def get_output_filename(input_filename, index=0):
@@ -338,111 +366,127 @@ def get_output_filename(input_filename, index=0):
     return input_filename.replace('.html', '.md')
 
 
-def main():
-    """主函数"""
-    print("📰 开始转换文章...")
+def convert_file(path):
+    """
+    读取并转换单个 HTML 文件（在子进程中执行）
 
-    # 获取远程文件列表
-    result = subprocess.run(
-        f"ssh {SERVER} 'ls {NEWS_DIR}/*.html 2>/dev/null'",
-        shell=True,
-        capture_output=True,
-        text=True
-    )
+    Returns:
+        (Markdown 内容, 标题, 错误信息)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            md_content, title, _ = extract_article_data(f.read())
+        return md_content, title, None
+    except Exception as e:
+        return None, None, str(e)
 
-    if result.returncode != 0:
-        print("❌ 无法获取文章列表")
-        return
 
-    html_files = [f.strip() for f in result.stdout.strip().split('\n') if f.strip() and f.endswith('.html')]
+def plan_outputs(html_files):
+    """按日期分组，生成 [(HTML 文件名, Markdown 文件名)]"""
+    date_groups = {}
+    for filename in html_files:
+        date_match = re.match(r'(\d{8})', filename)
+        # 无日期文件归入 _other
+        date_groups.setdefault(date_match.group(1) if date_match else '_other', []).append(filename)
 
+    plan = []
+    used = set()
+    for date, files in sorted(date_groups.items()):
+        for idx, filename in enumerate(sorted(files)):
+            # 如果同一天有多篇文章，使用原文件名中的后缀或添加序号
+            output_filename = get_output_filename(filename, idx if len(files) > 1 else -1)
+            # 序号与其他文件的后缀重复时继续编号，避免互相覆盖
+            base, n = output_filename[:-3], 1
+            while output_filename in used:
+                n += 1
+                output_filename = f"{base}-{n}.md"
+            used.add(output_filename)
+            plan.append((filename, output_filename))
+    return plan
+
+
+def convert_directory(news_dir, workers=None):
+    """
+    并行转换目录中的全部 HTML 文件，Markdown 写入同一目录，
+    转换成功的 HTML 文件移动到 _html 子目录
+
+    Returns:
+        转换成功的 Markdown 文件名列表
+    """
+    html_files = [f for f in os.listdir(news_dir) if f.endswith('.html')]
     if not html_files:
         print("📭 没有找到HTML文章")
-        return
+        return []
 
     print(f"📄 找到 {len(html_files)} 篇文章")
+    plan = plan_outputs(html_files)
+    paths = [os.path.join(news_dir, filename) for filename, _ in plan]
 
-    # 按日期分组
-    date_groups = {}
-    for html_path in html_files:
-        filename = os.path.basename(html_path)
-        date_match = re.match(r'(\d{8})', filename)
-        if date_match:
-            date = date_match.group(1)
-            if date not in date_groups:
-                date_groups[date] = []
-            date_groups[date].append(filename)
-        else:
-            # 无日期文件
-            if '_other' not in date_groups:
-                date_groups['_other'] = []
-            date_groups['_other'].append(filename)
-
-    # 转换每篇文章
     converted = []
-    for date, files in sorted(date_groups.items()):
-        for idx, filename in enumerate(sorted(files)):
-            print(f"\n🔄 处理: {filename}")
-
-            # 下载HTML内容
-            result = subprocess.run(
-                f"ssh {SERVER} 'cat {NEWS_DIR}/{filename}'",
-                shell=True,
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode != 0:
-                print(f"  ❌ 下载失败")
+    with ProcessPoolExecutor(workers) as pool:
+        for (filename, output_filename), (md_content, title, error) in zip(
+                plan, pool.map(convert_file, paths, chunksize=8)):
+            if error or not md_content:
+                print(f"  ❌ {filename}: {error or '解析失败'}")
                 continue
+            with open(os.path.join(news_dir, output_filename), 'w', encoding='utf-8') as f:
+                f.write(md_content)
+            print(f"  ✅ {filename} → {output_filename}  {title}")
+            converted.append((filename, output_filename))
 
-            html_content = result.stdout
-
-            # 转换
-            try:
-                md_content, title, meta = extract_article_data(html_content)
-                if not md_content:
-                    print(f"  ❌ 解析失败")
-                    continue
+    # 备份原HTML文件
+    backup_dir = os.path.join(news_dir, '_html')
+    os.makedirs(backup_dir, exist_ok=True)
+    for filename, _ in converted:
+        os.replace(os.path.join(news_dir, filename), os.path.join(backup_dir, filename))
 
-                # 如果同一天有多篇文章，使用原文件名中的后缀或添加序号
-                output_filename = get_output_filename(filename, idx if len(files) > 1 else -1)
+    return [output_filename for _, output_filename in converted]
 
-                # 写入到服务器（使用cat命令）
-                # 创建临时文件
-                local_tmp = f"/tmp/{output_filename}"
-                with open(local_tmp, 'w', encoding='utf-8') as f:
-                    f.write(md_content)
 
-                # 上传到服务器
-                subprocess.run(
-                    f"scp {local_tmp} {SERVER}:{NEWS_DIR}/{output_filename}",
-                    shell=True,
-                    capture_output=True
-                )
-                os.remove(local_tmp)
+def convert_remote(server, remote_dir, workers=None):
+    """一次下载服务器上的全部 HTML 文件，本地并行转换后一次上传"""
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run(['scp', '-q', f'{server}:{remote_dir}/*.html', tmp], capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"❌ 无法下载文章: {result.stderr.strip()}")
+            return []
 
-                print(f"  ✅ 已转换: {output_filename}")
-                if title:
-                    print(f"     标题: {title}")
-                converted.append(output_filename)
+        converted = convert_directory(tmp, workers)
+        if not converted:
+            return []
 
-            except Exception as e:
-                print(f"  ❌ 转换失败: {e}")
-
-    print(f"\n\n📊 转换完成!")
-    print(f"✅ 成功: {len(converted)} 篇")
-    print(f"\n转换的文件:")
-    for f in converted:
-        print(f"  - {f}")
+        result = subprocess.run(['scp', '-q', *[os.path.join(tmp, f) for f in converted], f'{server}:{remote_dir}/'],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"❌ 上传失败: {result.stderr.strip()}")
+            return []
 
     # 备份原HTML文件
     print(f"\n💾 备份原HTML文件到 _html 目录...")
     subprocess.run(
-        f"ssh {SERVER} 'mkdir -p {NEWS_DIR}/_html && mv {NEWS_DIR}/*.html {NEWS_DIR}/_html/ 2>/dev/null || true'",
+        f"ssh {server} 'mkdir -p {remote_dir}/_html && mv {remote_dir}/*.html {remote_dir}/_html/ 2>/dev/null || true'",
         shell=True
     )
-    print("✅ 备份完成")
+    return converted
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='将 HTML 文章转换为 Markdown')
+    parser.add_argument('--news-dir', help='转换本地目录中的文章（如 news），不指定时转换服务器上的文章')
+    parser.add_argument('--server', default=SERVER, help='文章所在的服务器')
+    parser.add_argument('--remote-dir', default=REMOTE_DIR, help='服务器上的文章目录')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认等于 CPU 核数')
+    args = parser.parse_args()
+
+    print("📰 开始转换文章...")
+    if args.news_dir:
+        converted = convert_directory(args.news_dir, args.workers)
+    else:
+        converted = convert_remote(args.server, args.remote_dir, args.workers)
+
+    print(f"\n\n📊 转换完成!")
+    print(f"✅ 成功: {len(converted)} 篇")
 
 
 if __name__ == "__main__":
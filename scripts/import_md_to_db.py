@@ -1,16 +1,38 @@
 #!/usr/bin/env python3
 """
 将 news/ 目录中的 Markdown 和 HTML 文件导入数据库
+
+可重复运行：按文件内容哈希跳过未修改的文件，上次导入后修改过的文件更新对应文章。
+检查点中没有记录的已有文章（升级后首次运行、在后台创建的文章）不会被覆盖，
+只记录当前文件哈希；需要用文件内容覆盖全部已有文章时使用 --force。
+解析和 Markdown 渲染在进程池中执行，单个文件解析失败时跳过该文件，结果分批写入数据库，
+每批提交后记录检查点（instance/import_state.json），中断后重新运行即从断点继续。
+
+用法: python scripts/import_md_to_db.py [--news-dir news] [--workers N] [--chunk-size 200] [--force]
 """
+import argparse
+import hashlib
+import json
 import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # 添加项目路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import app, Article, db, markdown, init_db
+from sqlalchemy import insert, update
+
+from app import app, Article, db, markdown, init_db, content_version, invalidate_all_pages
+from excerpt import generate_excerpt
+from stats import reconcile_stats
+
+
+# 每批写入的文章数
+CHUNK_SIZE = 200
+
+STATE_FILE = 'import_state.json'
 
 
 def parse_frontmatter(content):
@@ -95,144 +117,198 @@ def parse_html_file(filepath):
     return title, category, date, clean_body, body
 
 
-def generate_excerpt(content, max_length=200):
-    """从 Markdown 内容生成摘要"""
-    # 移除代码块
-    clean_content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-    # 移除标题标记
-    clean_content = re.sub(r'^#+\s*', '', clean_content, flags=re.MULTILINE)
-    # 移除加粗和斜体
-    clean_content = re.sub(r'\*\*([^*]+)\*\*', r'\1', clean_content)
-    clean_content = re.sub(r'\*([^*]+)\*', r'\1', clean_content)
-    # 清理多余空格
-    clean_content = re.sub(r'\s+', ' ', clean_content).strip()
+def file_hash(filepath):
+    """文件内容的 SHA-256"""
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
 
-    if len(clean_content) > max_length:
-        return clean_content[:max_length] + '...'
-    return clean_content
+def make_slug(name):
+    """由文件名生成 slug"""
+    slug = re.sub(r'[^\w\u4e00-\u9fff-]', '-', name.lower())
+    return re.sub(r'-+', '-', slug).strip('-')
 
 
-def import_md_files(news_dir='news'):
+def parse_date(date_str):
+    if date_str:
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+    return None
+
+
+def parse_file(filepath):
+    """
+    解析单个文件并渲染（在子进程中执行）
+
+    Returns:
+        文章字段字典，published_at 为 None 表示文件中没有日期
+    """
+    if filepath.endswith('.md'):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        title, category, date_str, body = parse_frontmatter(content)
+        return {
+            'title': title,
+            'content': body,
+            'html_content': markdown.markdown(body, extensions=['fenced_code', 'tables']),
+            'excerpt': generate_excerpt(body),
+            'published_at': parse_date(date_str),
+        }
+
+    title, category, date_str, clean_body, body_html = parse_html_file(filepath)
+    return {
+        'title': title,
+        'content': body_html,  # HTML 内容存储在 content 字段（保留样式）
+        'html_content': body_html,
+        'excerpt': generate_excerpt(clean_body) if clean_body else title[:200],
+        'published_at': parse_date(date_str),
+    }
+
+
+def parse_file_safe(filepath):
+    """
+    在子进程中解析文件，单个文件出错不影响其他文件
+
+    Returns:
+        (文章字段字典, None)，解析失败时返回 (None, 错误信息)
+    """
+    try:
+        return parse_file(filepath), None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+
+
+def load_state(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=0, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def write_chunk(chunk, existing):
+    """批量插入新文章、更新已修改的文章，返回 (插入数, 更新数)"""
+    now = datetime.utcnow()
+    inserts, updates = [], []
+    for slug, fields in chunk:
+        row = dict(fields, slug=slug, updated_at=now)
+        if slug in existing:
+            if row['published_at'] is None:
+                del row['published_at']
+            updates.append(dict(row, id=existing[slug]))
+        else:
+            inserts.append(dict(row, published_at=row['published_at'] or now, status='published',
+                                user_id=1, view_count=0, created_at=now))  # 默认管理员
+
+    if inserts:
+        db.session.execute(insert(Article), inserts)
+    if updates:
+        db.session.execute(update(Article), updates)
+    db.session.commit()
+
+    if inserts:
+        existing.update(db.session.query(Article.slug, Article.id)
+                        .filter(Article.slug.in_([row['slug'] for row in inserts])))
+    return len(inserts), len(updates)
+
+
+def import_md_files(news_dir='news', workers=None, chunk_size=CHUNK_SIZE, force=False):
     """导入 MD 和 HTML 文件到数据库"""
     # 初始化数据库
     init_db()
 
     with app.app_context():
-        # MD 文件
-        md_files = [f for f in os.listdir(news_dir) if f.endswith('.md') and not f.startswith('_')]
-        # HTML 文件
-        html_files = [f for f in os.listdir(news_dir) if f.endswith('.html')]
-
-        print(f"找到 {len(md_files)} 个 MD 文件")
-        print(f"找到 {len(html_files)} 个 HTML 文件")
-
-        imported = 0
-        skipped = 0
-
-        # 导入 MD 文件
-        for filename in sorted(md_files, reverse=True):
-            filepath = os.path.join(news_dir, filename)
-            slug = filename[:-3]  # 移除 .md 扩展名
-
-            # 检查是否已存在
-            existing = Article.query.filter_by(slug=slug).first()
-            if existing:
-                print(f"  跳过: {slug} (已存在)")
+        # MD 文件（跳过 _ 开头的文件）和 HTML 文件；同名时以 MD 文件为准
+        filenames = sorted((f for f in os.listdir(news_dir)
+                            if (f.endswith('.md') and not f.startswith('_')) or f.endswith('.html')),
+                           key=lambda f: (not f.endswith('.md'), f))
+        print(f"找到 {sum(f.endswith('.md') for f in filenames)} 个 MD 文件")
+        print(f"找到 {sum(f.endswith('.html') for f in filenames)} 个 HTML 文件")
+
+        state_path = os.path.join(app.instance_path, STATE_FILE)
+        state = load_state(state_path)
+
+        # 一次查询读取全部已有 slug
+        existing = dict(db.session.query(Article.slug, Article.id))
+
+        pending, seen, skipped, adopted = [], set(), 0, {}
+        for filename in filenames:
+            slug = make_slug(os.path.splitext(filename)[0])
+            if slug in seen:
+                print(f"  跳过: {filename} (slug {slug} 与其他文件重复)")
                 skipped += 1
                 continue
+            seen.add(slug)
 
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            title, category, date_str, body = parse_frontmatter(content)
-
-            # 生成 slug
-            slug_clean = re.sub(r'[^\w\u4e00-\u9fff-]', '-', slug.lower())
-            slug_clean = re.sub(r'-+', '-', slug_clean).strip('-')
-
-            # 生成 HTML
-            html_content = markdown.markdown(body, extensions=['fenced_code', 'tables'])
-
-            # 生成摘要
-            excerpt = generate_excerpt(body)
-
-            # 解析日期
-            published_at = datetime.now()
-            if date_str:
-                try:
-                    published_at = datetime.fromisoformat(date_str)
-                except:
-                    pass
-
-            # 创建文章
-            article = Article(
-                title=title,
-                slug=slug_clean,
-                content=body,
-                html_content=html_content,
-                excerpt=excerpt,
-                status='published',
-                published_at=published_at,
-                user_id=1,  # 默认管理员
-                view_count=0
-            )
-
-            db.session.add(article)
-            print(f"  导入 MD: {slug_clean} - {title}")
-            imported += 1
-
-        # 导入 HTML 文件
-        for filename in sorted(html_files, reverse=True):
             filepath = os.path.join(news_dir, filename)
-            slug = filename[:-5]  # 移除 .html 扩展名
-
-            # 检查是否已存在
-            existing = Article.query.filter_by(slug=slug).first()
-            if existing:
-                print(f"  跳过: {slug} (已存在)")
-                skipped += 1
-                continue
-
-            title, category, date_str, clean_body, body_html = parse_html_file(filepath)
-
-            # 生成 slug
-            slug_clean = re.sub(r'[^\w\u4e00-\u9fff-]', '-', slug.lower())
-            slug_clean = re.sub(r'-+', '-', slug_clean).strip('-')
-
-            # 使用原始 HTML 作为 content（保留样式）
-            html_content = body_html
-
-            # 生成摘要
-            excerpt = generate_excerpt(clean_body) if clean_body else title[:200]
-
-            # 解析日期
-            published_at = datetime.now()
-            if date_str:
-                try:
-                    published_at = datetime.fromisoformat(date_str)
-                except:
-                    pass
-
-            # 创建文章
-            article = Article(
-                title=title,
-                slug=slug_clean,
-                content=html_content,  # HTML 内容存储在 content 字段
-                html_content=html_content,
-                excerpt=excerpt,
-                status='published',
-                published_at=published_at,
-                user_id=1,  # 默认管理员
-                view_count=0
-            )
-
-            db.session.add(article)
-            print(f"  导入 HTML: {slug_clean} - {title}")
-            imported += 1
-
-        db.session.commit()
-        print(f"\n完成! 导入 {imported} 篇，跳过 {skipped} 篇")
+            digest = file_hash(filepath)
+            if slug in existing and not force:
+                stored = state.get(filename)
+                if stored is None:
+                    # 没有检查点记录：可能已在后台编辑过，不覆盖，记录当前哈希作为基准
+                    adopted[filename] = digest
+                    skipped += 1
+                    continue
+                if stored == digest:
+                    skipped += 1
+                    continue
+            pending.append((filename, filepath, slug, digest))
+
+        if adopted:
+            state.update(adopted)
+            save_state(state_path, state)
+            print(f"  {len(adopted)} 篇已有文章没有检查点记录，保留数据库中的内容")
+        print(f"需要处理 {len(pending)} 个文件，{skipped} 个未修改已跳过")
+
+        imported = updated = failed = 0
+        with ProcessPoolExecutor(workers) as pool:
+            results = pool.map(parse_file_safe, [filepath for _, filepath, _, _ in pending], chunksize=8)
+            chunk, chunk_files = [], []
+            for done, ((filename, _, slug, digest), (fields, error)) in enumerate(zip(pending, results), 1):
+                if error:
+                    print(f"  跳过: {filename} (解析失败: {error})")
+                    failed += 1
+                else:
+                    chunk.append((slug, fields))
+                    chunk_files.append((filename, digest))
+                if not chunk or (len(chunk) < chunk_size and done < len(pending)):
+                    continue
+
+                inserted, changed = write_chunk(chunk, existing)
+                imported += inserted
+                updated += changed
+                content_version.bump()
+
+                # 检查点：本批文件已提交
+                state.update(chunk_files)
+                save_state(state_path, state)
+                chunk, chunk_files = [], []
+                print(f"  [{done}/{len(pending)}] 新增 {imported} 篇，更新 {updated} 篇")
+
+        # 批量写入不经过 ORM flush，重新校对仪表盘计数
+        if imported:
+            reconcile_stats()
+        # 通知运行中的 worker 清除已渲染的页面
+        if imported or updated:
+            invalidate_all_pages()
+        print(f"\n完成! 导入 {imported} 篇，更新 {updated} 篇，跳过 {skipped} 篇，失败 {failed} 篇")
 
 
 if __name__ == '__main__':
-    import_md_files()
+    parser = argparse.ArgumentParser(description='导入 news/ 目录中的 MD 和 HTML 文件')
+    parser.add_argument('--news-dir', default='news', help='文章目录')
+    parser.add_argument('--workers', type=int, default=None, help='解析进程数，默认等于 CPU 核数')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='每批写入的文章数')
+    parser.add_argument('--force', action='store_true', help='忽略检查点，用文件内容覆盖全部已有文章')
+    args = parser.parse_args()
+
+    import_md_files(args.news_dir, args.workers, args.chunk_size, args.force)
@@ -9,7 +9,7 @@ import re
 # 添加项目路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import app, db, User, Article, Category
+from app import app, db, User, Article, Category, invalidate_all_pages
 import markdown
 from datetime import datetime
 
@@ -88,6 +88,7 @@ def migrate_articles(news_dir='news'):
         print(f"  迁移: {filename} -> {title}")
 
     db.session.commit()
+    invalidate_all_pages()
     print(f"\n迁移完成！")
     print(f"  新增: {migrated_count} 篇")
     print(f"  跳过: {skipped_count} 篇 (已存在)")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+重新计算文章的派生字段（html_content、excerpt）
+
+按 id 顺序分批读取文章（每批只保留 --batch-size 行，内存占用与文章总数无关），
+在进程池中重新渲染 Markdown、生成摘要，只把有变化的行批量 UPDATE 回数据库。
+
+- html_content：由 content 渲染；从 HTML 文件导入的文章（content 与 html_content 相同）保持不变
+- excerpt：为空或混入了 HTML 页面内容时重新生成，--rebuild-excerpts 时全部重新生成
+
+用法: python scripts/rederive_articles.py [--since 2025-01-01] [--batch-size 500] [--workers N]
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import update
+
+from app import app, markdown, generate_excerpt_from_markdown, invalidate_all_pages
+from models import db, Article
+
+
+# 每批读取的文章数
+BATCH_SIZE = 500
+
+# 摘要中出现这些内容说明误存了整页 HTML
+_HTML_MARKERS = ('<!DOCTYPE', '<html', '<div')
+
+
+def derive(row, rebuild_excerpts=False):
+    """
+    计算一篇文章的派生字段（在子进程中执行）
+
+    Returns:
+        有变化的字段字典（包含 id），没有变化时返回 None
+    """
+    article_id, content, html_content, excerpt = row
+    changes = {}
+
+    if content != html_content:
+        rendered = markdown.markdown(content or '', extensions=['fenced_code', 'tables'])
+        if rendered != html_content:
+            changes['html_content'] = rendered
+
+    if rebuild_excerpts or not excerpt or any(marker in excerpt for marker in _HTML_MARKERS):
+        new_excerpt = generate_excerpt_from_markdown(content)
+        if new_excerpt != excerpt:
+            changes['excerpt'] = new_excerpt
+
+    if not changes:
+        return None
+    changes['id'] = article_id
+    return changes
+
+
+def iter_batches(batch_size, since=None):
+    """按 id 顺序逐批读取 (id, content, html_content, excerpt)"""
+    last_id = 0
+    while True:
+        query = db.session.query(Article.id, Article.content, Article.html_content, Article.excerpt)\
+            .filter(Article.id > last_id)
+        if since:
+            query = query.filter(Article.updated_at >= since)
+        rows = [tuple(row) for row in query.order_by(Article.id).limit(batch_size)]
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield rows
+
+
+def rederive_articles(since=None, batch_size=BATCH_SIZE, workers=None, rebuild_excerpts=False):
+    """重新计算派生字段，返回更新的文章数"""
+    with app.app_context():
+        scanned = updated = 0
+        task = partial(derive, rebuild_excerpts=rebuild_excerpts)
+
+        with ProcessPoolExecutor(workers) as pool:
+            for rows in iter_batches(batch_size, since):
+                changed = [changes for changes in pool.map(task, rows, chunksize=16) if changes]
+                # 结束读取事务后再写入
+                db.session.rollback()
+                if changed:
+                    # 按主键批量 UPDATE，只写入有变化的字段
+                    db.session.execute(update(Article), changed)
+                    db.session.commit()
+                scanned += len(rows)
+                updated += len(changed)
+                print(f"  已检查 {scanned} 篇，更新 {updated} 篇")
+
+        if updated:
+            # 通知运行中的 worker 清除已渲染的页面
+            invalidate_all_pages()
+        print(f"\n完成! 共检查 {scanned} 篇文章，更新 {updated} 篇")
+        return updated
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='重新计算文章的 html_content 和摘要')
+    parser.add_argument('--since', type=datetime.fromisoformat,
+                        help='只处理 updated_at 不早于该时间的文章（ISO 格式，如 2025-01-01）')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='每批读取的文章数')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认等于 CPU 核数')
+    parser.add_argument('--rebuild-excerpts', action='store_true', help='重新生成全部摘要（会覆盖手写摘要）')
+    args = parser.parse_args()
+
+    rederive_articles(args.since, args.batch_size, args.workers, args.rebuild_excerpts)
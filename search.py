@@ -0,0 +1,209 @@
+"""
+全文搜索模块 - 基于 SQLite FTS5
+
+索引表 article_fts 覆盖 title、excerpt、content 三列，使用 trigram 分词器以支持中文子串匹配。
+外部内容为视图 article_fts_source（article 的三列末尾各补一个换行符），
+索引由 article 表上的触发器维护，ORM 的增删改和导入脚本的写入都会自动同步。
+
+trigram 无法直接匹配两个字的词（最常见的中文查询）。由于每列末尾补了换行符，
+任何位置出现的两字子串都是某个三元组的前缀：通过 fts5vocab 表按前缀范围
+查出这些三元组，用 OR 组合后仍然走索引。单字的词，以及展开的三元组过多的
+常见两字词回退到 LIKE。
+"""
+import weakref
+
+from markupsafe import escape
+from sqlalchemy import column, func, literal_column, table, text
+from sqlalchemy.exc import OperationalError
+
+from models import db, Article
+
+
+FTS_TABLE = 'article_fts'
+FTS_SOURCE = 'article_fts_source'
+FTS_VOCAB = 'article_fts_vocab'
+
+# trigram 分词器要求每个查询词至少 3 个字符
+MIN_TERM_LENGTH = 3
+
+# 通过词表展开为三元组的短词长度
+SHORT_TERM_LENGTH = 2
+
+# 两字词最多展开的三元组数，超过时回退到 LIKE（避免生成过长的 OR 表达式）
+MAX_EXPANSIONS = 64
+
+# 各列末尾补充的字符（视图和触发器中一致）
+_PAD = 'char(10)'
+
+# BM25 列权重：标题 > 摘要 > 正文
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+SNIPPET_TOKENS = 32
+
+# 高亮使用控制字符占位，转义后再替换为 <mark>，避免正文中的 HTML 被原样输出
+_MARK_OPEN = '\x02'
+_MARK_CLOSE = '\x03'
+
+_SCHEMA = [
+    f"""CREATE VIEW IF NOT EXISTS {FTS_SOURCE} AS
+        SELECT id, title || {_PAD} AS title, excerpt || {_PAD} AS excerpt, content || {_PAD} AS content
+        FROM article""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, excerpt, content,
+        content='{FTS_SOURCE}', content_rowid='id',
+        tokenize='trigram'
+    )""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_VOCAB} USING fts5vocab({FTS_TABLE}, 'row')""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON article BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, excerpt, content)
+        VALUES (new.id, new.title || {_PAD}, new.excerpt || {_PAD}, new.content || {_PAD});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON article BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, excerpt, content)
+        VALUES ('delete', old.id, old.title || {_PAD}, old.excerpt || {_PAD}, old.content || {_PAD});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, excerpt, content ON article BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, excerpt, content)
+        VALUES ('delete', old.id, old.title || {_PAD}, old.excerpt || {_PAD}, old.content || {_PAD});
+        INSERT INTO {FTS_TABLE}(rowid, title, excerpt, content)
+        VALUES (new.id, new.title || {_PAD}, new.excerpt || {_PAD}, new.content || {_PAD});
+    END""",
+]
+
+_fts = table(FTS_TABLE, column('rowid'))
+
+# 每个数据库引擎的索引可用状态（缺少键表示尚未检查）
+_index_state = weakref.WeakKeyDictionary()
+
+
+def ensure_search_index():
+    """
+    确保 FTS 索引表和同步触发器存在
+
+    首次创建时会从 article 表重建索引。非 SQLite 数据库或
+    SQLite 未编译 FTS5/trigram 时返回 False，调用方回退到 LIKE 搜索。
+    """
+    key = db.engine
+    if key in _index_state:
+        return _index_state[key]
+
+    if db.engine.dialect.name != 'sqlite':
+        _index_state[key] = False
+        return False
+
+    try:
+        with db.engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': FTS_TABLE}
+            ).scalar() is not None
+            for statement in _SCHEMA:
+                conn.execute(text(statement))
+            if not exists:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    except OperationalError:
+        _index_state[key] = False
+        return False
+
+    _index_state[key] = True
+    return True
+
+
+def rebuild_search_index():
+    """从 article 表完整重建索引（批量导入后或索引损坏时使用）"""
+    if not ensure_search_index():
+        return False
+    with db.engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    return True
+
+
+def _phrase(term):
+    return '"{}"'.format(term.replace('"', '""'))
+
+
+def build_match_query(search, expand=None):
+    """
+    将用户输入转换为 FTS5 MATCH 表达式
+
+    每个空白分隔的词作为短语加引号（多个词为 AND 关系），
+    用户输入中的 FTS 语法字符不会生效。
+    两个字的词由 expand(term) 展开为以它开头的三元组（OR 关系）。
+    存在单字词、有两字词但没有 expand，或 expand 返回 None（展开结果过多）时返回 None，
+    调用方回退到 LIKE。
+    """
+    terms = search.split()
+    if not terms:
+        return None
+
+    phrases = []
+    for term in terms:
+        if len(term) >= MIN_TERM_LENGTH:
+            phrases.append(_phrase(term))
+        elif len(term) == SHORT_TERM_LENGTH and expand is not None:
+            expansions = expand(term)
+            if expansions is None:
+                return None
+            # 没有以它开头的三元组时，该词未出现在任何文章中：补换行符后的三元组同样不存在，不会匹配
+            expansions = expansions or [term + '\n']
+            phrases.append('({})'.format(' OR '.join(_phrase(t) for t in expansions)))
+        else:
+            return None
+    return ' AND '.join(phrases)
+
+
+def expand_short_term(term, limit=None):
+    """
+    索引中以 term 开头的三元组（词表按 term 范围查询，走索引）
+
+    Returns:
+        三元组列表；超过 limit（默认 MAX_EXPANSIONS）个时返回 None
+    """
+    limit = MAX_EXPANSIONS if limit is None else limit
+    prefix = term.lower()  # trigram 分词器默认不区分大小写，词表中为小写
+    terms = db.session.execute(
+        text(f"SELECT term FROM {FTS_VOCAB} WHERE term >= :low AND term < :high LIMIT :limit"),
+        {'low': prefix, 'high': prefix + '\U0010ffff', 'limit': limit + 1}
+    ).scalars().all()
+    return terms if len(terms) <= limit else None
+
+
+def search_articles(query, search):
+    """
+    在已有的文章查询上叠加全文检索
+
+    Args:
+        query: Article 查询（可已带 status/category 等筛选条件）
+        search: 用户输入的搜索词
+
+    Returns:
+        按 BM25 相关度排序、结果为 (article, title_highlight, snippet) 的查询；
+        无法使用 FTS 时返回 None
+    """
+    if not ensure_search_index():
+        return None
+    match = build_match_query(search, expand=expand_short_term)
+    if match is None:
+        return None
+
+    fts = literal_column(FTS_TABLE)
+    rank = func.bm25(fts, *BM25_WEIGHTS)
+    title_highlight = func.highlight(fts, 0, _MARK_OPEN, _MARK_CLOSE)
+    snippet = func.snippet(fts, -1, _MARK_OPEN, _MARK_CLOSE, '…', SNIPPET_TOKENS)
+
+    return query.join(_fts, _fts.c.rowid == Article.id)\
+        .filter(fts.op('MATCH')(match))\
+        .add_columns(title_highlight, snippet)\
+        .order_by(rank, Article.published_at.desc())
+
+
+def render_highlight(value):
+    """
+    转义高亮片段并把占位符替换为 <mark> 标签
+
+    去掉索引时补在列末尾的换行符；两字词按三元组匹配，高亮范围会多出其后的一个字。
+    """
+    if not value:
+        return value
+    value = value.replace('\n' + _MARK_CLOSE, _MARK_CLOSE).rstrip('\n')
+    return str(escape(value)).replace(_MARK_OPEN, '<mark>').replace(_MARK_CLOSE, '</mark>')
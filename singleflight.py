@@ -0,0 +1,207 @@
+"""
+请求合并（single flight）
+
+热门文章刚发布或服务刚重启时，大量并发请求会同时错过页面缓存，
+各自执行相同的查询和渲染。这里保证同一个键同时只构建一次：
+
+- 进程内：第一个请求负责构建，其余线程等待并共享结果
+- 跨 worker：构建者持有 instance/singleflight/ 下按键命名的文件锁，
+  结果写入同名的结果文件；其他 worker 等锁释放后直接读取结果
+
+等待期间如果有该页面的旧版本（stale_key 对应的上一次结果），直接返回旧版本，不排队。
+run() 同时返回结果是否为最新：旧版本结果只用于本次响应，调用方不应写入缓存。
+结果需要可 pickle，结果文件在 SINGLEFLIGHT_RESULT_TTL 秒后视为过期并被清理；
+persist 返回 False 的结果（如未发布文章）不写入结果文件，只在进程内共享。
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+from cache import LRUCache
+
+try:
+    import fcntl
+except ImportError:  # Windows 上只在进程内合并
+    fcntl = None
+
+
+# 等待其他请求构建的最长时间（秒），超时后自行构建
+SINGLEFLIGHT_TIMEOUT = float(os.getenv('SINGLEFLIGHT_TIMEOUT', 10))
+
+# 跨 worker 共享的结果文件有效期（秒）
+SINGLEFLIGHT_RESULT_TTL = float(os.getenv('SINGLEFLIGHT_RESULT_TTL', 30))
+
+_MISSING = object()
+
+
+class _Flight:
+    """进程内一次进行中的构建"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.fresh = True
+        self.error = None
+
+
+class SingleFlight:
+    """按键合并并发构建（每个 worker 进程一个实例）"""
+
+    def __init__(self, timeout=SINGLEFLIGHT_TIMEOUT, result_ttl=SINGLEFLIGHT_RESULT_TTL):
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self.lock_dir = None
+        self.stale = LRUCache(max_entries=256, ttl=3600)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def init_app(self, app):
+        self.lock_dir = os.path.join(app.instance_path, 'singleflight')
+
+    def run(self, key, build, stale_key=None, persist=None):
+        """
+        执行 build()，相同 key 的并发调用只执行一次
+
+        Args:
+            key: 结果的完整键（应包含内容版本等，版本变化即为新键）
+            build: 无参构建函数
+            stale_key: 旧版本结果的键（如去掉版本号的 key），等待时可以直接返回旧版本
+            persist: 接收结果，返回 False 时不写入跨 worker 共享的结果文件
+
+        Returns:
+            (结果, 是否为最新)：结果为 build() 的结果或其他请求构建的相同结果；
+            返回旧版本结果时为 False，调用方不应缓存它或为它附加新版本的 ETag
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            stale = self._stale(stale_key)
+            if stale is not _MISSING:
+                return stale, False
+            if not flight.done.wait(self.timeout):
+                return build(), True
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, flight.fresh
+
+        try:
+            flight.result, flight.fresh = self._lead(key, build, stale_key, persist)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+        if flight.fresh and stale_key is not None and flight.result is not None:
+            self.stale.set(stale_key, flight.result, size=1)
+        return flight.result, flight.fresh
+
+    def _stale(self, stale_key):
+        if stale_key is None:
+            return _MISSING
+        return self.stale.get(stale_key, _MISSING)
+
+    def _lead(self, key, build, stale_key, persist):
+        """本进程的构建者：在文件锁下构建，或使用其他 worker 的结果，返回 (结果, 是否为最新结果)"""
+        if fcntl is None or not self.lock_dir:
+            return build(), True
+
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        lock_path = os.path.join(self.lock_dir, f'{digest}.lock')
+        result_path = os.path.join(self.lock_dir, f'{digest}.result')
+        try:
+            os.makedirs(self.lock_dir, exist_ok=True)
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            return build(), True
+
+        try:
+            if not self._try_lock(fd):
+                # 其他 worker 正在构建：有旧版本时直接返回，否则等待
+                stale = self._stale(stale_key)
+                if stale is not _MISSING:
+                    return stale, False
+                if not self._wait_lock(fd):
+                    return build(), True
+
+            # 刷新锁文件时间，避免构建期间被清理
+            os.utime(lock_path)
+            result = self._read_result(result_path)
+            if result is _MISSING:
+                result = build()
+                if persist is None or persist(result):
+                    self._write_result(result_path, result)
+            return result, True
+        finally:
+            os.close(fd)  # 关闭文件即释放 flock
+
+    @staticmethod
+    def _try_lock(fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _wait_lock(self, fd):
+        deadline = time.monotonic() + self.timeout
+        delay = 0.005
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            if self._try_lock(fd):
+                return True
+            delay = min(delay * 2, 0.05)
+        return False
+
+    def _read_result(self, path):
+        try:
+            if time.time() - os.stat(path).st_mtime > self.result_ttl:
+                return _MISSING
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return _MISSING
+
+    def _write_result(self, path, result):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError):
+            return
+        self._prune()
+
+    def _prune(self):
+        """删除过期的结果文件和锁文件（每个进程每个有效期最多扫描一次）"""
+        now = time.time()
+        if now - self._last_prune < self.result_ttl:
+            return
+        self._last_prune = now
+        try:
+            entries = list(os.scandir(self.lock_dir))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if now - entry.stat().st_mtime > self.result_ttl * 2:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+single_flight = SingleFlight()
+
+
+def init_app(app):
+    """使用 instance/ 目录存放跨 worker 共享的锁文件和结果文件"""
+    single_flight.init_app(app)
@@ -0,0 +1,123 @@
+"""
+SQLite 连接配置
+
+news.db 是本地文件，pool_pre_ping / pool_recycle 只会让每次取连接多执行一次 SELECT 1。
+这里改为在创建连接时设置 PRAGMA：
+
+- journal_mode=WAL：阅读量写回等写事务不再阻塞读取
+- synchronous=NORMAL：WAL 模式下只在检查点时 fsync
+- mmap_size / cache_size / temp_store=MEMORY：减少读取时的系统调用和临时文件
+- busy_timeout：写锁冲突时等待而不是立即报错
+
+只读接口用 read_only 装饰，其中的查询走单独的 mode=ro 连接池，
+会话 flush 仍使用主连接。
+"""
+import contextvars
+import os
+import sqlite3
+import threading
+from functools import wraps
+from urllib.parse import quote
+
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+
+
+# 只读连接池在 app.extensions 中的键名
+READ_ENGINE_KEY = 'sqlite_read_engine'
+
+SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))  # 毫秒
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -64000))  # 负数表示 KiB
+
+# 两类连接都设置的 PRAGMA（journal_mode 只能由可写连接设置，见 _connect）
+_PRAGMAS = (
+    f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT}',
+    f'PRAGMA mmap_size = {SQLITE_MMAP_SIZE}',
+    f'PRAGMA cache_size = {SQLITE_CACHE_SIZE}',
+    'PRAGMA temp_store = MEMORY',
+)
+
+_read_only = contextvars.ContextVar('sqlite_read_only', default=False)
+
+_wal_ready = set()
+_wal_lock = threading.Lock()
+
+
+def database_path(app):
+    """SQLALCHEMY_DATABASE_URI 指向的 SQLite 文件路径，不是 SQLite 文件时返回 None"""
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI') or ''
+    if not uri.startswith('sqlite:///') or uri[len('sqlite:///'):] in ('', ':memory:'):
+        return None
+    path = uri[len('sqlite:///'):].split('?', 1)[0]
+    # 与 Flask-SQLAlchemy 一致：相对路径相对于 instance 目录
+    return path if os.path.isabs(path) else os.path.join(app.instance_path, path)
+
+
+def _connect(path, read_only=False):
+    if read_only:
+        _ensure_wal(path)
+        conn = sqlite3.connect(f'file:{quote(path)}?mode=ro', uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _ensure_wal(path):
+    # 只读连接无法切换日志模式，也不能创建数据库文件：先用可写连接打开一次
+    if path in _wal_ready:
+        return
+    with _wal_lock:
+        if path not in _wal_ready:
+            _connect(path).close()
+            _wal_ready.add(path)
+
+
+def init_app(app):
+    """
+    设置 SQLite 引擎参数（需在 db.init_app 之前调用）
+
+    非 SQLite 文件数据库时不做修改。
+    """
+    path = database_path(app)
+    if path is None:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    options.pop('pool_pre_ping', None)
+    options.pop('pool_recycle', None)
+    options['creator'] = lambda: _connect(path)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    # 不注册为 Flask-SQLAlchemy 的 bind，避免 create_all 等操作作用到只读连接
+    app.extensions[READ_ENGINE_KEY] = create_engine(
+        f'sqlite:///{path}', creator=lambda: _connect(path, read_only=True))
+
+
+def read_only(f):
+    """视图装饰器：其中的查询使用只读连接池"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return f(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return decorated
+
+
+class RoutingSession(Session):
+    """在 read_only 视图中把查询路由到只读连接池"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _read_only.get() and not self._flushing:
+            engine = current_app.extensions.get(READ_ENGINE_KEY)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
@@ -14,6 +14,11 @@ export const articlesApi = {
     return api.get(`/articles/${slug}`);
   },
 
+  // 上报阅读量（详情 GET 请求不计数）
+  recordView(slug) {
+    return api.post(`/articles/${slug}/view`);
+  },
+
   // 创建文章
   create(data) {
     return api.post('/articles', data);
@@ -0,0 +1,119 @@
+"""
+仪表盘统计计数
+
+用户和文章的新增、删除以及文章状态变化在 flush 时由 before_flush 事件
+统计增量，并在同一事务内执行一次 UPDATE site_stats，
+因此通过会话对象写入（add / 修改属性 / delete）时都会同步更新计数。
+批量 insert() / update() 语句不经过 flush，执行后需调用 reconcile_stats()。
+读取时只查询一行；超过 RECONCILE_INTERVAL 未校对时用 COUNT(*) 重新校对。
+"""
+import weakref
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models import db, User, Article, SiteStats
+
+
+STATS_ID = 1
+
+# 计数校对间隔
+RECONCILE_INTERVAL = timedelta(hours=1)
+
+# 按状态维护计数的文章状态
+_STATUS_COLUMNS = {
+    'published': 'published_articles',
+    'draft': 'draft_articles',
+}
+
+_schema_ready = weakref.WeakKeyDictionary()
+
+
+def ensure_stats_schema(connection):
+    """确保统计表和 article.created_at 索引存在（在当前事务的连接上执行）"""
+    engine = connection.engine
+    if engine in _schema_ready:
+        return
+    SiteStats.__table__.create(connection, checkfirst=True)
+    for index in Article.__table__.indexes:
+        if index.name == 'ix_article_created_at':
+            index.create(connection, checkfirst=True)
+    _schema_ready[engine] = True
+
+
+def _article_status_delta(deltas, status, sign):
+    column = _STATUS_COLUMNS.get(status)
+    if column:
+        deltas[column] = deltas.get(column, 0) + sign
+
+
+@event.listens_for(Session, 'before_flush')
+def _track_counts(session, flush_context, instances):
+    """统计本次 flush 中的计数变化"""
+    deltas = {}
+
+    for obj in session.new:
+        if isinstance(obj, User):
+            deltas['total_users'] = deltas.get('total_users', 0) + 1
+        elif isinstance(obj, Article):
+            deltas['total_articles'] = deltas.get('total_articles', 0) + 1
+            # status 的默认值在 INSERT 时才填充
+            _article_status_delta(deltas, obj.status or 'draft', 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            deltas['total_users'] = deltas.get('total_users', 0) - 1
+        elif isinstance(obj, Article):
+            deltas['total_articles'] = deltas.get('total_articles', 0) - 1
+            history = inspect(obj).attrs.status.history
+            old_status = history.deleted[0] if history.deleted else obj.status
+            _article_status_delta(deltas, old_status, -1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Article) and obj not in session.deleted:
+            # Article.status 设置了 active_history，过期对象被修改时旧值也已加载
+            history = inspect(obj).attrs.status.history
+            if history.has_changes() and history.deleted:
+                _article_status_delta(deltas, history.deleted[0], -1)
+                _article_status_delta(deltas, history.added[0] if history.added else None, 1)
+
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    connection = session.connection()
+    ensure_stats_schema(connection)
+    table = SiteStats.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == STATS_ID)
+        .values({column: table.c[column] + delta for column, delta in deltas.items()})
+    )
+
+
+def reconcile_stats():
+    """用 COUNT(*) 重新校对计数（修正 ORM 之外的写入造成的偏差）"""
+    ensure_stats_schema(db.session.connection())
+    stats = db.session.get(SiteStats, STATS_ID)
+    if stats is None:
+        stats = SiteStats(id=STATS_ID)
+        db.session.add(stats)
+
+    stats.total_users = User.query.count()
+    stats.total_articles = Article.query.count()
+    stats.published_articles = Article.query.filter_by(status='published').count()
+    stats.draft_articles = Article.query.filter_by(status='draft').count()
+    stats.reconciled_at = datetime.utcnow()
+    db.session.commit()
+    return stats
+
+
+def get_site_stats():
+    """读取统计计数（单行查询），到期时先校对"""
+    ensure_stats_schema(db.session.connection())
+    stats = db.session.get(SiteStats, STATS_ID)
+    if stats is None or stats.reconciled_at is None \
+            or datetime.utcnow() - stats.reconciled_at > RECONCILE_INTERVAL:
+        stats = reconcile_stats()
+    return stats.to_dict()
@@ -0,0 +1,177 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 导入 app 时连接的数据库：使用 instance/news.db 的临时副本，
+# WAL 等 PRAGMA 和测试中的写入不会修改仓库中的数据库文件
+_tmp_dir = tempfile.mkdtemp(prefix='news-test-')
+atexit.register(shutil.rmtree, _tmp_dir, ignore_errors=True)
+_tmp_db = os.path.join(_tmp_dir, 'news.db')
+if os.path.exists(os.path.join(ROOT, 'instance', 'news.db')):
+    shutil.copy(os.path.join(ROOT, 'instance', 'news.db'), _tmp_db)
+os.environ['DATABASE_URL'] = f'sqlite:///{_tmp_db}'
+# init_db 不再创建默认管理员（副本中已有）
+os.environ.setdefault('ADMIN_USERNAME', 'maxazure')
+
+from models import db, User, Category  # noqa: E402
+
+
+@pytest.fixture
+def db_app():
+    """使用内存 SQLite 的独立应用，避免测试写入 instance/news.db"""
+    test_app = Flask(__name__)
+    test_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    test_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(test_app)
+
+    with test_app.app_context():
+        db.create_all()
+        author = User(username='author', email='author@example.com', role='admin')
+        author.password_hash = 'x'
+        db.session.add(author)
+        db.session.add(Category(name='技术资讯', slug='tech'))
+        db.session.commit()
+        yield test_app
+        db.session.remove()
+        db.drop_all()
+
+
+@contextmanager
+def _count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture
+def count_queries():
+    """记录上下文内执行的 SQL 语句"""
+    return _count_queries
+
+
+@contextmanager
+def _count_request_queries():
+    # 应用的读写连接池和只读连接池是不同的引擎：监听所有引擎，只记录当前线程（测试客户端）的语句
+    statements = []
+    thread_id = threading.get_ident()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread_id:
+            statements.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture
+def count_request_queries(app_db, monkeypatch):
+    """记录测试客户端请求中执行的 SQL 语句（不包括缓存失效轮询）"""
+    from invalidation import invalidation_bus
+    monkeypatch.setattr(invalidation_bus, '_next_poll', float('inf'))
+    return _count_request_queries
+
+
+@pytest.fixture(scope='session')
+def app_db():
+    """在临时数据库副本上创建新增的表和全文索引"""
+    from app import app, init_db
+    init_db()
+    return app
+
+
+@pytest.fixture
+def app_client(app_db):
+    """应用的测试客户端（数据库为 instance/news.db 的临时副本）"""
+    import auth
+    # 其他测试（db_app）中缓存的同 id 用户不属于这个数据库
+    auth._principal_cache.clear()
+    app = app_db
+    app.testing = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def admin_headers(app_db):
+    """管理员的 Authorization 请求头"""
+    from auth import generate_tokens
+    with app_db.app_context():
+        admin = User.query.filter_by(role='admin').first()
+        access_token, _ = generate_tokens(admin.id)
+    return {'Authorization': f'Bearer {access_token}'}
+
+
+@pytest.fixture
+def make_article(app_db):
+    """在应用数据库中创建文章（返回 slug），测试结束后删除"""
+    from app import invalidate_article_pages, invalidate_all_pages
+    from models import Article
+    created = []
+
+    def make(status='published', content='测试文章正文', **fields):
+        with app_db.app_context():
+            slug = fields.pop('slug', None) or f'test-{uuid.uuid4().hex[:12]}'
+            article = Article(title=fields.pop('title', slug), slug=slug, content=content,
+                              html_content=f'<p>{content}</p>', excerpt=content,
+                              user_id=User.query.filter_by(role='admin').first().id,
+                              status=status, **fields)
+            if status == 'published':
+                article.published_at = datetime.now(timezone.utc)
+            db.session.add(article)
+            db.session.commit()
+            invalidate_article_pages(slug, article.category_id)
+            created.append(slug)
+            return slug
+
+    yield make
+
+    with app_db.app_context():
+        for article in Article.query.filter(Article.slug.in_(created)):
+            db.session.delete(article)
+        db.session.commit()
+        invalidate_all_pages()
+
+
+@pytest.fixture
+def tmp_app(tmp_path):
+    """临时数据库和 instance 目录上的独立应用（供 scripts/ 中的脚本使用），已创建管理员 id=1"""
+    test_app = Flask(__name__, instance_path=str(tmp_path / 'instance'))
+    test_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path / "news.db"}'
+    test_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(test_app)
+    os.makedirs(test_app.instance_path)
+
+    with test_app.app_context():
+        db.create_all()
+        admin = User(id=1, username='admin', email='admin@example.com', role='admin', password_hash='x')
+        db.session.add(admin)
+        db.session.commit()
+
+    yield test_app
+    with test_app.app_context():
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,83 @@
+import pytest
+
+import app as app_module
+from cache import LRUCache, content_version
+from models import db, Article
+
+
+@pytest.fixture
+def api_cache(monkeypatch):
+    """替换为空的响应缓存，测试可以检查其中的条目"""
+    cache = LRUCache(max_entries=64, max_bytes=16 * 1024 * 1024)
+    monkeypatch.setattr(app_module, 'api_cache', cache)
+    return cache
+
+
+def rename(app_db, slug, title):
+    # 绕过写接口直接修改数据库，不更新内容版本
+    with app_db.app_context():
+        Article.query.filter_by(slug=slug).update({'title': title})
+        db.session.commit()
+
+
+def titles(response):
+    return [a['title'] for a in response.get_json()['articles']]
+
+
+def test_repeated_get_is_a_cache_hit(app_client, app_db, api_cache, make_article):
+    slug = make_article(title='cache-before')
+    assert 'cache-before' in titles(app_client.get('/api/articles?per_page=5'))
+    assert api_cache.hits == 0 and len(api_cache) == 1
+
+    rename(app_db, slug, 'cache-after')
+    # 内容版本未变化：直接返回缓存的响应字节，不查询数据库
+    response = app_client.get('/api/articles?per_page=5')
+    assert api_cache.hits == 1
+    assert 'cache-before' in titles(response)
+
+    # 查询参数不同的请求单独缓存
+    assert 'cache-after' in titles(app_client.get('/api/articles?per_page=6'))
+
+    content_version.bump()
+    assert 'cache-after' in titles(app_client.get('/api/articles?per_page=5'))
+    assert len(api_cache) == 3
+
+
+def test_admin_and_public_responses_use_separate_keys(app_client, admin_headers, api_cache, make_article):
+    make_article(status='draft', title='cache-draft')
+    url = '/api/articles?status=null&per_page=100'
+
+    response = app_client.get(url, headers=admin_headers)
+    assert 'cache-draft' in titles(response)
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+    # 管理员请求已缓存，匿名访客的相同请求不命中它，也不能通过 status 参数看到草稿
+    for public_url in (url, '/api/articles?status=draft&per_page=100'):
+        response = app_client.get(public_url)
+        assert 'cache-draft' not in titles(response)
+        assert all(a['status'] == 'published' for a in response.get_json()['articles'])
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+    assert api_cache.hits == 0
+    assert sorted(key[2] for key in api_cache._entries if key[1] == (('per_page', '100'), ('status', 'null'))) \
+        == ['admin', 'public']
+
+    # 匿名访客不能用管理员列表的 ETag 得到 304
+    etag = app_client.get(url, headers=admin_headers).headers['ETag']
+    assert app_client.get(url, headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_byte_budget_evicts_entries(app_client, monkeypatch, make_article):
+    for _ in range(3):
+        make_article()
+    urls = [f'/api/articles?per_page=3&page={page}' for page in range(1, 5)]
+    sizes = [len(app_client.get(url).data) for url in urls]
+
+    # 预算只够最近的两页
+    cache = LRUCache(max_entries=64, max_bytes=sizes[2] + sizes[3])
+    monkeypatch.setattr(app_module, 'api_cache', cache)
+    for url in urls:
+        app_client.get(url)
+        assert cache.size_bytes <= cache.max_bytes
+
+    assert sorted(dict(key[1])['page'] for key in cache._entries) == ['3', '4']
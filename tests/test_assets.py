@@ -0,0 +1,35 @@
+import gzip
+
+from flask import Flask
+
+from assets import build_assets, send_asset, IMMUTABLE_CACHE_CONTROL
+
+
+def test_build_and_serve_precompressed(tmp_path):
+    static_dir = tmp_path / 'static'
+    (static_dir / 'css').mkdir(parents=True)
+    css = b'body { color: #333; }\n' * 100
+    (static_dir / 'css' / 'main.css').write_bytes(css)
+    (static_dir / 'robots.txt').write_text('User-agent: *')
+
+    manifest = build_assets(str(static_dir))
+    assert list(manifest) == ['css/main.css']
+    hashed = manifest['css/main.css']
+    assert hashed.startswith('css/main.') and hashed.endswith('.css')
+    # 重复构建不会再次处理 dist/ 目录，内容不变时哈希不变
+    assert build_assets(str(static_dir)) == manifest
+
+    app = Flask(__name__, static_folder=None)
+    app.add_url_rule('/static/<path:filename>', view_func=lambda filename: send_asset(str(static_dir), filename))
+    client = app.test_client()
+
+    response = client.get(f'/static/dist/{hashed}', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.mimetype == 'text/css'
+    assert gzip.decompress(response.data) == css
+
+    response = client.get(f'/static/dist/{hashed}')
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == css
@@ -0,0 +1,21 @@
+from models import db, User
+from auth import load_user, invalidate_user
+
+
+def test_load_user_uses_principal_cache(db_app, count_queries):
+    invalidate_user(1)
+    assert load_user(1).username == 'author'
+    db.session.remove()
+
+    with count_queries() as statements:
+        user = load_user(1)
+    assert statements == []
+    assert user.role == 'admin'
+
+    # 缓存的用户可以在当前会话中修改并提交
+    user.role = 'user'
+    db.session.commit()
+    invalidate_user(1)
+    db.session.remove()
+    assert load_user(1).role == 'user'
+    assert db.session.get(User, 1).role == 'user'
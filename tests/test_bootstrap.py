@@ -0,0 +1,73 @@
+import json
+import re
+import uuid
+
+import pytest
+
+from auth import generate_tokens
+from cache import content_version
+from models import db, User, Category
+
+
+def bootstrap(response):
+    """页面内嵌的初始数据"""
+    assert response.status_code == 200
+    match = re.search(r'<script id="bootstrap-data" type="application/json">(.*?)</script>',
+                      response.get_data(as_text=True), re.DOTALL)
+    assert match, '页面中没有内嵌初始数据'
+    return json.loads(match.group(1))
+
+
+@pytest.fixture
+def user_headers(app_db):
+    """普通用户的 Authorization 请求头"""
+    with app_db.app_context():
+        name = f'reader-{uuid.uuid4().hex[:8]}'
+        user = User(username=name, email=f'{name}@example.com', role='user', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        access_token, _ = generate_tokens(user.id)
+    yield {'Authorization': f'Bearer {access_token}'}
+    with app_db.app_context():
+        db.session.delete(db.session.get(User, user.id))
+        db.session.commit()
+
+
+def test_index_embeds_categories_user_and_legacy_page(app_client, app_db, admin_headers, tmp_path, monkeypatch):
+    (tmp_path / '20250101.md').write_text('---\ntitle: 旧版文章\n---\n正文', encoding='utf-8')
+    monkeypatch.setenv('NEWS_DIR', str(tmp_path))
+    # 首页缓存键不含 news 目录，清除其他测试渲染的首页
+    content_version.bump()
+    with app_db.app_context():
+        categories = [c.slug for c in Category.query.order_by(Category.sort_order.asc())]
+
+    data = bootstrap(app_client.get('/'))
+    assert [c['slug'] for c in data['categories']] == categories
+    assert data['user'] is None
+    assert data['article'] is None
+    assert data['legacy'] == {'articles': [{'filename': '20250101', 'title': '旧版文章'}], 'page': 1, 'pages': 1}
+
+    data = bootstrap(app_client.get('/', headers=admin_headers))
+    assert data['user']['role'] == 'admin'
+
+
+def test_article_page_embeds_published_article(app_client, make_article):
+    slug = make_article(content='内嵌的正文')
+    data = bootstrap(app_client.get(f'/article/{slug}'))
+    assert data['article']['slug'] == slug
+    assert data['article']['content'] == '内嵌的正文'
+    assert data['user'] is None
+    assert data['categories']
+
+
+def test_draft_is_embedded_only_for_admin(app_client, admin_headers, user_headers, make_article):
+    slug = make_article(status='draft', content='草稿正文')
+
+    for headers in ({}, user_headers):
+        response = app_client.get(f'/article/{slug}', headers=headers)
+        assert bootstrap(response)['article'] is None
+        assert '草稿正文' not in response.get_data(as_text=True)
+
+    data = bootstrap(app_client.get(f'/article/{slug}', headers=admin_headers))
+    assert data['article']['slug'] == slug
+    assert data['article']['status'] == 'draft'
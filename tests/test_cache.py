@@ -0,0 +1,32 @@
+import time
+
+from cache import LRUCache
+
+
+def test_lru_evicts_by_entries_and_bytes():
+    cache = LRUCache(max_entries=2, max_bytes=10)
+    cache.set('a', b'1234')
+    cache.set('b', b'1234')
+    cache.get('a')
+    cache.set('c', b'1234')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1234'
+
+    cache.set('d', b'12345678')
+    assert len(cache) == 1 and cache.size_bytes == 8
+    # 超过内存上限的条目不缓存
+    cache.set('e', b'x' * 11)
+    assert cache.get('e') is None
+
+
+def test_ttl_and_tag_invalidation():
+    cache = LRUCache(ttl=60)
+    cache.set('page-1', b'x', tags={'article:a', 'latest'})
+    cache.set('page-2', b'y', tags={'article:b'})
+    cache.set('short', b'z', ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get('short') is None
+
+    assert cache.invalidate_tags('latest') == 1
+    assert cache.get('page-1') is None
+    assert cache.get('page-2') == b'y'
@@ -0,0 +1,56 @@
+import gzip
+
+from flask import Flask, jsonify, make_response
+
+from compression import CompressionMiddleware
+
+
+def make_app():
+    app = Flask(__name__)
+
+    @app.route('/article')
+    def article():
+        response = make_response(jsonify({'content': '正文内容 ' * 500}))
+        response.set_etag('a1-v1')
+        return response
+
+    @app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/image')
+    def image():
+        return b'\x89PNG' * 1000, 200, {'Content-Type': 'image/png'}
+
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app)
+    return app
+
+
+def test_compresses_allowed_types_once():
+    app = make_app()
+    client = app.test_client()
+    middleware = app.wsgi_app
+
+    response = client.get('/article', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'] == 'W/"a1-v1"'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) == len(response.data)
+    plain = gzip.decompress(response.data)
+    assert plain == client.get('/article').data
+
+    # 相同的响应体命中压缩缓存
+    client.get('/article', headers={'Accept-Encoding': 'gzip'})
+    assert middleware.cache.hits == 1
+    assert len(middleware.cache) == 1
+
+
+def test_skips_small_and_binary_responses():
+    client = make_app().test_client()
+    for path in ('/small', '/image'):
+        response = client.get(path, headers={'Accept-Encoding': 'gzip, br'})
+        assert 'Content-Encoding' not in response.headers
+
+    response = client.get('/article', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['ETag'] == '"a1-v1"'
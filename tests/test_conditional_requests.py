@@ -0,0 +1,72 @@
+import time
+
+from werkzeug.http import http_date, parse_date
+
+
+def test_matching_etag_returns_304(app_client, make_article):
+    slug = make_article()
+    for url in (f'/{slug}', f'/api/articles/{slug}'):
+        response = app_client.get(url)
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+        response = app_client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert response.data == b''
+
+
+def test_etag_changes_after_edit(app_client, admin_headers, make_article):
+    slug = make_article()
+    for url in (f'/{slug}', f'/api/articles/{slug}'):
+        etag = app_client.get(url).headers['ETag']
+
+        response = app_client.put(f'/api/articles/{slug}', json={'title': f'edited {url}'}, headers=admin_headers)
+        assert response.status_code == 200
+
+        response = app_client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert f'edited {url}' in response.get_data(as_text=True)
+
+
+def test_draft_etag_is_private(app_client, admin_headers, make_article):
+    slug = make_article(status='draft')
+    response = app_client.get(f'/api/articles/{slug}', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+    response = app_client.get(f'/api/articles/{slug}',
+                              headers={**admin_headers, 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+    # 未登录不能用 ETag 探测草稿
+    assert app_client.get(f'/api/articles/{slug}').status_code == 401
+
+    published = make_article()
+    response = app_client.get(f'/api/articles/{published}')
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+
+def test_if_modified_since(app_client, make_article):
+    slug = make_article()
+    for url in (f'/{slug}', f'/api/articles/{slug}'):
+        last_modified = app_client.get(url).headers['Last-Modified']
+
+        assert app_client.get(url, headers={'If-Modified-Since': last_modified}).status_code == 304
+        earlier = http_date(parse_date(last_modified).timestamp() - 60)
+        assert app_client.get(url, headers={'If-Modified-Since': earlier}).status_code == 200
+
+
+def test_if_modified_since_sees_other_articles(app_client, make_article):
+    slug = make_article()
+    last_modified = app_client.get(f'/{slug}').headers['Last-Modified']
+
+    # 另一篇文章发布后，页面中的相关文章可能变化，文章本身的更新时间不变
+    time.sleep(1.1)
+    make_article()
+    for url in (f'/{slug}', f'/api/articles/{slug}'):
+        response = app_client.get(url, headers={'If-Modified-Since': last_modified})
+        assert response.status_code == 200
+        assert parse_date(response.headers['Last-Modified']) > parse_date(last_modified)
@@ -0,0 +1,35 @@
+import glob
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+from convert_articles_to_md import convert_html_to_markdown, extract_article_data  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures', 'convert')
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('name', sorted(os.path.basename(p)[:-5] for p in glob.glob(os.path.join(FIXTURES, '*.html'))))
+def test_converts_fixture(name):
+    html = read(os.path.join(FIXTURES, f'{name}.html'))
+    markdown = convert_html_to_markdown(html, '标题', {'date': '2025-01-02', 'category': '技术'})
+    assert markdown + '\n' == read(os.path.join(FIXTURES, f'{name}.md'))
+    # 块之间只有一个空行
+    assert '\n\n\n' not in markdown
+
+
+def test_extracts_title_meta_and_content():
+    html = ('<html><head><title>测试文章</title></head><body>'
+            '<div class="meta">2025年1月2日 | 分类：技术资讯</div>'
+            '<div class="content"><h2>小节</h2><p>正文</p></div></body></html>')
+    markdown, title, meta = extract_article_data(html)
+    assert title == '测试文章'
+    assert meta == {'date': '2025-01-02', 'category': '技术资讯'}
+    assert markdown == '---\ntitle: 测试文章\ndate: 2025-01-02\ncategory: 技术资讯\n---\n\n## 小节\n\n正文'
@@ -0,0 +1,27 @@
+from excerpt import generate_excerpt
+
+
+def test_strips_markdown_syntax():
+    content = (
+        '# 标题\n\n'
+        '> 引用的 **重点** 内容\n\n'
+        '- 第一项 [链接](https://example.com)\n'
+        '2. 第二项 `code` 和 *斜体*\n'
+        '#### **3. 加粗的序号**\n'
+        '![图片](a.png)snake_case_name\n'
+    )
+    assert generate_excerpt(content) == \
+        '标题 引用的 重点 内容 第一项 链接 第二项 和 斜体 加粗的序号 snake_case_name'
+
+
+def test_skips_fenced_code():
+    content = '开头\n\n```python\nprint("hidden")\n```\n\n结尾 ```inline``` 文字\n'
+    assert generate_excerpt(content) == '开头 结尾 文字'
+
+
+def test_truncates_long_content():
+    content = '\n\n'.join(['段落内容 ' * 20] * 1000)
+    excerpt = generate_excerpt(content, max_length=50)
+    assert excerpt == ('段落内容 ' * 20)[:50] + '...'
+    assert generate_excerpt('') == ''
+    assert generate_excerpt('短文', max_length=2) == '短文'
@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+
+import pytest
+
+from models import db, Article
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+import import_md_to_db as importer  # noqa: E402
+
+
+@pytest.fixture
+def import_app(tmp_app, monkeypatch):
+    """导入脚本使用临时数据库上的应用代替 app"""
+    monkeypatch.setattr(importer, 'app', tmp_app)
+    monkeypatch.setattr(importer, 'init_db', lambda: None)
+    return tmp_app
+
+
+@pytest.fixture
+def news_dir(tmp_path):
+    path = tmp_path / 'news'
+    path.mkdir()
+    return path
+
+
+def write(news_dir, name, title, body='正文内容。'):
+    (news_dir / name).write_text(f'---\ntitle: {title}\ndate: 2025-01-02\n---\n\n{body}\n', encoding='utf-8')
+
+
+def run(news_dir, **kwargs):
+    importer.import_md_files(str(news_dir), workers=1, **kwargs)
+
+
+def articles(app):
+    with app.app_context():
+        return {a.slug: (a.id, a.title, a.updated_at) for a in Article.query}
+
+
+def state(app):
+    with open(os.path.join(app.instance_path, importer.STATE_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_unchanged_files_are_skipped(import_app, news_dir):
+    write(news_dir, '20250101.md', '第一篇')
+    write(news_dir, '20250102.md', '第二篇')
+    run(news_dir)
+    first = articles(import_app)
+    assert {slug: title for slug, (_, title, _) in first.items()} == {'20250101': '第一篇', '20250102': '第二篇'}
+    assert set(state(import_app)) == {'20250101.md', '20250102.md'}
+
+    run(news_dir)
+    assert articles(import_app) == first
+
+
+def test_changed_file_updates_existing_row(import_app, news_dir):
+    write(news_dir, '20250101.md', '第一篇')
+    write(news_dir, '20250102.md', '第二篇')
+    run(news_dir)
+    before = articles(import_app)
+
+    write(news_dir, '20250101.md', '第一篇（修订）')
+    run(news_dir)
+    after = articles(import_app)
+    assert after['20250101'][:2] == (before['20250101'][0], '第一篇（修订）')
+    assert after['20250102'] == before['20250102']
+
+
+def test_article_without_checkpoint_is_adopted(import_app, news_dir):
+    with import_app.app_context():
+        db.session.add(Article(title='后台编辑过的标题', slug='20250101', content='后台内容', user_id=1,
+                               status='published'))
+        db.session.commit()
+    write(news_dir, '20250101.md', '文件中的标题')
+    run(news_dir)
+
+    # 不覆盖，只记录文件哈希作为基准
+    assert articles(import_app)['20250101'][1] == '后台编辑过的标题'
+    assert state(import_app)['20250101.md'] == importer.file_hash(str(news_dir / '20250101.md'))
+
+    # 之后文件修改时才更新
+    write(news_dir, '20250101.md', '文件中的新标题')
+    run(news_dir)
+    assert articles(import_app)['20250101'][1] == '文件中的新标题'
+
+
+def test_force_overwrites(import_app, news_dir):
+    with import_app.app_context():
+        db.session.add(Article(title='后台编辑过的标题', slug='20250101', content='后台内容', user_id=1,
+                               status='published'))
+        db.session.commit()
+    write(news_dir, '20250101.md', '文件中的标题')
+    run(news_dir)
+    assert articles(import_app)['20250101'][1] == '后台编辑过的标题'
+
+    run(news_dir, force=True)
+    assert articles(import_app)['20250101'][1] == '文件中的标题'
+
+
+def test_interrupted_run_resumes_from_checkpoint(import_app, news_dir, monkeypatch):
+    for day in (1, 2, 3):
+        write(news_dir, f'2025010{day}.md', f'第 {day} 篇')
+
+    write_chunk = importer.write_chunk
+    written = []
+
+    def interrupted(chunk, existing):
+        if written:
+            raise KeyboardInterrupt
+        written.extend(slug for slug, _ in chunk)
+        return write_chunk(chunk, existing)
+
+    monkeypatch.setattr(importer, 'write_chunk', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run(news_dir, chunk_size=1)
+    assert written == ['20250101']
+    assert set(state(import_app)) == {'20250101.md'}
+    assert set(articles(import_app)) == {'20250101'}
+
+    # 重新运行时只处理检查点之后的文件
+    def recording(chunk, existing):
+        written.extend(slug for slug, _ in chunk)
+        return write_chunk(chunk, existing)
+
+    written.clear()
+    monkeypatch.setattr(importer, 'write_chunk', recording)
+    run(news_dir, chunk_size=1)
+    assert written == ['20250102', '20250103']
+    assert set(articles(import_app)) == {'20250101', '20250102', '20250103'}
+
+
+def test_parse_failure_skips_only_that_file(import_app, news_dir, capsys):
+    write(news_dir, '20250101.md', '第一篇')
+    (news_dir / '20250102.md').write_bytes(b'---\ntitle: \xff\xfe\n---\n')
+    write(news_dir, '20250103.md', '第三篇')
+    run(news_dir, chunk_size=1)
+
+    assert set(articles(import_app)) == {'20250101', '20250103'}
+    # 失败的文件不记录检查点，修复后下次运行会重新导入
+    assert set(state(import_app)) == {'20250101.md', '20250103.md'}
+    assert '失败 1 篇' in capsys.readouterr().out
+
+    write(news_dir, '20250102.md', '第二篇')
+    run(news_dir)
+    assert articles(import_app)['20250102'][1] == '第二篇'
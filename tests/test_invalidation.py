@@ -0,0 +1,55 @@
+import os
+
+from flask import Flask
+from sqlalchemy import inspect
+
+from invalidation import InvalidationBus
+from models import db, CacheInvalidation
+
+
+def make_worker(name):
+    bus = InvalidationBus(poll_interval=0)
+    # 模拟不同的 worker 进程
+    bus._origin, bus._origin_pid = name, os.getpid()
+    received = []
+    bus.subscribe('pages', received.extend)
+    return bus, received
+
+
+def test_messages_reach_other_workers(db_app):
+    (a, received_a), (b, received_b) = make_worker('a'), make_worker('b')
+    assert a.poll() == 0 and b.poll() == 0  # 启动时从当前位置开始
+
+    a.publish('pages', 'article:x', 'home')
+    assert received_a == ['article:x', 'home']  # 本进程立即执行
+
+    assert b.poll() == 1
+    assert received_b == ['article:x', 'home']
+    assert b.poll() == 0
+
+    # 自己发布的消息不会重复处理
+    assert a.poll() == 1
+    assert received_a == ['article:x', 'home']
+
+
+def test_pruning_never_reuses_ids(db_app):
+    bus, _ = make_worker('a')
+    bus.retention = -1  # 每次发布都清理全部消息
+    for _ in range(2):
+        bus._next_prune = 0
+        bus.publish('pages', '*')
+    assert CacheInvalidation.query.count() == 0
+
+    # 已清理的 id 不会被复用，其他 worker 的轮询位置仍然有效
+    bus.retention = 3600
+    bus.publish('pages', '*')
+    assert [row.id for row in CacheInvalidation.query.all()] == [3]
+
+
+def test_table_created_at_startup(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path / "news.db"}'
+    db.init_app(app)
+    InvalidationBus().init_app(app)
+    with app.app_context():
+        assert inspect(db.engine).has_table('cache_invalidation')
@@ -0,0 +1,59 @@
+import os
+
+from legacy_index import LegacyIndex
+
+
+def test_index_titles_and_incremental_refresh(tmp_path):
+    (tmp_path / '20250101.md').write_text('---\ntitle: 前言标题\ndate: 2025-01-01\n---\n# 正文标题\n', encoding='utf-8')
+    (tmp_path / '20250102.md').write_text('简介\n\n# Markdown 标题\n正文', encoding='utf-8')
+    (tmp_path / '20250103.html').write_text('<html><head><title>HTML 标题</title></head></html>', encoding='utf-8')
+    index_file = tmp_path / 'index.json'
+
+    index = LegacyIndex(str(tmp_path), str(index_file))
+    items, total = index.page(1, 2)
+    assert total == 3
+    assert items == [
+        {'filename': '20250103', 'title': 'HTML 标题'},
+        {'filename': '20250102', 'title': 'Markdown 标题'},
+    ]
+    path, entry = index.lookup('20250101')
+    assert path == os.path.join(str(tmp_path), '20250101.md')
+    assert entry['meta'] == {'title': '前言标题', 'date': '2025-01-01'}
+
+    # 修改和删除文件后强制刷新
+    (tmp_path / '20250102.md').write_text('# 新标题', encoding='utf-8')
+    os.remove(tmp_path / '20250103.html')
+    index.refresh(force=True)
+    assert index.page(1, 10)[0] == [
+        {'filename': '20250102', 'title': '新标题'},
+        {'filename': '20250101', 'title': '前言标题'},
+    ]
+    assert index.lookup('20250103') == (None, None)
+
+    # 持久化的索引可直接复用
+    restored = LegacyIndex(str(tmp_path), str(index_file))
+    assert restored.entries == index.entries
+
+
+def test_refresh_skips_files_deleted_during_scan(tmp_path, monkeypatch):
+    (tmp_path / '20250101.md').write_text('# 保留', encoding='utf-8')
+    (tmp_path / '20250102.md').write_text('# 删除', encoding='utf-8')
+    scandir = os.scandir
+
+    def scandir_then_delete(path):
+        # 目录项已列出，随后文件被删除
+        entries = list(scandir(path))
+        os.remove(tmp_path / '20250102.md')
+        return _Entries(entries)
+
+    monkeypatch.setattr(os, 'scandir', scandir_then_delete)
+    index = LegacyIndex(str(tmp_path))
+    assert index.page(1, 10)[0] == [{'filename': '20250101', 'title': '保留'}]
+
+
+class _Entries(list):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
@@ -0,0 +1,91 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from cache import content_version
+from models import db, Article, User, Category
+
+
+def add_articles(count):
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        # 每篇文章使用不同的作者和分类，懒加载时每行都会多出查询
+        author = User(username=f'user{i}', email=f'user{i}@example.com', password_hash='x')
+        category = Category(name=f'分类{i}', slug=f'cat-{i}')
+        db.session.add_all([author, category])
+        db.session.flush()
+        db.session.add(Article(title=f'文章 {i}', slug=f'article-{i}', content='正文',
+                               status='published', user_id=author.id, category_id=category.id,
+                               published_at=start + timedelta(days=i)))
+    db.session.commit()
+    db.session.expunge_all()
+
+
+@pytest.fixture
+def listed_articles(app_db):
+    """在应用数据库中添加 10 篇作者和分类各不相同的最新文章，测试结束后删除"""
+    with app_db.app_context():
+        suffix = uuid.uuid4().hex[:8]
+        rows = []
+        for i in range(10):
+            author = User(username=f'list-{suffix}-{i}', email=f'list-{suffix}-{i}@example.com', password_hash='x')
+            category = Category(name=f'列表分类 {suffix}-{i}', slug=f'list-{suffix}-{i}')
+            db.session.add_all([author, category])
+            db.session.flush()
+            article = Article(title=f'列表文章 {i}', slug=f'list-{suffix}-{i}', content='正文',
+                              status='published', user_id=author.id, category_id=category.id,
+                              published_at=datetime(2100, 1, 1) + timedelta(days=i))
+            db.session.add(article)
+            rows.append((article, author, category))
+        db.session.commit()
+        ids = [(a.id, u.id, c.id) for a, u, c in rows]
+    yield
+
+    with app_db.app_context():
+        for article_id, user_id, category_id in ids:
+            db.session.delete(db.session.get(Article, article_id))
+            db.session.flush()
+            db.session.delete(db.session.get(User, user_id))
+            db.session.delete(db.session.get(Category, category_id))
+        db.session.commit()
+    content_version.bump()
+
+
+def test_list_endpoint_query_count_is_constant(app_client, listed_articles, count_request_queries):
+    counts = {}
+    for per_page in (2, 10):
+        # 更新内容版本，绕过响应缓存
+        content_version.bump()
+        with count_request_queries() as statements:
+            response = app_client.get(f'/api/articles?per_page={per_page}')
+        assert response.status_code == 200
+        articles = response.get_json()['articles']
+        assert len(articles) == per_page
+        counts[per_page] = len(statements)
+
+    # 分页查询 + COUNT，与每页行数无关（作者和分类在同一条 SQL 中 JOIN）
+    assert counts[2] == counts[10]
+    assert articles[0]['author_name'].endswith('-9')
+    assert articles[0]['category_name'].endswith('-9')
+    assert len({a['author_name'] for a in articles}) == 10
+
+
+def test_list_queries_skip_article_bodies(db_app, count_queries):
+    add_articles(3)
+
+    with count_queries() as statements:
+        articles = Article.query.filter_by(status='published')\
+            .options(*Article.list_options())\
+            .order_by(Article.published_at.desc()).all()
+        rows = [a.to_dict() for a in articles]
+
+    assert len(rows) == 3 and len(statements) == 1
+    assert 'article.content' not in statements[0]
+    assert 'article.html_content' not in statements[0]
+
+    # 正文在访问时才加载
+    with count_queries() as statements:
+        detail = articles[0].to_detail_dict()
+    assert detail['content'] == '正文'
+    assert statements and all('FROM article' in s for s in statements)
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, Article
+from pagination import paginate_by_cursor, decode_cursor, InvalidCursor
+
+
+def test_cursor_walks_all_rows_once(db_app):
+    start = datetime(2025, 1, 1)
+    for i in range(7):
+        # 两篇文章共享同一发布时间，最后两篇为未发布的草稿
+        published_at = start + timedelta(days=i // 2) if i < 5 else None
+        db.session.add(Article(title=f't{i}', slug=f's{i}', content='c', user_id=1,
+                               status='published' if published_at else 'draft',
+                               published_at=published_at))
+    db.session.commit()
+
+    expected = [a.slug for a in Article.query.order_by(
+        Article.published_at.is_(None), Article.published_at.desc(), Article.id.desc())]
+
+    seen, cursor = [], ''
+    while True:
+        items, cursor = paginate_by_cursor(Article.query, cursor, 3)
+        seen += [a.slug for a in items]
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_invalid_cursor():
+    assert decode_cursor('') is None
+    with pytest.raises(InvalidCursor):
+        decode_cursor('not-a-cursor')
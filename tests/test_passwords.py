@@ -0,0 +1,124 @@
+import importlib.util
+import os
+import threading
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from passwords import PasswordHasher, HasherBusy, needs_rehash
+
+FAST_METHOD = 'pbkdf2:sha256:1000'
+
+
+def test_verify_upgrades_outdated_hash():
+    hasher = PasswordHasher(method=FAST_METHOD, workers=1, queue=2)
+    old_hash = generate_password_hash('Secret-123', method='pbkdf2:sha256:500')
+
+    assert hasher.verify(old_hash, 'wrong') == (False, None)
+
+    matched, new_hash = hasher.verify(old_hash, 'Secret-123')
+    assert matched
+    assert new_hash.startswith('pbkdf2:sha256:1000$')
+    assert not needs_rehash(new_hash, FAST_METHOD)
+    assert hasher.verify(new_hash, 'Secret-123') == (True, None)
+
+
+def test_needs_rehash_fills_in_default_parameters():
+    assert not needs_rehash('scrypt:32768:8:1$salt$hash', 'scrypt')
+    assert needs_rehash('scrypt:16384:8:1$salt$hash', 'scrypt:32768:8:1')
+
+
+def test_rejects_when_slots_are_taken(tmp_path):
+    hasher = PasswordHasher(method=FAST_METHOD, workers=0, queue=1)
+    hasher.lock_dir = str(tmp_path)
+    # 另一个 worker 进程持有同一个名额锁
+    other = PasswordHasher(method=FAST_METHOD, workers=0, queue=1)
+    other.lock_dir = str(tmp_path)
+
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_hash(password, method):
+        entered.set()
+        release.wait(5)
+        return password
+
+    thread = threading.Thread(target=other._run, args=(slow_hash, 'x', FAST_METHOD))
+    thread.start()
+    entered.wait(5)
+    try:
+        with pytest.raises(HasherBusy):
+            hasher.hash('Secret-123')
+    finally:
+        release.set()
+        thread.join()
+
+    assert hasher.hash('Secret-123').startswith('pbkdf2:sha256:1000$')
+
+
+def test_slot_held_until_timed_out_hash_finishes(tmp_path):
+    hasher = PasswordHasher(method=FAST_METHOD, workers=1, queue=1, timeout=0.2)
+    hasher.lock_dir = str(tmp_path)
+    hasher.hash('warm-up')  # 启动子进程
+
+    with pytest.raises(HasherBusy):
+        hasher._run(time.sleep, 1.0)
+    # 等待已超时，但子进程仍在计算：名额没有释放，立即拒绝而不是再排队等待
+    with pytest.raises(HasherBusy, match='请求过多'):
+        hasher.hash('Secret-123')
+
+    time.sleep(1.2)
+    assert hasher.hash('Secret-123').startswith('pbkdf2:sha256:1000$')
+
+
+def test_default_slots_leave_a_worker_for_pages(monkeypatch):
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'passwords.py')
+
+    def load(**env):
+        monkeypatch.delenv('PASSWORD_HASH_QUEUE', raising=False)
+        monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        spec = importlib.util.spec_from_file_location('passwords_env', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.PASSWORD_HASH_QUEUE
+
+    assert load() == 1  # Dockerfile 默认 2 个 worker
+    assert load(WEB_CONCURRENCY='4') == 3
+    assert load(WEB_CONCURRENCY='1') == 1
+    assert load(WEB_CONCURRENCY='4', PASSWORD_HASH_QUEUE='2') == 2
+
+
+def test_pages_served_while_slots_are_saturated(app_client, monkeypatch, tmp_path):
+    from passwords import password_hasher
+
+    monkeypatch.setattr(password_hasher, 'workers', 0)
+    monkeypatch.setattr(password_hasher, 'queue', 1)
+    monkeypatch.setattr(password_hasher, '_slots', threading.BoundedSemaphore(1))
+    monkeypatch.setattr(password_hasher, 'lock_dir', str(tmp_path))
+
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_hash(password, method):
+        entered.set()
+        release.wait(5)
+        return password
+
+    # 另一个请求正在计算哈希，占用唯一的名额
+    thread = threading.Thread(target=password_hasher._run, args=(slow_hash, 'x', FAST_METHOD))
+    thread.start()
+    entered.wait(5)
+    try:
+        start = time.perf_counter()
+        response = app_client.post('/api/auth/login', json={'username': 'maxazure', 'password': 'whatever'})
+        # 登录请求立即返回 503，不占住 worker 等待
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert time.perf_counter() - start < 1
+
+        assert app_client.get('/api/articles').status_code == 200
+        assert app_client.get('/api/health').status_code == 200
+    finally:
+        release.set()
+        thread.join()
@@ -0,0 +1,96 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+from models import db, Article
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+import rederive_articles as rederive  # noqa: E402
+
+
+@pytest.fixture
+def rederive_app(tmp_app, monkeypatch):
+    """脚本使用临时数据库上的应用代替 app"""
+    monkeypatch.setattr(rederive, 'app', tmp_app)
+    return tmp_app
+
+
+def add_articles(app, *rows):
+    """写入 (content, html_content, excerpt, updated_at)，返回 id 列表"""
+    with app.app_context():
+        articles = [Article(title=f'文章 {i}', slug=f'article-{i}', content=content, html_content=html_content,
+                            excerpt=excerpt, updated_at=updated_at, user_id=1, status='published')
+                    for i, (content, html_content, excerpt, updated_at) in enumerate(rows)]
+        db.session.add_all(articles)
+        db.session.commit()
+        return [a.id for a in articles]
+
+
+def derived(app):
+    with app.app_context():
+        return {a.id: (a.html_content, a.excerpt) for a in Article.query}
+
+
+def test_derive_only_returns_changed_fields():
+    assert rederive.derive((1, '# 标题\n\n正文', '<h1>标题</h1>\n<p>正文</p>', '正文')) is None
+    assert rederive.derive((1, '**新**正文', '<p>旧</p>', '新正文')) == {'id': 1, 'html_content': '<p><strong>新</strong>正文</p>'}
+    # 从 HTML 文件导入的文章 content 与 html_content 相同，不重新渲染
+    assert rederive.derive((2, '<p>HTML</p>', '<p>HTML</p>', 'HTML')) is None
+    # 摘要为空或混入了页面 HTML 时重新生成
+    assert rederive.derive((3, '正文', '<p>正文</p>', '<div>整页</div>')) == {'id': 3, 'excerpt': '正文'}
+    assert rederive.derive((3, '正文', '<p>正文</p>', '')) == {'id': 3, 'excerpt': '正文'}
+    assert rederive.derive((3, '正文', '<p>正文</p>', '手写摘要'), rebuild_excerpts=True) == {'id': 3, 'excerpt': '正文'}
+
+
+def test_iter_batches_reads_in_id_order(rederive_app):
+    old, new = datetime(2024, 1, 1), datetime(2025, 6, 1)
+    ids = add_articles(rederive_app, *[(f'正文 {i}', None, None, old if i % 2 else new) for i in range(5)])
+
+    with rederive_app.app_context():
+        batches = list(rederive.iter_batches(2))
+        assert [[row[0] for row in rows] for rows in batches] == [ids[0:2], ids[2:4], ids[4:5]]
+
+        batches = list(rederive.iter_batches(2, since=datetime(2025, 1, 1)))
+        assert [[row[0] for row in rows] for rows in batches] == [[ids[0], ids[2]], [ids[4]]]
+
+
+def test_rederives_in_batches(rederive_app, capsys):
+    now = datetime(2025, 6, 1)
+    ids = add_articles(
+        rederive_app,
+        ('**一**', '<p>过期</p>', '一', now),
+        ('二', '<p>二</p>', '<!DOCTYPE html><html>', now),
+        ('三', '<p>三</p>', '三', now),
+        ('<p>HTML</p>', '<p>HTML</p>', 'HTML', now),
+        ('五', None, None, now),
+    )
+
+    assert rederive.rederive_articles(batch_size=2, workers=1) == 3
+    assert derived(rederive_app) == {
+        ids[0]: ('<p><strong>一</strong></p>', '一'),
+        ids[1]: ('<p>二</p>', '二'),
+        ids[2]: ('<p>三</p>', '三'),
+        ids[3]: ('<p>HTML</p>', 'HTML'),
+        ids[4]: ('<p>五</p>', '五'),
+    }
+    # 5 篇文章分 3 批读取
+    assert capsys.readouterr().out.count('已检查') == 3
+
+    # 再次运行没有需要更新的文章
+    assert rederive.rederive_articles(batch_size=2, workers=1) == 0
+
+
+def test_since_limits_rows_touched(rederive_app):
+    ids = add_articles(
+        rederive_app,
+        ('旧文章', '<p>过期</p>', None, datetime(2024, 1, 1)),
+        ('新文章', '<p>过期</p>', None, datetime(2025, 6, 1)),
+    )
+
+    assert rederive.rederive_articles(since=datetime(2025, 1, 1), batch_size=1, workers=1) == 1
+    assert derived(rederive_app) == {
+        ids[0]: ('<p>过期</p>', None),
+        ids[1]: ('<p>新文章</p>', '新文章'),
+    }
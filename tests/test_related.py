@@ -0,0 +1,56 @@
+import threading
+from datetime import datetime
+
+from models import db, Article, ArticleRelation
+from related import SimilarityIndex, RelatedRefresher, related_articles, tokenize
+
+
+def add(slug, title, content, status='published'):
+    article = Article(title=title, slug=slug, content=content, status=status,
+                      user_id=1, published_at=datetime(2025, 1, 1))
+    db.session.add(article)
+    db.session.commit()
+    return article
+
+
+def test_tokenize_cjk_bigrams():
+    assert tokenize('小米汽车 and Gemini CLI') == ['小米', '米汽', '汽车', 'gemini', 'cli']
+
+
+def test_rebuild_and_incremental_refresh(db_app):
+    ev = add('ev', '小米汽车发布', '小米汽车与特斯拉的电动车竞争')
+    tesla = add('tesla', '特斯拉降价', '特斯拉电动车全系降价，小米汽车压力增大')
+    gemini = add('gemini', 'Gemini CLI 上线', 'Google 推出 Gemini 命令行工具')
+
+    index = SimilarityIndex()
+    assert index.rebuild() == 3
+    assert [a.slug for a in related_articles(ev)] == ['tesla']
+
+    # 新发布的相似文章进入已有文章的邻居列表
+    review = add('review', '小米汽车评测', '小米汽车电动车试驾评测，对比特斯拉')
+    changed = index.refresh(review.id)
+    assert {ev.id, tesla.id, review.id} <= changed
+    assert 'review' in [a.slug for a in related_articles(ev)]
+
+    # 下架后从其他文章的邻居中移除
+    review.status = 'draft'
+    db.session.commit()
+    index.refresh(review.id)
+    assert 'review' not in [a.slug for a in related_articles(ev)]
+    assert ArticleRelation.query.filter_by(article_id=review.id).count() == 0
+    assert related_articles(gemini) == []
+
+
+def test_refresh_runs_in_background(db_app):
+    ev = add('ev', '小米汽车发布', '小米汽车与特斯拉的电动车竞争')
+    tesla = add('tesla', '特斯拉降价', '特斯拉电动车全系降价，小米汽车压力增大')
+
+    done, received = threading.Event(), []
+    refresher = RelatedRefresher(SimilarityIndex())
+    refresher.init_app(db_app, on_changed=lambda changed: (received.append(changed), done.set()))
+
+    # 写请求只登记文章 id，更新在后台线程中完成
+    refresher.schedule(tesla.id)
+    assert done.wait(5)
+    assert received == [{ev.id, tesla.id}]
+    assert [a.slug for a in related_articles(ev)] == ['tesla']
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import search
+from models import db, Article
+from search import build_match_query, ensure_search_index, expand_short_term, search_articles, render_highlight
+
+
+def make_article(slug, title, content, excerpt=''):
+    article = Article(title=title, slug=slug, content=content, excerpt=excerpt,
+                      status='published', user_id=1, published_at=datetime(2025, 1, 1))
+    db.session.add(article)
+    db.session.commit()
+    return article
+
+
+def test_build_match_query():
+    assert build_match_query('小米汽车') == '"小米汽车"'
+    assert build_match_query('gemini "cli"') == '"gemini" AND """cli"""'
+    # trigram 无法匹配少于 3 个字符的词
+    assert build_match_query('AI 小米汽车') is None
+    assert build_match_query('   ') is None
+    # 两个字的词展开为以它开头的三元组，单字仍然无法匹配
+    expand = {'汽车': ['汽车发', '汽车\n'], '小米': []}.get
+    assert build_match_query('小米 汽车', expand) == '("小米\n") AND ("汽车发" OR "汽车\n")'
+    assert build_match_query('车', expand) is None
+
+
+def test_search_ranks_title_matches_first(db_app):
+    assert ensure_search_index()
+    make_article('body', '行业动态', '今天小米汽车发布了新车型')
+    make_article('title', '小米汽车新品发布', '发布会回顾')
+    make_article('other', '无关文章', '特斯拉降价')
+
+    rows = search_articles(Article.query, '小米汽车').all()
+    assert [a.slug for a, _, _ in rows] == ['title', 'body']
+    assert render_highlight(rows[0][1]) == '<mark>小米汽车</mark>新品发布'
+
+
+def test_search_index_follows_updates_and_deletes(db_app):
+    ensure_search_index()
+    article = make_article('a', '旧标题文章', '<script>正文内容</script>')
+
+    article.title = '新标题文章'
+    db.session.commit()
+    assert search_articles(Article.query, '旧标题').all() == []
+    _, _, snippet = search_articles(Article.query, '正文内容').one()
+    assert '<script>' not in render_highlight(snippet)
+
+    db.session.delete(article)
+    db.session.commit()
+    assert search_articles(Article.query, '新标题').all() == []
+
+
+def test_two_character_terms_use_index(db_app):
+    ensure_search_index()
+    make_article('end', '小米发布新款汽车', '发布会回顾')  # 位于列末尾
+    make_article('middle', '行业动态', '电动汽车销量增长')
+    make_article('other', '无关文章', '特斯拉降价')
+
+    rows = search_articles(Article.query, '汽车').all()
+    assert sorted(a.slug for a, _, _ in rows) == ['end', 'middle']
+    assert render_highlight(rows[0][1] if rows[0][0].slug == 'end' else rows[1][1]) == '小米发布新款<mark>汽车</mark>'
+    assert search_articles(Article.query, '汽车 小米').one()[0].slug == 'end'
+    # 没有出现过的两字词不匹配任何文章
+    assert search_articles(Article.query, '火箭').all() == []
+
+
+def test_common_two_character_terms_fall_back_to_like(db_app, monkeypatch):
+    ensure_search_index()
+    for i in range(5):
+        make_article(f'car-{i}', '行业动态', f'汽车{"甲乙丙丁戊"[i]}销量')
+
+    assert len(expand_short_term('汽车')) == 5
+    assert expand_short_term('汽车', limit=4) is None
+    # expand 返回 None 表示展开结果过多
+    assert build_match_query('汽车', lambda term: None) is None
+
+    # 展开结果超过上限时不使用 FTS（由调用方回退到 LIKE）
+    monkeypatch.setattr(search, 'MAX_EXPANSIONS', 4)
+    assert search_articles(Article.query, '汽车') is None
+    assert search_articles(Article.query, '汽车甲').one()[0].slug == 'car-0'
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from singleflight import SingleFlight
+
+
+def run_concurrently(targets):
+    results = [None] * len(targets)
+
+    def call(i, target):
+        results[i] = target()
+
+    threads = [threading.Thread(target=call, args=(i, target)) for i, target in enumerate(targets)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def slow_build(calls, value, delay=0.2):
+    def build():
+        calls.append(value)
+        time.sleep(delay)
+        return value
+    return build
+
+
+def test_concurrent_calls_share_one_build():
+    flight = SingleFlight()
+    calls = []
+    build = slow_build(calls, b'page')
+
+    results = run_concurrently([lambda: flight.run('k', build)] * 8)
+    assert results == [(b'page', True)] * 8
+    assert len(calls) == 1
+
+
+def test_waiters_get_stale_copy_while_building():
+    flight = SingleFlight()
+    flight.run(('k', 1), lambda: b'old', stale_key='k')
+    calls = []
+
+    def follower():
+        time.sleep(0.05)
+        return flight.run(('k', 2), slow_build(calls, b'new'), stale_key='k')
+
+    leader, waiter = run_concurrently([
+        lambda: flight.run(('k', 2), slow_build(calls, b'new'), stale_key='k'),
+        follower,
+    ])
+    assert (leader, waiter) == ((b'new', True), (b'old', False))
+    assert calls == [b'new']
+
+
+def test_workers_share_result_through_lock_dir(tmp_path):
+    # 两个实例模拟两个 worker，共享同一个锁目录
+    workers = [SingleFlight(), SingleFlight()]
+    for worker in workers:
+        worker.lock_dir = str(tmp_path)
+    calls = []
+
+    def second():
+        time.sleep(0.05)
+        return workers[1].run('k', slow_build(calls, 'second'))
+
+    results = run_concurrently([lambda: workers[0].run('k', slow_build(calls, 'first')), second])
+    assert results == [('first', True), ('first', True)]
+    assert calls == ['first']
+
+
+def test_unpersisted_results_stay_in_process(tmp_path):
+    flight = SingleFlight()
+    flight.lock_dir = str(tmp_path)
+
+    assert flight.run('draft', lambda: 'body', persist=lambda result: False) == ('body', True)
+    assert not list(tmp_path.glob('*.result'))
+    flight.run('published', lambda: 'body')
+    assert len(list(tmp_path.glob('*.result'))) == 1
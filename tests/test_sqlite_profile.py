@@ -0,0 +1,52 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from models import db, Category
+from sqlite_profile import init_app as init_sqlite_profile, read_only, READ_ENGINE_KEY
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    test_app = Flask(__name__, instance_path=str(tmp_path))
+    test_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///news.db'
+    test_app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_pre_ping': True, 'pool_recycle': 300}
+    init_sqlite_profile(test_app)
+    db.init_app(test_app)
+
+    with test_app.app_context():
+        db.create_all()
+        db.session.add(Category(name='技术资讯', slug='tech'))
+        db.session.commit()
+        yield test_app
+        db.session.remove()
+        db.engine.dispose()
+        test_app.extensions[READ_ENGINE_KEY].dispose()
+
+
+def test_pragmas_applied_on_connect(file_app):
+    assert 'pool_pre_ping' not in file_app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    assert db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+    assert db.session.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+    assert db.session.execute(text('PRAGMA temp_store')).scalar() == 2  # MEMORY
+    assert db.session.execute(text('PRAGMA busy_timeout')).scalar() == 5000
+
+
+def test_read_only_views_use_read_pool(file_app):
+    @read_only
+    def view():
+        assert db.session.get_bind() is file_app.extensions[READ_ENGINE_KEY]
+        names = [c.name for c in Category.query.all()]
+        with pytest.raises(OperationalError):
+            db.session.execute(text("UPDATE category SET name = 'x'"))
+        db.session.rollback()
+
+        # flush 仍然使用可写连接
+        db.session.add(Category(name='产品分析', slug='product'))
+        db.session.commit()
+        return names
+
+    assert view() == ['技术资讯']
+    assert db.session.get_bind() is db.engines[None]
+    assert Category.query.count() == 2
@@ -0,0 +1,41 @@
+from models import db, Article, User
+from stats import get_site_stats, reconcile_stats
+
+
+def test_counters_follow_writes(db_app):
+    reconcile_stats()
+    assert get_site_stats() == {'total_users': 1, 'total_articles': 0,
+                                'published_articles': 0, 'draft_articles': 0}
+
+    draft = Article(title='a', slug='a', content='c', user_id=1)
+    published = Article(title='b', slug='b', content='c', user_id=1, status='published')
+    db.session.add_all([draft, published, User(username='u2', email='u2@example.com', password_hash='x')])
+    db.session.commit()
+    assert get_site_stats() == {'total_users': 2, 'total_articles': 2,
+                                'published_articles': 1, 'draft_articles': 1}
+
+    # 发布、下架、删除
+    draft.status = 'published'
+    db.session.commit()
+    published.status = 'draft'
+    db.session.commit()
+    db.session.delete(draft)
+    db.session.commit()
+    assert get_site_stats() == {'total_users': 2, 'total_articles': 1,
+                                'published_articles': 0, 'draft_articles': 1}
+
+    # 校对结果与增量计数一致
+    assert reconcile_stats().to_dict() == get_site_stats()
+
+
+def test_status_change_on_expired_article(db_app):
+    article = Article(title='a', slug='a', content='c', user_id=1)
+    db.session.add(article)
+    db.session.commit()
+    reconcile_stats()
+
+    # 提交后对象已过期，直接赋值时 status 的旧值尚未加载
+    article.status = 'published'
+    db.session.commit()
+    assert get_site_stats()['published_articles'] == 1
+    assert get_site_stats()['draft_articles'] == 0
@@ -0,0 +1,65 @@
+from models import db
+from trending import TrendingTracker
+from view_counter import ViewCounter
+
+
+def apply(tracker, counts, now):
+    with db.engine.begin() as conn:
+        tracker.apply(conn, counts, now=now)
+
+
+def test_leaderboard_decays(db_app):
+    tracker = TrendingTracker({'hour': 3600})
+    assert tracker.leaders('hour', 2, now=0) == []
+
+    apply(tracker, {1: 5, 2: 1}, now=0)
+    assert tracker.leaders('hour', 2, now=0) == [(1, 5.0), (2, 1.0)]
+
+    # 一天后旧的阅读几乎衰减完，少量新阅读即可超过
+    apply(tracker, {3: 2}, now=86400)
+    leaders = tracker.leaders('hour', 2, now=86400)
+    assert [key for key, _ in leaders] == [3, 1]
+    assert round(leaders[0][1], 6) == 2.0
+
+    tracker.remove(3)
+    assert [key for key, _ in tracker.leaders('hour', 2, now=86400)] == [1, 2]
+
+
+def test_rescale_keeps_order(db_app):
+    tracker = TrendingTracker({'w': 1})
+    apply(tracker, {1: 3}, now=0)
+    apply(tracker, {2: 1, 3: 2}, now=100)
+    # 衰减到阈值以下的计数被清除，基准时间移到最近一次写入
+    assert tracker.leaders('w', 3, now=100) == [(3, 2.0), (2, 1.0)]
+    assert tracker._landmarks(db.session) == {'w': 100}
+
+
+def test_workers_share_the_leaderboard(db_app):
+    tracker = TrendingTracker()
+    # 两个 worker 进程各自的写回缓冲
+    workers = [ViewCounter(), ViewCounter()]
+    for worker in workers:
+        worker.init_app(db_app, on_flush=tracker.apply)
+
+    workers[0].record(1, 2)
+    workers[1].record(2, 3)
+    workers[1].record(1, 2)
+    for worker in workers:
+        worker.flush()
+
+    for window in ('hour', 'day', 'week'):
+        assert [key for key, _ in tracker.leaders(window, 10)] == [1, 2]
+        assert [round(score) for _, score in tracker.leaders(window, 10)] == [4, 3]
+
+
+def test_popular_endpoint_reads_shared_leaderboard(app_client, make_article):
+    from view_counter import view_counter
+
+    slug = make_article()
+    for _ in range(1000):
+        assert app_client.post(f'/api/articles/{slug}/view').status_code == 204
+    view_counter.flush()
+
+    articles = app_client.get('/api/articles/popular?window=hour&limit=1').get_json()['articles']
+    assert articles[0]['slug'] == slug
+    assert round(articles[0]['trending_score']) >= 1000
@@ -0,0 +1,55 @@
+import pytest
+
+from models import db, Article
+from view_counter import view_counter
+
+
+@pytest.fixture(autouse=True)
+def flushed(app_db):
+    # 其他测试缓冲的阅读量（文章删除后 id 可能被复用）先写回
+    view_counter.flush()
+
+
+def article_id(app_db, slug):
+    with app_db.app_context():
+        return Article.query.filter_by(slug=slug).first().id
+
+
+def test_unknown_or_draft_returns_404(app_client, admin_headers, make_article):
+    assert app_client.post('/api/articles/no-such-article/view').status_code == 404
+
+    draft = make_article(status='draft')
+    assert app_client.post(f'/api/articles/{draft}/view').status_code == 404
+
+    # 发布后不再使用缓存的“不存在”结果
+    assert app_client.post(f'/api/articles/{draft}/publish', headers=admin_headers).status_code == 200
+    assert app_client.post(f'/api/articles/{draft}/view').status_code == 204
+
+
+def test_post_records_view(app_client, app_db, make_article):
+    slug = make_article()
+    article = article_id(app_db, slug)
+
+    for _ in range(3):
+        response = app_client.post(f'/api/articles/{slug}/view')
+        assert response.status_code == 204
+    assert view_counter.pending(article) == 3
+
+    view_counter.flush()
+    assert view_counter.pending(article) == 0
+    with app_db.app_context():
+        assert db.session.get(Article, article).view_count == 3
+
+
+def test_get_does_not_record_view(app_client, app_db, make_article):
+    slug = make_article()
+    article = article_id(app_db, slug)
+
+    for url in (f'/api/articles/{slug}', f'/{slug}', f'/article/{slug}'):
+        assert app_client.get(url).status_code == 200
+        assert app_client.get(url).status_code == 200
+    assert view_counter.pending(article) == 0
+
+    view_counter.flush()
+    with app_db.app_context():
+        assert db.session.get(Article, article).view_count == 0
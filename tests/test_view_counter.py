@@ -0,0 +1,22 @@
+from models import db, Article
+from view_counter import ViewCounter
+
+
+def test_flush_batches_increments(db_app):
+    article = Article(title='t', slug='t', content='c', status='published', user_id=1, view_count=5)
+    db.session.add(article)
+    db.session.commit()
+
+    counter = ViewCounter(flush_threshold=1000)
+    counter.app = db_app
+    for _ in range(3):
+        counter.record(article.id)
+    assert counter.pending(article.id) == 3
+
+    assert counter.flush() == 1
+    assert counter.pending(article.id) == 0
+    db.session.refresh(article)
+    assert article.view_count == 8
+
+    # 没有待写回的计数时不访问数据库
+    assert counter.flush() == 0
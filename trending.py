@@ -0,0 +1,128 @@
+"""
+热门文章排行（按时间衰减的阅读量）
+
+每个时间窗口（小时 / 天 / 周）维护一组指数衰减的阅读计数。使用前向衰减
+（forward decay）：计数按 exp((t - landmark) / tau) 放大后累加，
+同一时刻所有计数的衰减因子相同，排序不随时间改变，
+因此只有被阅读的文章会改变名次，排行直接按放大后的计数排序（走索引）。
+
+计数保存在 article_trending 表中，由 view_counter 在批量写回阅读量的同一个事务中累加，
+所有 worker 看到同一份排行，包含其他 worker 处理的阅读。
+尚未写回的阅读（最多 FLUSH_INTERVAL 秒）暂不计入排行。
+"""
+import math
+import time
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import db, ArticleTrending, TrendingLandmark
+
+
+WINDOWS = {
+    'hour': 3600,
+    'day': 86400,
+    'week': 7 * 86400,
+}
+
+# 放大指数超过该值时重新设置基准时间，避免浮点溢出
+RESCALE_EXPONENT = 30.0
+
+# 衰减后低于该值的计数在重新设置基准时被清除
+PRUNE_BELOW = 1e-3
+
+_UPSERT_SQL = text(
+    'INSERT INTO article_trending (article_id, period, score) VALUES (:article_id, :period, :score) '
+    'ON CONFLICT (article_id, period) DO UPDATE SET score = score + excluded.score'
+)
+
+
+def create_trending_tables():
+    """创建 article_trending 和 trending_landmark 表（已存在时跳过）"""
+    ArticleTrending.__table__.create(db.engine, checkfirst=True)
+    TrendingLandmark.__table__.create(db.engine, checkfirst=True)
+
+
+class TrendingTracker:
+    """全部时间窗口的排行（状态在数据库中，各 worker 的实例无状态）"""
+
+    def __init__(self, windows=WINDOWS):
+        self.windows = dict(windows)
+
+    def init_app(self, app):
+        with app.app_context():
+            try:
+                create_trending_tables()
+            except SQLAlchemyError:
+                app.logger.exception('创建热门排行表失败')
+
+    def apply(self, conn, counts, now=None):
+        """
+        在写回阅读量的事务中累加衰减计数
+
+        Args:
+            conn: 已开启写事务的连接（view_counter 已在其中执行过 UPDATE，持有写锁，
+                  读取的基准时间不会被其他 worker 同时修改）
+            counts: {文章 id: 阅读次数}
+        """
+        if not counts:
+            return
+        now = time.time() if now is None else now
+        landmarks = self._landmarks(conn)
+
+        rows = []
+        for name, tau in self.windows.items():
+            landmark = landmarks.get(name)
+            if landmark is None:
+                landmark = now
+                conn.execute(TrendingLandmark.__table__.insert().values(period=name, landmark=now))
+            exponent = (now - landmark) / tau
+            if exponent > RESCALE_EXPONENT:
+                self._rescale(conn, name, math.exp(-exponent), now)
+                exponent = 0.0
+            weight = math.exp(exponent)
+            rows.extend({'article_id': article_id, 'period': name, 'score': count * weight}
+                        for article_id, count in counts.items())
+        conn.execute(_UPSERT_SQL, rows)
+
+    def leaders(self, window, limit, now=None):
+        """返回 [(文章 id, 当前衰减后的计数)]，按计数降序"""
+        now = time.time() if now is None else now
+        landmark = self._landmarks(db.session).get(window)
+        if landmark is None:
+            return []
+        rows = db.session.execute(
+            select(ArticleTrending.article_id, ArticleTrending.score)
+            .where(ArticleTrending.period == window)
+            .order_by(ArticleTrending.score.desc())
+            .limit(limit)
+        ).all()
+        factor = math.exp(-(now - landmark) / self.windows[window])
+        return [(article_id, score * factor) for article_id, score in rows]
+
+    def remove(self, article_id):
+        """文章下架或删除后移出排行"""
+        with db.engine.begin() as conn:
+            conn.execute(delete(ArticleTrending).where(ArticleTrending.article_id == article_id))
+
+    @staticmethod
+    def _landmarks(conn):
+        return dict(conn.execute(select(TrendingLandmark.period, TrendingLandmark.landmark)).all())
+
+    @staticmethod
+    def _rescale(conn, window, factor, now):
+        # 同一窗口的全部计数乘以相同的因子，排序不变
+        conn.execute(update(ArticleTrending).where(ArticleTrending.period == window)
+                     .values(score=ArticleTrending.score * factor))
+        conn.execute(delete(ArticleTrending).where(ArticleTrending.period == window,
+                                                   ArticleTrending.score < PRUNE_BELOW))
+        conn.execute(update(TrendingLandmark).where(TrendingLandmark.period == window)
+                     .values(landmark=now))
+
+
+trending = TrendingTracker()
+
+
+def init_app(app):
+    """创建排行表（gunicorn 部署不会执行 init_db）"""
+    trending.init_app(app)
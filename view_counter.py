@@ -0,0 +1,113 @@
+"""
+阅读量写回缓冲
+
+请求中只在内存里累加阅读量，由后台线程按时间间隔或累计数量阈值
+批量执行 UPDATE article SET view_count = view_count + ?，
+避免每次阅读都开启一次 SQLite 写事务。进程正常退出时会写回剩余计数。
+init_app 的 on_flush(conn, counts) 在同一个写事务中执行（热门排行借此累加计数）。
+"""
+import atexit
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import db
+
+
+# 写回间隔（秒）
+FLUSH_INTERVAL = 5.0
+
+# 累计未写回的阅读次数达到该值时立即写回
+FLUSH_THRESHOLD = 200
+
+_UPDATE_SQL = text('UPDATE article SET view_count = COALESCE(view_count, 0) + :delta WHERE id = :id')
+
+
+class ViewCounter:
+    """按文章 id 缓冲阅读量增量（每个 worker 进程一个实例）"""
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, flush_threshold=FLUSH_THRESHOLD):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.app = None
+        self.on_flush = None
+        self._pending = {}
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def init_app(self, app, on_flush=None):
+        self.app = app
+        self.on_flush = on_flush
+        atexit.register(self.flush)
+
+    def record(self, article_id, count=1):
+        """记录一次阅读，不访问数据库"""
+        with self._lock:
+            self._pending[article_id] = self._pending.get(article_id, 0) + count
+            self._pending_total += count
+            over_threshold = self._pending_total >= self.flush_threshold
+        self._ensure_thread()
+        if over_threshold:
+            self._wakeup.set()
+
+    def pending(self, article_id):
+        """尚未写回数据库的阅读次数"""
+        with self._lock:
+            return self._pending.get(article_id, 0)
+
+    def flush(self):
+        """
+        将缓冲的增量批量写回数据库
+
+        Returns:
+            写回的文章数；写入失败时增量会放回缓冲区等待下次写回
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, {}
+                self._pending_total = 0
+
+            rows = [{'id': article_id, 'delta': delta} for article_id, delta in batch.items()]
+            try:
+                with self.app.app_context():
+                    with db.engine.begin() as conn:
+                        conn.execute(_UPDATE_SQL, rows)
+                        if self.on_flush is not None:
+                            self.on_flush(conn, batch)
+            except SQLAlchemyError:
+                with self._lock:
+                    for article_id, delta in batch.items():
+                        self._pending[article_id] = self._pending.get(article_id, 0) + delta
+                        self._pending_total += delta
+                return 0
+            return len(rows)
+
+    def _ensure_thread(self):
+        # 延迟到第一次记录时启动，gunicorn fork 出的每个 worker 各自拥有写回线程
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+view_counter = ViewCounter()
+
+
+def init_app(app, on_flush=None):
+    """注册应用并在进程退出时写回剩余计数，on_flush(conn, counts) 在写回事务中执行"""
+    view_counter.init_app(app, on_flush)